@@ -0,0 +1,116 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+np = pytest.importorskip("numpy")
+
+from payroll_batch import compute_payroll_batch  # noqa: E402
+from payroll_calculator import RESULT_FIELDS, PayrollConfig, compute_paycheck  # noqa: E402
+
+
+def _random_rows(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        hourly = rng.random() < 0.6
+        rows.append({
+            "pay_type": "hourly" if hourly else "salary",
+            "year": rng.choice([2023, 2024, 2025, 2030]),
+            "hourly_rate": round(rng.uniform(15, 90), 2) if hourly else float("nan"),
+            "hours": round(rng.uniform(0, 80), 2) if hourly else 0.0,
+            "overtime_hours": round(rng.choice([0, 0, rng.uniform(0, 15)]), 2) if hourly else 0.0,
+            "salary": float("nan") if hourly else round(rng.uniform(1000, 20000), 2),
+            "ytd_wages": round(rng.choice([0, rng.uniform(0, 250000), rng.uniform(165000, 205000)]), 2),
+            "withholding_method": rng.choice(["flat", "irs_percentage", "supplemental", "aggregate"]),
+            "ytd_supplemental_wages": rng.choice([0.0, 400_000.0, 995_000.0, 1_200_000.0]),
+            "regular_wages": rng.choice([0.0, 2500.0, 9000.0]),
+            "federal_rate": rng.choice([float("nan"), 0.1, 0.12, 0.22]),
+            "state_rate": rng.choice([float("nan"), float("nan"), 0.05, 0.0725]),
+            "work_state": rng.choice(["", "CA", "NY", "PA", "TX", "IL", "OR"]),
+            "resident_state": rng.choice(["", "", "NJ", "WI", "CA", "FL"]),
+            "state_allowances": rng.choice([0, 0, 1, 3]),
+            "filing_status": rng.choice(["single", "married", "head"]),
+            "pay_periods_per_year": rng.choice([52, 26, 24, 12]),
+            "w4_step2": rng.random() < 0.2,
+            "w4_step3_dependents_credit": rng.choice([0.0, 2000.0, 4000.0]),
+            "w4_step4c_extra_withholding": rng.choice([0.0, 25.0]),
+            "pretax_401k_percent": rng.choice([0.0, 0.03, 0.06]),
+            "pretax_section125": rng.choice([0.0, 87.5]),
+            "posttax_percent_net": rng.choice([0.0, 0.02]),
+        })
+    return rows
+
+
+def _scalar(row):
+    config = PayrollConfig(
+        year=row["year"],
+        ytd_wages=row["ytd_wages"],
+        withholding_method=row["withholding_method"],
+        federal_rate=None if row["federal_rate"] != row["federal_rate"] else row["federal_rate"],
+        state_rate=None if row["state_rate"] != row["state_rate"] else row["state_rate"],
+        work_state=row["work_state"],
+        resident_state=row["resident_state"],
+        state_allowances=row["state_allowances"],
+        filing_status=row["filing_status"],
+        pay_periods_per_year=row["pay_periods_per_year"],
+        w4_step2=row["w4_step2"],
+        w4_step3_dependents_credit=row["w4_step3_dependents_credit"],
+        w4_step4c_extra_withholding=row["w4_step4c_extra_withholding"],
+        ytd_supplemental_wages=row["ytd_supplemental_wages"],
+        regular_wages=row["regular_wages"],
+        pretax_401k_percent=row["pretax_401k_percent"],
+        pretax_section125=row["pretax_section125"],
+        posttax_percent_net=row["posttax_percent_net"],
+    )
+    hourly = row["pay_type"] == "hourly"
+    return compute_paycheck(
+        row["pay_type"],
+        hourly_rate=row["hourly_rate"] if hourly else None,
+        hours=row["hours"] if hourly else None,
+        overtime_hours=row["overtime_hours"],
+        salary=None if hourly else row["salary"],
+        config=config,
+    )
+
+
+def test_batch_matches_scalar_to_the_cent() -> None:
+    rows = [r for r in _random_rows(2000) if r["pay_type"] == "salary" or r["hours"] + r["overtime_hours"] > 0]
+    columns = {key: np.array([r[key] for r in rows]) for key in rows[0]}
+    batch = compute_payroll_batch(columns)
+    for i, row in enumerate(rows):
+        expected = _scalar(row)
+        for key in RESULT_FIELDS:
+            assert batch[key][i] == expected[key], (i, key)
+
+
+def test_batch_accepts_structured_array_and_broadcasts_config() -> None:
+    data = np.zeros(2, dtype=[("pay_type", "U6"), ("salary", "f8"), ("ytd_wages", "f8")])
+    data["pay_type"] = "salary"
+    data["salary"] = [3500.0, 10000.0]
+    data["ytd_wages"] = [0.0, 170000.0]
+    config = PayrollConfig(federal_rate=0.12)
+    batch = compute_payroll_batch(data, config=config)
+    assert batch["federal_income_tax"].tolist() == [420.0, 1200.0]
+    assert batch["social_security"].tolist() == [217.0, 248.0]
+
+
+def test_batch_rejects_hourly_rows_without_hours() -> None:
+    with pytest.raises(ValueError):
+        compute_payroll_batch({"pay_type": np.array(["hourly"]), "hourly_rate": np.array([20.0])})
+
+
+def test_progressive_tax_array_matches_scalar() -> None:
+    from payroll_batch import progressive_tax_annual_array
+    from payroll_calculator import IRS_2025_BRACKETS, _progressive_tax_annual
+
+    incomes = np.array([0.0, 1.0, 11600.0, 11600.01, 50000.0, 250000.0, 731200.0, 2_000_000.0, -5.0])
+    for status in IRS_2025_BRACKETS:
+        expected = [_progressive_tax_annual(float(x), status) for x in incomes]
+        assert progressive_tax_annual_array(incomes, status).tolist() == expected
@@ -0,0 +1,29 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from payroll_benchmark import compare_results, generate_workforce, run_benchmarks  # noqa: E402
+
+
+def test_workforce_is_seeded_and_mixed() -> None:
+    first = list(generate_workforce(500, seed=7))
+    assert first == list(generate_workforce(500, seed=7))
+    assert first != list(generate_workforce(500, seed=8))
+    assert {r["pay_type"] for r in first} == {"hourly", "salary"}
+    assert any("daily_hours" in r for r in first)
+    assert any(165_000 <= r["ytd_wages"] <= 180_000 for r in first)
+    assert any(r["ytd_wages"] > 200_000 for r in first)
+
+
+def test_run_benchmarks_reports_every_size_and_compares() -> None:
+    results = run_benchmarks([20, 40], only=["compute_paycheck", "hours_from_daily"])
+    assert [(r["benchmark"], r["size"]) for r in results] == [
+        ("compute_paycheck", 20), ("compute_paycheck", 40), ("hours_from_daily", 20), ("hours_from_daily", 40),
+    ]
+    slower = [dict(r, per_second=r["per_second"] * 2) for r in results]
+    lines = compare_results(results, slower, threshold=0.10)
+    assert len(lines) == 4 and all(line.lstrip().startswith("REGRESSION") for line in lines)
@@ -1,6 +1,8 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 TOOLS_DIR = ROOT / "tools"
 if str(TOOLS_DIR) not in sys.path:
@@ -27,3 +29,86 @@ def test_medicare_additional_tax_triggers_above_threshold() -> None:
     with_additional = medicare(1_000.0, ytd_wages=200_000.0)
     assert with_additional > base_only
 
+
+def test_progressive_tax_uses_cumulative_brackets() -> None:
+    from payroll_calculator import _progressive_tax_annual
+
+    # At a threshold the tax equals the cumulative tax of all lower brackets
+    assert _progressive_tax_annual(11600.0, "single") == 1160.0
+    assert _progressive_tax_annual(47150.0, "single") == 1160.0 + (47150 - 11600) * 0.12
+    assert _progressive_tax_annual(50000.0, "unknown") == _progressive_tax_annual(50000.0, "single")
+    assert _progressive_tax_annual(0.0, "married") == 0.0
+
+
+def test_traced_paycheck_matches_plain_and_explains_in_one_pass() -> None:
+    from payroll_calculator import PayrollConfig, build_explanation_text, compute_paycheck, render_explanation
+
+    for ytd in (0.0, 170_000.0, 199_500.0):
+        config = PayrollConfig(ytd_wages=ytd, withholding_method="irs_percentage", filing_status="married",
+                               w4_step3_dependents_credit=2000.0, pretax_401k_percent=0.05, pretax_hsa=40.0)
+        plain = compute_paycheck("hourly", hourly_rate=47.13, hours=80, overtime_hours=6, config=config)
+        traced = compute_paycheck("hourly", hourly_rate=47.13, hours=80, overtime_hours=6, config=config, trace=True)
+        assert plain.trace is None
+        assert traced == plain
+        text = render_explanation(traced)
+        assert f"Net pay = Gross - deductions = ${plain['net']:.2f}" in text
+        assert f"Federal withholding this period: ${plain['federal_income_tax']:.2f}" in text
+        assert text == build_explanation_text("hourly", hourly_rate=47.13, hours=80, overtime_hours=6, config=config)
+
+
+def test_percentage_method_is_memoized_per_w4_profile() -> None:
+    from payroll_calculator import clear_withholding_cache, federal_withholding_percentage_method, withholding_cache_info
+
+    profile = dict(filing_status="single", pay_periods_per_year=26, w4_step2=False, w4_step3_dependents_credit=None,
+                   w4_step4a_other_income=0.0, w4_step4b_deductions=0.0, w4_step4c_extra_withholding=0.0)
+    clear_withholding_cache()
+    first = federal_withholding_percentage_method(2500.0, **profile)
+    second = federal_withholding_percentage_method(2500.0, **{**profile, "w4_step3_dependents_credit": 0.0})
+    info = withholding_cache_info()
+    assert first == second
+    assert (info.hits, info.misses) == (1, 1)
+
+
+def test_supplemental_wages_switch_to_mandatory_rate_over_threshold() -> None:
+    from payroll_calculator import PayrollConfig, compute_paycheck, render_explanation
+
+    config = PayrollConfig(withholding_method="supplemental", ytd_supplemental_wages=980_000.0)
+    result = compute_paycheck("salary", salary=50_000.0, config=config, trace=True)
+    # $20,000 up to the $1M threshold at 22%, the remaining $30,000 at 37%
+    assert result.federal_income_tax == 4_400.0 + 11_100.0
+    assert "37%" in render_explanation(result)
+
+    aggregate = PayrollConfig(withholding_method="aggregate", regular_wages=4_000.0, filing_status="married")
+    bonus = compute_paycheck("salary", salary=5_000.0, config=aggregate)
+    on_total = compute_paycheck("salary", salary=9_000.0, config=PayrollConfig(withholding_method="irs_percentage", filing_status="married"))
+    on_regular = compute_paycheck("salary", salary=4_000.0, config=PayrollConfig(withholding_method="irs_percentage", filing_status="married"))
+    assert bonus.federal_income_tax == round(on_total.federal_income_tax - on_regular.federal_income_tax, 2)
+
+
+def test_daily_hours_use_one_overtime_threshold_per_workweek() -> None:
+    from payroll_calculator import gross_pay, hours_from_daily
+
+    # Two 44-hour workweeks: 8 OT hours, not 48 for an 88-hour period
+    biweekly = ",".join(["8.8"] * 5 + ["0", "0"] + ["8.8"] * 5)
+    breakdown = hours_from_daily(biweekly, False)
+    assert round(breakdown["regular_hours"], 6) == 80.0 and round(breakdown["overtime_hours"], 6) == 8.0
+    # Several rates in one week: OT is paid on the blended regular rate
+    blended = gross_pay("hourly", hourly_rate=20.0, daily_hours="10,10,10,10,10", daily_rates=",,,30,30")
+    assert blended == 1200.0 + 10 * (1200.0 / 50) * 0.5
+    # Rates without the days they belong to are an error, not a silent fallback to hourly_rate
+    with pytest.raises(ValueError, match="daily-hours"):
+        gross_pay("hourly", hourly_rate=20.0, hours=40, daily_rates="20,30")
+
+
+def test_cli_defers_optional_imports_and_profiles_startup() -> None:
+    import subprocess
+
+    probe = "import sys, payroll_calculator; print(sorted(m for m in ('argparse', 'csv', 'pathlib') if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", probe], cwd=TOOLS_DIR, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+    run = subprocess.run(
+        [sys.executable, str(TOOLS_DIR / "payroll_calculator.py"), "--pay-type", "salary", "--salary", "2000", "--profile-startup"],
+        capture_output=True, text=True, check=True,
+    )
+    assert "Net Pay:" in run.stdout
+    assert "import calculator modules" in run.stderr and "compute paycheck" in run.stderr
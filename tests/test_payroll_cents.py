@@ -0,0 +1,111 @@
+import csv
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+np = pytest.importorskip("numpy")
+
+from payroll_batch import compute_payroll_batch  # noqa: E402
+from payroll_calculator import PayrollConfig, compute_paycheck  # noqa: E402
+from payroll_cents import (  # noqa: E402
+    MONEY_FIELDS,
+    NON_MONEY_FIELDS,
+    RATE_DIGITS,
+    cents_to_dollars,
+    compute_paycheck_cents,
+    compute_payroll_cents,
+    to_units,
+)
+
+
+def _random_columns(n: int, seed: int = 11):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        hourly = rng.random() < 0.6
+        rows.append({
+            "pay_type": "hourly" if hourly else "salary",
+            "year": rng.choice([2023, 2024, 2025]),
+            "hourly_rate": round(rng.uniform(15, 90), rng.choice([2, 3])) if hourly else float("nan"),
+            "hours": round(rng.uniform(1, 80), 2) if hourly else 0.0,
+            "overtime_hours": round(rng.choice([0, rng.uniform(0, 15)]), 2) if hourly else 0.0,
+            "salary": float("nan") if hourly else round(rng.uniform(1000, 20000), 2),
+            "ytd_wages": round(rng.choice([0, rng.uniform(0, 250000), rng.uniform(165000, 205000)]), 2),
+            "withholding_method": rng.choice(["flat", "irs_percentage", "supplemental", "aggregate"]),
+            "ytd_supplemental_wages": rng.choice([0.0, 995_000.0, 1_200_000.0]),
+            "regular_wages": rng.choice([0.0, 2500.0]),
+            "federal_rate": rng.choice([float("nan"), 0.1, 0.22]),
+            "state_rate": rng.choice([float("nan"), float("nan"), 0.0725]),
+            "work_state": rng.choice(["", "CA", "NY", "PA", "TX", "IL"]),
+            "resident_state": rng.choice(["", "", "NJ", "WI"]),
+            "state_allowances": rng.choice([0, 2]),
+            "filing_status": rng.choice(["single", "married", "head"]),
+            "pay_periods_per_year": rng.choice([52, 26, 12]),
+            "w4_step2": rng.random() < 0.2,
+            "w4_step3_dependents_credit": rng.choice([0.0, 2000.0]),
+            "w4_step4c_extra_withholding": rng.choice([0.0, 25.0]),
+            "pretax_401k_percent": rng.choice([0.0, 0.03, 0.065]),
+            "pretax_section125": rng.choice([0.0, 87.5]),
+            "posttax_percent_net": rng.choice([0.0, 0.015]),
+        })
+    return {key: np.array([r[key] for r in rows]) for key in rows[0]}
+
+
+def test_cents_engine_tracks_float_engine_and_balances_exactly() -> None:
+    columns = _random_columns(3000)
+    floats = compute_payroll_batch(columns)
+    cents = compute_payroll_cents(columns)
+    dollars = cents_to_dollars(cents)
+
+    for key in MONEY_FIELDS:
+        assert cents[key].dtype == np.int64, key
+        # Stage rounding moves a line by at most a cent, and a tax on it by one more
+        assert np.abs(dollars[key] - floats[key]).max() <= 0.02 + 1e-9, key
+    for key in NON_MONEY_FIELDS[:3]:
+        assert (dollars[key] == floats[key]).all(), key
+
+    assert (cents["gross"] == cents["regular_pay"] + cents["overtime_pay"] + cents["doubletime_pay"]).all()
+    taxes = cents["social_security"] + cents["medicare"] + cents["federal_income_tax"] + cents["state_income_tax"]
+    assert (cents["total_deductions"] == taxes + cents["posttax_deductions"]).all()
+    assert (cents["net"] == cents["gross"] - cents["total_deductions"]).all()
+    assert (cents["total_employer_cost"] == cents["gross"] + cents["employer_total"]).all()
+
+
+def test_inputs_and_lines_round_half_away_from_zero() -> None:
+    assert to_units([2.675, 1.005, -0.125, 1234.56]).tolist() == [268, 101, -13, 123456]
+    assert to_units([0.062, 0.0145], RATE_DIGITS).tolist() == [62000, 14500]
+
+    # 20.005/h for 1 hour is exactly half a cent over 20.00
+    result = compute_paycheck_cents("hourly", hourly_rate=20.005, hours=1, config=PayrollConfig(federal_rate=0.1))
+    assert result.regular_pay == 20.01 and result.federal_income_tax == 2.0
+
+    config = PayrollConfig(ytd_wages=172_000, federal_rate=0.12, state_rate=0.05)
+    assert dict(compute_paycheck_cents("salary", salary=5000.0, config=config)) == dict(
+        compute_paycheck("salary", salary=5000.0, config=config))
+
+
+def test_cents_engine_in_batch_files(tmp_path: Path) -> None:
+    from payroll_pipeline import run_batch_file
+
+    src = tmp_path / "employees.csv"
+    src.write_text(
+        "employee_id,pay_type,hourly_rate,hours,overtime_hours,salary,work_state\n"
+        "E1,hourly,18.335,80,3.5,,CA\n"
+        "E2,salary,,,,4250.5,NY\n"
+    )
+    out = tmp_path / "results.csv"
+    defaults = PayrollConfig(withholding_method="irs_percentage")
+    assert run_batch_file(str(src), str(out), defaults=defaults, engine="cents") == 2
+
+    rows = list(csv.DictReader(out.open()))
+    expected = compute_paycheck_cents("hourly", hourly_rate=18.335, hours=80, overtime_hours=3.5,
+                                      config=PayrollConfig(withholding_method="irs_percentage", work_state="CA"))
+    assert float(rows[0]["net"]) == expected.net
+    assert float(rows[0]["overtime_pay"]) == 96.26 and float(rows[0]["gross"]) == 1563.06
@@ -0,0 +1,73 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from payroll_calculator import PayrollConfig, compute_paycheck  # noqa: E402
+from payroll_grossup import MAX_EVALUATIONS, gross_up, gross_up_batch  # noqa: E402
+
+
+CONFIGS = [
+    PayrollConfig(federal_rate=0.22, state_rate=0.05),
+    PayrollConfig(withholding_method="irs_percentage", filing_status="married"),
+    # Crosses the SS wage base and the Additional Medicare threshold
+    PayrollConfig(withholding_method="irs_percentage", ytd_wages=170_000, pretax_401k_percent=0.06, posttax_percent_net=0.1),
+    PayrollConfig(withholding_method="irs_percentage", ytd_wages=199_000, w4_step4c_extra_withholding=50, posttax_flat=20),
+    # Bonus checks: crosses the $1M supplemental threshold / aggregate method on top of regular wages
+    PayrollConfig(withholding_method="supplemental", ytd_supplemental_wages=995_000, state_rate=0.05),
+    PayrollConfig(withholding_method="aggregate", regular_wages=3_800, filing_status="married"),
+]
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_gross_up_finds_smallest_cent_gross(config: PayrollConfig) -> None:
+    for target in (1.0, 99.99, 2500.0, 12_345.67, 250_000.0):
+        solved = gross_up(target, config)
+        assert solved.result.net >= target
+        assert compute_paycheck("salary", salary=round(solved.gross - 0.01, 2), config=config).net < target
+        assert solved.evaluations <= MAX_EVALUATIONS
+
+
+def test_batch_matches_scalar_gross_up() -> None:
+    rng = random.Random(17)
+    n = 500
+    targets = np.array([round(rng.uniform(50, 30_000), 2) for _ in range(n)])
+    columns = {
+        "withholding_method": "irs_percentage",
+        "ytd_wages": np.array([rng.choice((0, 120_000, 168_000, 199_500)) for _ in range(n)], dtype=float),
+        "filing_status": np.array([rng.choice(("single", "married", "head")) for _ in range(n)]),
+        "pretax_section125": np.array([rng.choice((0, 150)) for _ in range(n)], dtype=float),
+        "state_rate": 0.05,
+    }
+    result = gross_up_batch(targets, columns)
+    assert (result["net"] >= targets).all()
+    for i in range(0, n, 25):
+        config = PayrollConfig(withholding_method="irs_percentage", ytd_wages=float(columns["ytd_wages"][i]),
+                               filing_status=str(columns["filing_status"][i]),
+                               pretax_section125=float(columns["pretax_section125"][i]), state_rate=0.05)
+        assert result["gross"][i] == gross_up(float(targets[i]), config).gross
+
+
+def test_gross_up_rejects_unreachable_and_bad_input() -> None:
+    with pytest.raises(ValueError, match="never reaches"):
+        gross_up(100.0, PayrollConfig(posttax_percent_net=1.0))
+    # The cent polish counts against the same budget instead of stepping on unbounded
+    config = CONFIGS[2]
+    assert gross_up(12_345.67, config, max_evaluations=20).evaluations <= 20
+    with pytest.raises(ValueError, match="did not converge within 4 evaluations"):
+        gross_up(12_345.67, config, max_evaluations=4)
+    with pytest.raises(ValueError, match="did not converge"):
+        gross_up_batch([12_345.67, 500.0], {"withholding_method": "irs_percentage", "ytd_wages": np.array([170_000.0, 0.0])},
+                       max_evaluations=3)
+    with pytest.raises(ValueError, match="positive"):
+        gross_up_batch([100.0, 0.0])
+    with pytest.raises(ValueError, match="salary"):
+        gross_up_batch([100.0], {"salary": [5.0]})
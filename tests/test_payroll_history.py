@@ -0,0 +1,67 @@
+import sqlite3
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from payroll_history import PayHistoryStore  # noqa: E402
+from payroll_retro import RetroChange, compute_retro, run_pay_history  # noqa: E402
+
+
+def _history(employee_id: str, salary: float, count: int = 12, raised_from: date = date.max, raised: float = 0.0):
+    ends = [date(2025, 1, 10) + timedelta(days=14 * i) for i in range(count)]
+    return run_pay_history(employee_id, [(end, {"pay_type": "salary", "salary": raised if end >= raised_from else salary})
+                                         for end in ends])
+
+
+def test_store_answers_ytd_and_period_queries(tmp_path: Path) -> None:
+    with PayHistoryStore(str(tmp_path / "pay.db")) as store:
+        e1, e2 = _history("E1", 9000.0), _history("E2", 3000.0)
+        assert store.append_periods(e1 + e2) == 24
+        cutoff = e1[5].period_end
+        assert store.ytd_fica_wages("E1", 2025, before=cutoff) == e1[5].ytd_wages == 45_000.0
+        assert store.ytd_fica_wages("E1", 2024) == 0.0
+        assert [p.result for p in store.employee_history("E1", 2025)] == [p.result for p in e1]
+        assert [eid for eid, _ in store.period_rows(cutoff)] == ["E1", "E2"]
+        totals = dict(store.employee_totals(2025))
+        assert totals["E2"]["gross"] == 36_000.0
+        assert store.year_totals(2025)["gross"] == 144_000.0
+        with pytest.raises(sqlite3.DatabaseError, match="append-only"):
+            store.conn.execute("DELETE FROM paychecks")
+
+
+def test_retro_adjustments_make_store_totals_match_corrected_history() -> None:
+    with PayHistoryStore(":memory:") as store:
+        store.append_periods(_history("E1", 9000.0, count=26))
+        change = RetroChange(effective=date(2025, 7, 1), salary=9500.0)
+        assert store.append_adjustments(compute_retro(store.history(2025), [change])) > 0
+        rerun = _history("E1", 9000.0, count=26, raised_from=date(2025, 7, 1), raised=9500.0)
+        ytd = store.ytd_totals("E1", 2025)
+        for name in ("gross", "social_security", "medicare", "net"):
+            assert ytd[name] == round(sum(p.result[name] for p in rerun), 2)
+
+
+def test_second_retro_starts_from_corrected_periods() -> None:
+    with PayHistoryStore(":memory:") as store:
+        original = _history("E1", 9000.0, count=26)
+        store.append_periods(original)
+        store.append_adjustments(compute_retro(store.history(2025), [RetroChange(effective=date(2025, 7, 1), salary=9500.0)]))
+        assert store.ytd_totals("E1", 2025)["gross"] == 240_500.0
+
+        rerun = _history("E1", 9000.0, count=26, raised_from=date(2025, 7, 1), raised=9500.0)
+        current = list(store.employee_history("E1", 2025))
+        assert [p.result for p in current] == [p.result for p in rerun]
+        assert [p.record["salary"] for p in current] == [p.record["salary"] for p in rerun]
+        assert store.period_rows(rerun[-1].period_end) == [("E1", rerun[-1].result)]
+
+        # Restating December at the already-corrected salary changes nothing
+        december = RetroChange(effective=date(2025, 12, 1), salary=9500.0, reason="December restated")
+        assert list(compute_retro(store.history(2025), [december])) == []
+        assert store.append_adjustments(compute_retro(store.history(2025), [december])) == 0
+        assert store.ytd_totals("E1", 2025)["gross"] == 240_500.0
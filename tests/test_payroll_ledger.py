@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from payroll_calculator import PayrollConfig, compute_paycheck  # noqa: E402
+from payroll_ledger import EmployeeLedger  # noqa: E402
+
+
+def test_ledger_threads_ytd_wages_like_manual_calls() -> None:
+    config = PayrollConfig(pay_periods_per_year=26)
+    ledger = EmployeeLedger(config)
+    results = ledger.project_year("salary", salary=10_000.0)
+    assert len(results) == 26
+
+    ytd = 0.0
+    for result in results:
+        expected = compute_paycheck("salary", salary=10_000.0, config=PayrollConfig(ytd_wages=ytd))
+        assert result == expected
+        ytd += expected["taxable_wages_fica"]
+
+
+def test_ledger_caps_social_security_and_tracks_additional_medicare() -> None:
+    ledger = EmployeeLedger(PayrollConfig(pay_periods_per_year=12))
+    ledger.project_year("salary", salary=25_000.0)
+    summary = ledger.summary()
+    assert summary["ytd_social_security"] == round(174_000 * 0.062, 2)
+    assert summary["ss_wage_base_remaining"] == 0.0
+    assert summary["additional_medicare_active"] is True
+    assert summary["ytd_medicare"] == round(300_000 * 0.0145 + 100_000 * 0.009, 2)
+
+
+def test_ledger_seeds_from_config_ytd_wages() -> None:
+    ledger = EmployeeLedger(PayrollConfig(ytd_wages=173_000.0))
+    first = ledger.process("salary", salary=2_000.0)
+    assert first["social_security"] == 62.0
+    assert ledger.ytd_fica_wages == 175_000.0
+
+
+def test_ledger_tracks_supplemental_wages_across_bonus_checks() -> None:
+    ledger = EmployeeLedger(PayrollConfig(withholding_method="irs_percentage", ytd_supplemental_wages=900_000.0))
+    ledger.process("salary", salary=8_000.0)
+    first = ledger.process_supplemental(60_000.0)
+    assert first["federal_income_tax"] == round(60_000.0 * 0.22, 2)
+    second = ledger.process_supplemental(60_000.0)
+    assert second["federal_income_tax"] == round(40_000.0 * 0.22 + 20_000.0 * 0.37, 2)
+    assert ledger.ytd_supplemental_wages == 1_020_000.0
+    assert ledger.periods == 1 and ledger.last_regular_wages == 8_000.0
+    assert ledger.ytd_fica_wages == 128_000.0
+
+    aggregate = ledger.process_supplemental(5_000.0, method="aggregate")
+    expected = compute_paycheck("salary", salary=5_000.0, config=PayrollConfig(
+        withholding_method="aggregate", regular_wages=8_000.0, ytd_supplemental_wages=1_020_000.0, ytd_wages=128_000.0))
+    assert aggregate == expected
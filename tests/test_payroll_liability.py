@@ -0,0 +1,108 @@
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from payroll_calculator import PayrollConfig, compute_paycheck  # noqa: E402
+from payroll_liability import LiabilityLedger, deposit_schedule, read_results_file  # noqa: E402
+from payroll_pipeline import run_batch_file  # noqa: E402
+from payroll_results import PaycheckResults  # noqa: E402
+
+
+def _check(fit: float, ss: float = 0.0, medicare: float = 0.0, wages: float = 0.0):
+    return {"taxable_wages_fit": wages, "federal_income_tax": fit, "social_security": ss,
+            "employer_social_security": ss, "medicare": medicare, "employer_medicare": medicare}
+
+
+def test_quarter_totals_from_files_runs_and_single_checks(tmp_path: Path) -> None:
+    src = tmp_path / "employees.csv"
+    src.write_text("employee_id,pay_type,hourly_rate,hours,salary\nE1,hourly,25.13,80,\nE2,salary,,,5123.45\nE3,salary,,,190000\n")
+    out = tmp_path / "results.csv"
+    config = PayrollConfig(withholding_method="irs_percentage")
+    run_batch_file(str(src), str(out), defaults=config)
+
+    ledger = LiabilityLedger()
+    assert ledger.add_rows(read_results_file(str(out), date(2025, 1, 10))) == 3
+    run = PaycheckResults()
+    for _, result in read_results_file(str(out), date(2025, 2, 7)):
+        run.append({k: float(v) for k, v in result.items() if k != "employee_id"})
+    assert ledger.add_results(date(2025, 2, 7), run) == 3
+    ledger.add(date(2025, 4, 1), compute_paycheck("salary", salary=1000.0, config=config))
+
+    checks = list(run)
+    q1 = ledger.quarter(2025, 1)
+    assert q1.totals.paychecks == 6
+    assert q1.totals.federal_income_tax == round(2 * sum(r["federal_income_tax"] for r in checks), 2)
+    expected = sum(r["federal_income_tax"] + r["social_security"] + r["employer_social_security"]
+                   + r["medicare"] + r["employer_medicare"] for r in checks)
+    assert q1.totals.total == round(2 * expected, 2) and q1.months == (round(expected, 2), round(expected, 2), 0.0)
+    assert [(q.year, q.quarter, q.totals.paychecks) for q in ledger.quarters()] == [(2025, 1, 6), (2025, 2, 1)]
+
+    with pytest.raises(ValueError, match="pay date"):
+        list(read_results_file(str(out)))
+
+
+def test_monthly_and_semiweekly_due_dates() -> None:
+    monthly = LiabilityLedger("monthly")
+    for day in (date(2025, 1, 10), date(2025, 1, 24), date(2025, 2, 7)):
+        monthly.add(day, _check(100.0))
+    deposits = monthly.deposits()
+    # Feb 15 2025 is a Saturday, so January's deposit moves to Monday
+    assert [(d.due, d.amount, d.rule) for d in deposits] == [(date(2025, 2, 17), 200.0, "monthly"),
+                                                             (date(2025, 3, 17), 100.0, "monthly")]
+
+    semiweekly = LiabilityLedger("semiweekly")
+    semiweekly.add(date(2025, 3, 7), _check(10.0))   # Friday: due the next Wednesday
+    semiweekly.add(date(2025, 3, 29), _check(20.0))  # Saturday of a Sat-Tue period that crosses into Q2
+    semiweekly.add(date(2025, 3, 31), _check(30.0))
+    semiweekly.add(date(2025, 4, 1), _check(40.0))
+    assert [(d.due, d.amount, d.quarter) for d in semiweekly.deposits()] == [
+        (date(2025, 3, 12), 10.0, 1), (date(2025, 4, 4), 50.0, 1), (date(2025, 4, 4), 40.0, 2)]
+
+    assert deposit_schedule(50_000) == "monthly" and deposit_schedule(50_000.01) == "semiweekly"
+    with pytest.raises(ValueError):
+        LiabilityLedger("weekly")
+
+
+def test_next_day_rule_switches_monthly_depositor_to_semiweekly() -> None:
+    ledger = LiabilityLedger("monthly")
+    ledger.add(date(2025, 8, 1), _check(40_000.0))
+    ledger.add(date(2025, 8, 15), _check(50_000.0, ss=6_000.0))  # $102,000 accumulated in August
+    ledger.add(date(2025, 8, 15), _check(1_000.0))
+    ledger.add(date(2025, 8, 22), _check(5_000.0))
+    ledger.add(date(2026, 1, 9), _check(7_000.0))
+    deposits = ledger.deposits()
+    assert [(d.due, d.amount, d.rule, d.first_day) for d in deposits] == [
+        (date(2025, 8, 18), 103_000.0, "next_day", date(2025, 8, 1)),  # Friday liability, due Monday
+        (date(2025, 8, 27), 5_000.0, "semiweekly", date(2025, 8, 22)),
+        (date(2026, 1, 14), 7_000.0, "semiweekly", date(2026, 1, 9)),  # still semiweekly the next year
+    ]
+    assert ledger.deposits(2026) == deposits[2:]
+    assert ledger.lookback_total(2027) == 115_000.0  # July 2025 through June 2026
+
+
+def test_history_adjustments_post_on_the_date_they_were_paid() -> None:
+    from payroll_history import PayHistoryStore
+    from payroll_retro import RetroChange, compute_retro, run_pay_history
+
+    march, may = date(2025, 3, 14), date(2025, 5, 9)
+    with PayHistoryStore(":memory:") as store:
+        store.append_periods(run_pay_history("E1", [(march, {"pay_type": "salary", "salary": 5000.0})]))
+        lines = list(compute_retro(store.history(2025), [RetroChange(effective=march, salary=5400.0)]))
+        store.append_adjustments(lines, pay_date=may)
+        ledger = LiabilityLedger("monthly")
+        for pay_date, kind, result in store.paid_rows(2025):
+            ledger.add(pay_date, result, paycheck=kind == "paycheck")
+
+    original, deltas = lines[0].original, lines[0].deltas()
+    q1, q2 = ledger.quarter(2025, 1), ledger.quarter(2025, 2)
+    assert (q1.totals.paychecks, q1.totals.federal_income_tax) == (1, original.federal_income_tax)
+    assert (q2.totals.paychecks, q2.totals.wages) == (0, 400.0)
+    assert q2.totals.social_security == round(2 * deltas["social_security"], 2)
+    assert q2.months == (0.0, q2.totals.total, 0.0)
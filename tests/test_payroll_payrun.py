@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+pytest.importorskip("numpy")
+
+from payroll_calculator import PayrollConfig, compute_paycheck  # noqa: E402
+from payroll_payrun import PayRunView, Viewport, load_pay_run  # noqa: E402
+from payroll_pipeline import iter_paychecks, read_employee_records  # noqa: E402
+from payroll_worker import Cancelled, CancelToken  # noqa: E402
+
+
+def _employee_file(tmp_path: Path, count: int) -> Path:
+    src = tmp_path / "employees.csv"
+    lines = ["employee_id,pay_type,hourly_rate,hours,salary,ytd_wages"]
+    for i in range(count):
+        if i % 3 == 0:
+            lines.append(f"S{i:03d},salary,,,{2000 + 37 * i},{1500 * i}")
+        else:
+            lines.append(f"H{i:03d},hourly,{18 + i % 17}.25,{60 + i % 30},,")
+    src.write_text("\n".join(lines) + "\n")
+    return src
+
+
+def test_chunked_pay_run_matches_per_record_paychecks(tmp_path: Path) -> None:
+    src = _employee_file(tmp_path, 50)
+    defaults = PayrollConfig(withholding_method="irs_percentage", state_rate=0.04)
+    results = load_pay_run(str(src), defaults, chunk_size=7)
+    expected = list(iter_paychecks(read_employee_records(str(src)), defaults))
+    assert results.employee_ids == [employee_id for employee_id, _ in expected]
+    for i, (_, paycheck) in enumerate(expected):
+        assert results[i].to_dict() == paycheck.to_dict()
+
+    # Files with daily hours go through the per-record engine
+    daily = tmp_path / "daily.jsonl"
+    daily.write_text(json.dumps({"employee_id": "D1", "pay_type": "hourly", "hourly_rate": 20,
+                                 "daily_hours": [8, 9, 10], "use_ca_daily_ot": True}) + "\n")
+    assert load_pay_run(str(daily))[0]["overtime_hours"] == 3.0
+
+    token = CancelToken()
+    token.cancel()
+    with pytest.raises(Cancelled):
+        load_pay_run(str(src), defaults, token=token)
+
+
+def test_view_sorts_filters_and_totals_without_touching_results(tmp_path: Path) -> None:
+    view = PayRunView(load_pay_run(str(_employee_file(tmp_path, 30)), PayrollConfig(federal_rate=0.1)))
+    nets = list(view.columns["net"])
+
+    view.sort("net")
+    assert [float(row[8].replace(",", "")) for row in view.rows(0, 30)] == sorted(nets)
+    view.sort("net")  # same column again flips the direction
+    assert view.descending and view.rows(0, 1)[0][8] == f"{max(nets):,.2f}"
+    view.sort("employee_id", descending=False)
+    assert view.rows(0, 2) == view.rows(-5, 2) and view.rows(0, 1)[0][0] == "H001"
+
+    view.filter(text="s0", column="gross", minimum=2300, maximum=2800)
+    kept = [i for i, eid in enumerate(view.employee_ids) if eid.startswith("S") and 2300 <= view.columns["gross"][i] <= 2800]
+    assert len(view) == len(kept) == 5 and [row[0] for row in view.rows(0, 10)] == sorted(view.employee_ids[kept])
+    assert view.totals()["net"] == round(sum(nets[i] for i in kept), 2)
+    assert view.totals()["gross"] == round(sum(view.columns["gross"][i] for i in kept), 2)
+
+    out = io.StringIO()
+    assert view.write_csv(out) == 5
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [r["employee_id"] for r in rows] == ["S009", "S012", "S015", "S018", "S021"]
+    assert float(rows[0]["net"]) == compute_paycheck("salary", salary=2333.0, config=PayrollConfig(
+        federal_rate=0.1, ytd_wages=13500.0))["net"]
+
+    view.filter()
+    assert len(view) == 30 and view.sort_column == "employee_id"
+    with pytest.raises(ValueError):
+        view.sort("not_a_column")
+
+
+def test_viewport_follows_scrollbar_commands() -> None:
+    port = Viewport(height=20, total=50_000)
+    assert port.fractions() == (0.0, 20 / 50_000)
+    assert port.command("moveto", "0.5") and (port.offset, port.stop) == (25_000, 25_020)
+    assert port.command("scroll", "1", "pages") and port.offset == 25_020
+    assert port.command("scroll", "-3", "units") and port.offset == 25_017
+    assert port.command("moveto", "1.0") and port.stop == 50_000
+    assert not port.command("scroll", "5", "units")  # already at the end
+    port.resize(7)  # e.g. after a filter
+    assert (port.offset, port.stop, port.fractions()) == (0, 7, (0.0, 1.0))
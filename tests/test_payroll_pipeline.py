@@ -0,0 +1,90 @@
+import csv
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from payroll_calculator import PayrollConfig, compute_paycheck  # noqa: E402
+from payroll_pipeline import iter_paychecks, read_employee_records, run_batch_file, write_results  # noqa: E402
+
+
+def test_csv_batch_matches_single_paycheck(tmp_path: Path) -> None:
+    src = tmp_path / "employees.csv"
+    src.write_text(
+        "employee_id,pay_type,hourly_rate,hours,salary,ytd_wages,federal_rate\n"
+        "E1,hourly,25,80,,1000,\n"
+        "E2,salary,,,5000,172000,12%\n"
+    )
+    out = tmp_path / "results.csv"
+    assert run_batch_file(str(src), str(out), defaults=PayrollConfig(state_rate=0.05)) == 2
+
+    rows = list(csv.DictReader(out.open()))
+    assert [r["employee_id"] for r in rows] == ["E1", "E2"]
+    expected = compute_paycheck("salary", salary=5000.0, config=PayrollConfig(ytd_wages=172000.0, federal_rate=0.12, state_rate=0.05))
+    assert float(rows[1]["net"]) == expected["net"]
+    assert float(rows[1]["social_security"]) == 124.0
+
+
+def test_batch_engine_matches_scalar_for_bonus_run(tmp_path: Path) -> None:
+    pytest.importorskip("numpy")
+    src = tmp_path / "bonuses.csv"
+    src.write_text(
+        "employee_id,salary,withholding_method,ytd_wages,ytd_supplemental_wages,regular_wages,filing_status\n"
+        "E1,25000,,180000,990000,,\n"
+        "E2,4000,aggregate,52000,,3800,married\n"
+        "E3,1500,,,,,head\n"
+    )
+    defaults = PayrollConfig(withholding_method="supplemental", state_rate=0.05)
+    scalar, batch = tmp_path / "scalar.csv", tmp_path / "batch.csv"
+    run_batch_file(str(src), str(scalar), defaults=defaults, default_pay_type="salary")
+    assert run_batch_file(str(src), str(batch), defaults=defaults, default_pay_type="salary", engine="batch") == 3
+    rows = list(csv.DictReader(batch.open()))
+    for expected, got in zip(csv.DictReader(scalar.open()), rows):
+        assert {k: float(v) for k, v in got.items() if k != "employee_id"} == {k: float(v) for k, v in expected.items() if k != "employee_id"}
+    # $10,000 under the $1M supplemental threshold at 22%, $15,000 over it at 37%
+    assert float(rows[0]["federal_income_tax"]) == 2_200.0 + 5_550.0
+
+
+def test_jsonl_records_accept_daily_hours_list(tmp_path: Path) -> None:
+    src = tmp_path / "employees.jsonl"
+    src.write_text(json.dumps({"employee_id": "E3", "pay_type": "hourly", "hourly_rate": 20, "daily_hours": [8, 9, 10], "use_ca_daily_ot": True}) + "\n")
+    buf = io.StringIO()
+    write_results(iter_paychecks(read_employee_records(str(src))), buf, "jsonl")
+    row = json.loads(buf.getvalue())
+    assert row["employee_id"] == "E3"
+    assert row["overtime_hours"] == 3.0
+
+
+def test_jsonl_numeric_rates_read_like_csv_text(tmp_path: Path) -> None:
+    src = tmp_path / "employees.jsonl"
+    base = {"pay_type": "salary", "salary": 1000}
+    src.write_text("".join(json.dumps({**base, "employee_id": eid, "federal_rate": rate, "state_rate": rate}) + "\n"
+                           for eid, rate in (("E1", 12), ("E2", 0.12), ("E3", "12%"))))
+    results = [result for _, result in iter_paychecks(read_employee_records(str(src)))]
+    assert [(r.federal_income_tax, r.state_income_tax) for r in results] == [(120.0, 120.0)] * 3
+    assert all(r.net > 0 for r in results)
+
+
+def test_bad_record_reports_its_position() -> None:
+    with pytest.raises(ValueError, match="Record 2"):
+        list(iter_paychecks([{"pay_type": "salary", "salary": "100"}, {"pay_type": "hourly"}]))
+
+
+def test_parallel_run_preserves_input_order() -> None:
+    from payroll_pipeline import iter_paychecks_parallel
+
+    records = [
+        {"employee_id": f"E{i}", "pay_type": "hourly", "hourly_rate": str(15 + i), "hours": str(20 + i % 60)}
+        for i in range(50)
+    ]
+    stats = {}
+    parallel = list(iter_paychecks_parallel(records, workers=2, chunk_size=7, stats=stats))
+    assert parallel == list(iter_paychecks(records))
+    assert sum(ws.records for ws in stats.values()) == 50
@@ -0,0 +1,49 @@
+import csv
+import io
+import json
+import pickle
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from payroll_calculator import PayrollConfig, compute_paycheck  # noqa: E402
+from payroll_results import RESULT_FIELDS, PaycheckResult, PaycheckResults  # noqa: E402
+
+
+def _result() -> PaycheckResult:
+    return compute_paycheck("hourly", hourly_rate=31.25, hours=40, overtime_hours=3, config=PayrollConfig(state_rate=0.05))
+
+
+def test_result_keeps_dict_like_access() -> None:
+    result = _result()
+    assert not hasattr(result, "__dict__")
+    assert result["gross"] == result.gross == 1390.62
+    assert result.get("missing", 0) == 0
+    assert list(result) == list(RESULT_FIELDS)
+    assert result == result.to_dict()
+    assert pickle.loads(pickle.dumps(result)) == result
+
+
+def test_result_json_matches_json_dumps() -> None:
+    result = _result()
+    assert json.loads(result.to_json("E1")) == {"employee_id": "E1", **result.to_dict()}
+    assert result.to_json() == json.dumps(result.to_dict())
+
+
+def test_columnar_results_round_trip_to_csv() -> None:
+    results = PaycheckResults()
+    results.append(_result(), "E1")
+    results.append(compute_paycheck("salary", salary=2500.0, config=PayrollConfig()), "E2")
+    assert len(results) == 2
+    assert results[0] == _result()
+    assert results.totals()["gross"] == 3890.62
+
+    buf = io.StringIO()
+    results.write_csv(buf)
+    rows = list(csv.DictReader(io.StringIO(buf.getvalue())))
+    assert [r["employee_id"] for r in rows] == ["E1", "E2"]
+    assert float(rows[1]["net"]) == results.column("net")[1]
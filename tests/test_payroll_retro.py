@@ -0,0 +1,57 @@
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from payroll_retro import RetroChange, compute_retro, retro_totals, run_pay_history  # noqa: E402
+
+
+def _biweekly(start: date, count: int, record: dict):
+    return [(start + timedelta(days=14 * i), dict(record)) for i in range(count)]
+
+
+def test_retro_raise_matches_full_rerun_and_carries_ytd() -> None:
+    start = date(2025, 1, 10)
+    base = {"pay_type": "salary", "salary": 8200.0, "withholding_method": "irs_percentage"}
+    history = run_pay_history("E1", _biweekly(start, 26, base)) + run_pay_history("E2", _biweekly(start, 26, base))
+    effective = date(2025, 6, 1)
+    change = RetroChange(effective=effective, employee_ids=frozenset({"E1"}), raise_percent=5)
+    lines = list(compute_retro(history, [change]))
+
+    rerun = run_pay_history("E1", [(d, {**r, "salary": 8610.0} if d >= effective else r) for d, r in _biweekly(start, 26, base)])
+    expected = {p.period_end: p.result for p in rerun}
+    original = {p.period_end: p.result for p in history if p.employee_id == "E1"}
+    changed = {d for d in expected if expected[d] != original[d]}
+    assert {line.period_end for line in lines} == changed
+    assert all(line.employee_id == "E1" and line.corrected == expected[line.period_end] for line in lines)
+    # The raise reaches the SS wage base sooner: one later period loses SS it paid before
+    assert any(line.deltas()["social_security"] < 0 for line in lines)
+    totals = retro_totals(lines)["E1"]
+    assert totals["gross"] == round(sum(line.deltas()["gross"] for line in lines), 2) > 0
+
+
+def test_hours_correction_only_touches_its_period_below_the_caps() -> None:
+    start = date(2025, 1, 3)
+    history = run_pay_history("H1", _biweekly(start, 10, {"pay_type": "hourly", "hourly_rate": 25.0, "hours": 80}))
+    fix = date(2025, 2, 14)
+    lines = list(compute_retro(history, [RetroChange(effective=fix, through=fix, hours=84, reason="missed hours")]))
+    assert [(line.period_end, line.reason, line.deltas()["gross"]) for line in lines] == [(fix, "missed hours", 100.0)]
+
+
+def test_corrected_bonus_moves_later_bonus_across_the_supplemental_threshold() -> None:
+    bonus = {"pay_type": "salary", "withholding_method": "supplemental"}
+    march, june = date(2025, 3, 14), date(2025, 6, 13)
+    history = run_pay_history("B1", [(march, {**bonus, "salary": 900_000.0}), (june, {**bonus, "salary": 300_000.0})])
+    assert history[1].record["ytd_supplemental_wages"] == 900_000.0
+    lines = list(compute_retro(history, [RetroChange(effective=march, through=march, salary=800_000.0)]))
+
+    assert [line.period_end for line in lines] == [march, june]
+    assert lines[1].record["ytd_supplemental_wages"] == 800_000.0
+    # $100,000 of the June bonus moves from the 37% mandatory rate to 22%
+    assert lines[1].deltas()["federal_income_tax"] == -15_000.0
+    rerun = run_pay_history("B1", [(march, {**bonus, "salary": 800_000.0}), (june, {**bonus, "salary": 300_000.0})])
+    assert lines[1].corrected == rerun[1].result
@@ -0,0 +1,45 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from payroll_calculator import PayrollConfig, compute_paycheck  # noqa: E402
+from payroll_server import PayrollClient, PayrollServer  # noqa: E402
+
+
+def test_server_answers_single_batched_and_stats_requests() -> None:
+    server = PayrollServer()
+    server.warm_up()
+    loop = asyncio.new_event_loop()
+    srv = loop.run_until_complete(server.start(port=0))
+    port = srv.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        with PayrollClient(port=port) as client:
+            record = {"employee_id": "E1", "pay_type": "hourly", "hourly_rate": 31.5, "hours": 80, "ytd_wages": 172_000}
+            reply = client.compute(record, explain=True)
+            expected = compute_paycheck("hourly", hourly_rate=31.5, hours=80, config=PayrollConfig(ytd_wages=172_000))
+            assert reply["ok"] and reply["result"]["net"] == expected["net"]
+            assert reply["result"]["employee_id"] == "E1" and "Net pay" in reply["result"]["explanation"]
+
+            batch = client.compute_many([{"employee_id": str(i), "pay_type": "salary", "salary": 1000 + i} for i in range(600)]
+                                        + [{"employee_id": "bad", "pay_type": "hourly"}])
+            assert [r["employee_id"] for r in batch["results"][:600]] == [str(i) for i in range(600)]
+            assert "error" in batch["results"][-1]
+
+            assert client.request({"op": "nope"})["ok"] is False
+            stats = client.stats()
+            assert stats["records"] == 601 and stats["errors"] == 2
+            assert stats["latency_ms"]["count"] == 3 and stats["latency_ms"]["p50"] <= stats["latency_ms"]["max"]
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        srv.close()
+        loop.run_until_complete(srv.wait_closed())
+        loop.close()
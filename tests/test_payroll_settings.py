@@ -0,0 +1,60 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from payroll_settings import SettingsStore  # noqa: E402
+
+
+def test_settings_write_atomically_and_only_on_change(tmp_path: Path) -> None:
+    legacy = tmp_path / "old_settings.json"
+    legacy.write_text(json.dumps({"pay_type": "salary", "salary": "4000"}))
+    store = SettingsStore(tmp_path / "gui", legacy_file=legacy)
+    form = store.load()
+    assert form == {"pay_type": "salary", "salary": "4000"}
+
+    assert store.save(form)  # first save moves the legacy settings into the store
+    assert not store.save(dict(form))
+    written = store.settings_file.stat().st_mtime_ns
+    assert SettingsStore(tmp_path / "gui", legacy_file=None).load() == form
+
+    form["salary"] = "4100"
+    assert store.save(form) and store.settings_file.stat().st_mtime_ns >= written
+    assert [p.name for p in store.directory.iterdir()] == ["settings.json"]  # no temp files left behind
+
+    # A write that fails part-way leaves the previous file intact
+    with pytest.raises(TypeError):
+        store.save({"salary": object()})
+    assert json.loads(store.settings_file.read_text())["salary"] == "4100"
+
+    store.settings_file.write_text("{not json")
+    with pytest.raises(ValueError, match="not valid JSON"):
+        SettingsStore(tmp_path / "gui").load()
+
+
+def test_profiles_list_without_parsing_and_load_lazily(tmp_path: Path) -> None:
+    store = SettingsStore(tmp_path, legacy_file=None)
+    assert store.profile_names() == []
+    assert store.save_profile("E2 Ann/Smith", {"salary": "5200"})
+    assert store.save_profile("e1 bob", {"hourly_rate": "31"})
+    assert not store.save_profile("e1 bob", {"hourly_rate": "31"})
+    (store.profiles_dir / "Broken.json").write_text("[")
+
+    fresh = SettingsStore(tmp_path, legacy_file=None)
+    assert fresh.profile_names() == ["Broken", "e1 bob", "E2 Ann/Smith"]  # case-insensitive order
+    assert fresh.load_profile("E2 Ann/Smith") == {"salary": "5200"}
+    with pytest.raises(ValueError):
+        fresh.load_profile("Broken")
+    with pytest.raises(ValueError, match="No saved profile"):
+        fresh.load_profile("E3")
+
+    assert fresh.delete_profile("e1 bob") and not fresh.delete_profile("e1 bob")
+    assert fresh.profile_names() == ["Broken", "E2 Ann/Smith"]
+    with pytest.raises(ValueError):
+        fresh.save_profile("  ", {})
@@ -0,0 +1,87 @@
+import random
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from payroll_calculator import _earnings_breakdown, hours_from_daily  # noqa: E402
+from payroll_timesheet import compute_hours_breakdown, compute_timesheet_earnings, load_timesheet, read_timesheet  # noqa: E402
+
+
+def test_breakdown_matches_scalar_daily_hours() -> None:
+    rng = random.Random(11)
+    weeks = [[rng.choice((0, 4, 7.5, 8, 9, 10.25, 12, 13.5)) for _ in range(rng.randint(1, 14))] for _ in range(400)]
+    records = [{"employee_id": f"E{i}", "day": d, "hours": h} for i, week in enumerate(weeks) for d, h in enumerate(week)]
+    timesheet = load_timesheet(records)
+    for ca in (False, True):
+        breakdown = compute_hours_breakdown(timesheet, use_ca_daily_ot=ca)
+        for i, week in enumerate(weeks):
+            expected = hours_from_daily(",".join(str(h) for h in week), ca)
+            for name, value in expected.items():
+                assert breakdown[name][i] == pytest.approx(value, abs=1e-9)
+
+
+def test_blended_rate_earnings_match_scalar_daily_rates() -> None:
+    rng = random.Random(12)
+    periods = []
+    for _ in range(300):
+        days = rng.randint(1, 14)
+        periods.append(([rng.choice((0, 6, 8, 9.5, 10, 12.5)) for _ in range(days)],
+                        [rng.choice((None, None, 18.5, 31.0)) for _ in range(days)]))
+    records = [
+        {"employee_id": f"E{i}", "day": d, "hours": h, "rate": r}
+        for i, (hours, rates) in enumerate(periods)
+        for d, (h, r) in enumerate(zip(hours, rates))
+    ]
+    for ca in (False, True):
+        earnings = compute_timesheet_earnings(load_timesheet(records), 22.0, use_ca_daily_ot=ca)
+        for i, (hours, rates) in enumerate(periods):
+            if not any(hours):
+                continue
+            expected = _earnings_breakdown(
+                "hourly", hourly_rate=22.0, use_ca_daily_ot=ca,
+                daily_hours=",".join(str(h) for h in hours),
+                daily_rates=",".join("" if r is None else str(r) for r in rates),
+            )
+            for name in ("regular_hours", "overtime_hours", "doubletime_hours", "regular_pay", "overtime_pay", "gross"):
+                assert earnings[name][i] == pytest.approx(expected[name], abs=1e-9)
+
+
+def test_ca_layers_seventh_day_and_weekly_rules() -> None:
+    records = [{"employee_id": "A", "day": d, "hours": h} for d, h in enumerate([8, 8, 8, 8, 8, 8, 10])]
+    breakdown = compute_hours_breakdown(load_timesheet(records), use_ca_daily_ot=True)
+    assert (breakdown["regular_hours"][0], breakdown["overtime_hours"][0], breakdown["doubletime_hours"][0]) == (40.0, 16.0, 2.0)
+
+
+def test_punches_and_dates_are_grouped_into_workweeks(tmp_path: Path) -> None:
+    src = tmp_path / "punches.csv"
+    rows = ["employee_id,date,clock_in,clock_out,hours"]
+    for d in range(6, 20):  # two workweeks starting Monday 2025-01-06
+        rows.append(f"E1,2025-01-{d:02d},08:00,12:00,")
+        rows.append(f"E1,2025-01-{d:02d},12:30,16:30,")  # split shift, summed with the first
+    rows.append("E2,2025-01-07,,,45")
+    src.write_text("\n".join(rows) + "\n")
+    timesheet = read_timesheet(str(src), period_start=date(2025, 1, 6))
+    assert timesheet.employee_ids == ["E1", "E2"]
+    assert timesheet.period_start == date(2025, 1, 6)
+    weekly = compute_hours_breakdown(timesheet)
+    # 56 hours in each workweek: 16 OT per week, not 72 OT for the 112-hour period
+    assert weekly["regular_hours"].tolist() == [80.0, 40.0]
+    assert weekly["overtime_hours"].tolist() == [32.0, 5.0]
+    ca = compute_hours_breakdown(timesheet, use_ca_daily_ot=True)
+    assert ca["doubletime_hours"][0] == 0.0 and ca["overtime_hours"][0] == 32.0
+
+
+def test_bad_timesheet_records_are_reported() -> None:
+    with pytest.raises(ValueError, match="record 2"):
+        load_timesheet([{"employee_id": "A", "hours": 8}, {"employee_id": "A"}])
+    with pytest.raises(ValueError, match="mixes"):
+        load_timesheet([{"employee_id": "A", "day": 0, "hours": 8}, {"employee_id": "A", "date": "2025-01-06", "hours": 8}])
@@ -0,0 +1,64 @@
+import csv
+import io
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+pytest.importorskip("numpy")
+
+from payroll_calculator import PayrollConfig, compute_paycheck  # noqa: E402
+from payroll_whatif import format_whatif_table, scenario_grid, sweep, write_whatif_csv  # noqa: E402
+
+
+def _year_by_loop(config: PayrollConfig, periods: int, **earnings):
+    ytd, results = config.ytd_wages, []
+    for _ in range(periods):
+        result = compute_paycheck("salary", **earnings, config=replace(config, ytd_wages=ytd))
+        ytd = round(ytd + result.taxable_wages_fica, 2)
+        results.append(result)
+    return results
+
+
+def test_sweep_matches_period_by_period_paychecks_across_wage_base() -> None:
+    base = PayrollConfig(withholding_method="irs_percentage", ytd_wages=12_000, pretax_section125=150.0,
+                         work_state="NY", resident_state="NJ")
+    grid = scenario_grid(pretax_401k_percent=[0.0, 0.06], w4_step3_dependents_credit=[0.0, 4000.0],
+                         w4_step4c_extra_withholding=[0.0, 40.0], filing_status=["single", "married"])
+    report = sweep("salary", grid, config=base, salary=8000.0)
+
+    assert len(report.scenarios) == 16
+    # Most periods sit wholly below the SS wage base and share one computed paycheck
+    assert report.paychecks_computed < report.paychecks_projected / 3
+    for scenario in [report.baseline] + report.scenarios:
+        loop = _year_by_loop(replace(base, **scenario.overrides), 26, salary=8000.0)
+        assert scenario.net == round(sum(r.net for r in loop), 2)
+        assert scenario.federal_income_tax == round(sum(r.federal_income_tax for r in loop), 2)
+        assert scenario.social_security == round(sum(r.social_security for r in loop), 2)
+        take_home = [round(r.net - (r.gross - r.taxable_wages_fit), 2) for r in loop]
+        assert scenario.take_home == round(sum(take_home), 2)
+        assert (scenario.min_period_take_home, scenario.max_period_take_home) == (min(take_home), max(take_home))
+    saver = next(s for s in report.scenarios if s.overrides == {**grid[8], "filing_status": "single"})
+    assert saver.pretax_401k == 26 * 480.0 and saver.take_home_change < 0
+
+
+def test_table_csv_and_validation() -> None:
+    report = sweep("hourly", scenario_grid(w4_step4c_extra_withholding=[0.0, 25.0]), hourly_rate=30.0, hours=80,
+                   config=PayrollConfig(withholding_method="irs_percentage"), periods=4)
+    assert [s.take_home_change for s in report.scenarios] == [0.0, -100.0]
+    table = format_whatif_table(report, sort_by="take_home", top=1)
+    assert "Annual projection over 4 periods" in table and "extra 25" not in table and "current" in table
+
+    out = io.StringIO()
+    assert write_whatif_csv(report, out) == 3
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [r["scenario"] for r in rows] == ["current", "extra 0", "extra 25"]
+
+    with pytest.raises(ValueError):
+        scenario_grid(not_a_field=[1])
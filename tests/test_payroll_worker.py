@@ -0,0 +1,70 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from payroll_worker import BackgroundWorker  # noqa: E402
+
+
+def _poll_until(worker: BackgroundWorker, done, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not done() and time.monotonic() < deadline:
+        worker.poll()
+        time.sleep(0.005)
+    assert done()
+
+
+def test_rapid_submissions_are_debounced_to_the_latest() -> None:
+    worker = BackgroundWorker()
+    ran, delivered = [], []
+    try:
+        for i in range(5):
+            worker.submit("calculate", lambda token, x: ran.append(x) or x * 10, i,
+                          on_done=delivered.append, delay=0.05)
+        _poll_until(worker, lambda: delivered)
+        assert ran == [4] and delivered == [40]
+        assert not worker.busy()
+    finally:
+        worker.shutdown()
+
+
+def test_running_job_is_cancelled_and_its_result_dropped() -> None:
+    worker = BackgroundWorker()
+    started, steps, delivered, errors = threading.Event(), [], [], []
+
+    def slow(token):
+        started.set()
+        for i in range(200):
+            token.check()
+            steps.append(i)
+            time.sleep(0.005)
+        return "finished"
+
+    try:
+        worker.submit("calculate", slow, on_done=delivered.append)
+        assert started.wait(2)
+        assert worker.cancel("calculate") and not worker.cancel("export")
+        worker.submit("export", lambda token: 1 / 0, on_error=errors.append)
+        _poll_until(worker, lambda: errors)
+        assert delivered == [] and len(steps) < 200
+        assert isinstance(errors[0], ZeroDivisionError)
+    finally:
+        worker.shutdown()
+
+
+def test_callbacks_run_on_the_polling_thread() -> None:
+    worker = BackgroundWorker()
+    threads = []
+    try:
+        worker.submit("calculate", lambda token: threading.get_ident(),
+                      on_done=lambda worker_thread: threads.append((worker_thread, threading.get_ident())))
+        _poll_until(worker, lambda: threads)
+        worker_thread, callback_thread = threads[0]
+        assert worker_thread != callback_thread == threading.get_ident()
+    finally:
+        worker.shutdown()
@@ -0,0 +1,54 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from payroll_calculator import PayrollConfig, compute_paycheck  # noqa: E402
+from state_tax import parse_state_year, state_tables, state_withholding  # noqa: E402
+from tax_params import TaxParameterRegistry  # noqa: E402
+
+
+def test_flat_none_and_bracket_tables() -> None:
+    assert state_withholding(2000.0, work_state="pa") == (61.4, 0.0)
+    assert state_withholding(2000.0, work_state="TX") == (0.0, 0.0)
+    ca = state_tables(2025).state("CA")
+    # 50,000 - 5,706 standard deduction across the 1.1%, 2.2%, 4.4% and 6.6% brackets
+    expected = 11079 * 0.011 + (26264 - 11079) * 0.022 + (41452 - 26264) * 0.044 + (44294 - 41452) * 0.066
+    assert ca.annual_tax(50_000.0, "single") == pytest.approx(expected)
+    assert ca.annual_tax(50_000.0, "single", allowances=2) == pytest.approx(expected - 2 * 153.4)
+    with pytest.raises(ValueError, match="No state withholding table"):
+        state_withholding(2000.0, work_state="ZZ")
+
+
+def test_work_and_resident_state_allocation() -> None:
+    ny, _ = state_withholding(4000.0, work_state="NY")
+    nj, _ = state_withholding(4000.0, work_state="NJ")
+    ca, _ = state_withholding(4000.0, work_state="CA")
+    # Resident state withholds its own tax less the credit for work-state tax
+    assert state_withholding(4000.0, work_state="NY", resident_state="NJ") == (ny, round(max(nj - ny, 0.0), 2))
+    assert state_withholding(4000.0, work_state="TX", resident_state="CA") == (0.0, ca)
+    # Reciprocity: PA withholds nothing for NJ residents, NJ withholds in full
+    assert state_withholding(4000.0, work_state="PA", resident_state="NJ") == (0.0, nj)
+    # A resident state alone is also its work state
+    assert state_withholding(4000.0, work_state="", resident_state="CA") == (ca, 0.0)
+
+    config = PayrollConfig(work_state="PA", resident_state="NJ")
+    assert compute_paycheck("salary", salary=4000.0, config=config).state_income_tax == nj
+    flat = PayrollConfig(work_state="PA", resident_state="NJ", state_rate=0.05)
+    assert compute_paycheck("salary", salary=4000.0, config=flat).state_income_tax == 200.0
+
+
+def test_state_registry_reads_custom_tables(tmp_path: Path) -> None:
+    data = {"year": 2030, "states": {"zz": {"type": "flat", "rate": 0.1, "standard_deduction": {"single": 2600}}}}
+    (tmp_path / "2030.json").write_text(json.dumps(data))
+    tables = TaxParameterRegistry(tmp_path, parse=parse_state_year).get(2031)
+    assert tables.year == 2030
+    assert tables.state("ZZ").annual_tax(26_000.0, "married") == pytest.approx(2340.0)
+    with pytest.raises(ValueError, match="type must be"):
+        parse_state_year({"year": 2030, "states": {"ZZ": {"type": "sliding"}}})
@@ -0,0 +1,43 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+if str(TOOLS_DIR) not in sys.path:
+    sys.path.insert(0, str(TOOLS_DIR))
+
+from payroll_calculator import PayrollConfig, compute_paycheck  # noqa: E402
+from tax_params import DEFAULT_REGISTRY, TaxParameterRegistry, tax_year  # noqa: E402
+
+
+def test_year_tables_are_cached_and_immutable() -> None:
+    params = tax_year(2024)
+    assert tax_year(2024) is params
+    assert params.ss_wage_base == 168600.0
+    with pytest.raises(TypeError):
+        params.standard_deductions["single"] = 0.0  # type: ignore[index]
+
+
+def test_unknown_year_falls_back_to_latest_tables() -> None:
+    assert tax_year(2099) is tax_year(DEFAULT_REGISTRY.available_years()[-1])
+
+
+def test_prior_year_uses_its_own_brackets() -> None:
+    kwargs = dict(salary=4000.0)
+    current = compute_paycheck("salary", **kwargs, config=PayrollConfig(year=2025, withholding_method="irs_percentage"))
+    prior = compute_paycheck("salary", **kwargs, config=PayrollConfig(year=2023, withholding_method="irs_percentage"))
+    assert prior["federal_income_tax"] != current["federal_income_tax"]
+
+
+def test_registry_reads_custom_data_dir(tmp_path: Path) -> None:
+    data = json.loads((TOOLS_DIR / "tax_tables" / "2025.json").read_text())
+    data["year"] = 2030
+    data["social_security"]["wage_base"] = 200000
+    (tmp_path / "2030.json").write_text(json.dumps(data))
+    registry = TaxParameterRegistry(tmp_path)
+    assert registry.available_years() == (2030,)
+    assert registry.get(2030).ss_wage_base == 200000.0
+    assert registry.get(2031) is registry.get(2030)
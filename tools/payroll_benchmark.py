@@ -0,0 +1,321 @@
+"""Throughput benchmarks for the payroll engine.
+
+Generates a seeded synthetic workforce (hourly/salary mix, daily-hours strings,
+varied W-4 profiles, YTD wages clustered around the Social Security wage base and
+the Additional Medicare threshold) and times the hot paths at several workforce
+sizes. Results are written as JSON so runs from different commits can be compared:
+
+    python tools/payroll_benchmark.py --sizes 1000,100000 --output bench.json
+    python tools/payroll_benchmark.py --sizes 1000,100000 --compare bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from payroll_calculator import (
+    PayrollConfig,
+    hours_from_daily,
+    build_explanation_text,
+    clear_withholding_cache,
+    compute_paycheck,
+    federal_withholding_percentage_method,
+)
+from payroll_pipeline import record_to_paycheck_args
+
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+BENCHMARKS = (
+    "compute_paycheck",
+    "hours_from_daily",
+    "timesheet_breakdown",
+    "percentage_method",
+    "build_explanation_text",
+    "compute_payroll_batch",
+    "compute_payroll_cents",
+)
+_NUMPY_BENCHMARKS = ("timesheet_breakdown", "compute_payroll_batch", "compute_payroll_cents")
+# Items are generated and prepared in chunks so 1M-employee runs stay within memory
+CHUNK_SIZE = 50_000
+
+
+def _ytd_wages(rng: random.Random) -> float:
+    bucket = rng.random()
+    if bucket < 0.6:
+        return round(rng.uniform(0, 150_000), 2)
+    if bucket < 0.8:
+        return round(rng.uniform(165_000, 180_000), 2)  # around the SS wage base
+    return round(rng.uniform(190_000, 210_000), 2)  # around the Additional Medicare threshold
+
+
+def generate_workforce(n: int, seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Yield ``n`` synthetic employee records in the ``payroll_pipeline`` record format.
+    The same ``seed`` always yields the same workforce.
+    """
+    rng = random.Random(seed)
+    for i in range(n):
+        periods = rng.choice((52, 26, 26, 24, 12))
+        record: Dict[str, Any] = {
+            "employee_id": f"E{i:07d}",
+            "pay_periods_per_year": periods,
+            "ytd_wages": _ytd_wages(rng),
+            "withholding_method": "irs_percentage" if rng.random() < 0.7 else "flat",
+            "federal_rate": rng.choice((0.10, 0.12, 0.22)),
+            "state_rate": rng.choice((None, 0.0307, 0.05, 0.0725)),
+            "filing_status": rng.choice(("single", "single", "married", "head")),
+            "w4_step2": rng.random() < 0.1,
+            "w4_step3_dependents_credit": rng.choice((0.0, 0.0, 2000.0, 4000.0)),
+            "w4_step4c_extra_withholding": rng.choice((0.0, 0.0, 0.0, 25.0, 50.0)),
+            "pretax_401k_percent": rng.choice((0.0, 0.03, 0.05, 0.10)),
+            "pretax_section125": rng.choice((0.0, 45.0, 120.0)),
+        }
+        if rng.random() < 0.6:
+            record["pay_type"] = "hourly"
+            record["hourly_rate"] = round(rng.uniform(15, 85), 2)
+            if rng.random() < 0.4:
+                days = 5 if periods >= 52 else 10
+                record["daily_hours"] = ",".join(f"{rng.choice((0, 6, 7.5, 8, 8, 8, 9, 10, 11, 12.5)):g}" for _ in range(days))
+                record["use_ca_daily_ot"] = rng.random() < 0.3
+            else:
+                record["hours"] = round(rng.uniform(20, 2080 / periods), 2)
+                record["overtime_hours"] = rng.choice((0.0, 0.0, round(rng.uniform(0.5, 12), 2)))
+        else:
+            record["pay_type"] = "salary"
+            record["salary"] = round(rng.uniform(40_000, 400_000) / periods, 2)
+        yield record
+
+
+def _chunks(items: Iterable[Any], size: int = CHUNK_SIZE) -> Iterator[List[Any]]:
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _time_chunked(prepared: Iterable[List[Any]], fn: Callable[[List[Any]], None]) -> float:
+    # Only the calls themselves are timed; generating and preparing inputs is excluded
+    elapsed = 0.0
+    for chunk in prepared:
+        start = time.perf_counter()
+        fn(chunk)
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def _prepared_paychecks(n: int, seed: int):
+    defaults = PayrollConfig()
+    for chunk in _chunks(generate_workforce(n, seed)):
+        yield [record_to_paycheck_args(r, defaults) for r in chunk]
+
+
+def _run_compute_paycheck(chunk) -> None:
+    for pay_type, kwargs, config in chunk:
+        compute_paycheck(pay_type, **kwargs, config=config)
+
+
+def _run_explanations(chunk) -> None:
+    for pay_type, kwargs, config in chunk:
+        build_explanation_text(pay_type, **kwargs, config=config)
+
+
+def _run_hours_from_daily(chunk) -> None:
+    for daily, use_ca in chunk:
+        hours_from_daily(daily, use_ca)
+
+
+def _prepared_daily_hours(n: int, seed: int):
+    rng = random.Random(seed)
+    choices = (0, 6, 7.5, 8, 8, 8, 9, 10, 11, 12.5)
+    for chunk in _chunks(range(n)):
+        yield [(",".join(f"{rng.choice(choices):g}" for _ in range(5)), rng.random() < 0.3) for _ in chunk]
+
+
+def _prepared_timesheets(n: int, seed: int):
+    from payroll_timesheet import load_timesheet
+
+    for chunk in _prepared_daily_hours(n, seed):
+        records = [
+            {"employee_id": f"E{i}", "day": d, "hours": float(h)}
+            for i, (daily, _) in enumerate(chunk)
+            for d, h in enumerate(daily.split(","))
+        ]
+        yield [load_timesheet(records)]
+
+
+def _run_timesheet(chunk) -> None:
+    from payroll_timesheet import compute_hours_breakdown
+
+    compute_hours_breakdown(chunk[0], use_ca_daily_ot=True)
+
+
+def _prepared_withholding(n: int, seed: int):
+    for chunk in _chunks(generate_workforce(n, seed)):
+        prepared = []
+        for r in chunk:
+            wage = r.get("salary") or r["hourly_rate"] * (r.get("hours") or 80.0)
+            prepared.append((round(wage * (1 - r["pretax_401k_percent"]), 2), dict(
+                filing_status=r["filing_status"],
+                pay_periods_per_year=r["pay_periods_per_year"],
+                w4_step2=r["w4_step2"],
+                w4_step3_dependents_credit=r["w4_step3_dependents_credit"],
+                w4_step4a_other_income=0.0,
+                w4_step4b_deductions=0.0,
+                w4_step4c_extra_withholding=r["w4_step4c_extra_withholding"],
+            )))
+        yield prepared
+
+
+def _run_withholding(chunk) -> None:
+    for wage, profile in chunk:
+        federal_withholding_percentage_method(wage, **profile)
+
+
+def _prepared_batch_columns(n: int, seed: int):
+    import numpy as np
+
+    for chunk in _chunks(generate_workforce(n, seed)):
+        rows = [r for r in chunk if "daily_hours" not in r]
+        columns: Dict[str, Any] = {}
+        for key in ("pay_type", "withholding_method", "filing_status"):
+            columns[key] = np.array([r[key] for r in rows])
+        for key in ("hourly_rate", "hours", "overtime_hours", "salary", "ytd_wages", "federal_rate", "state_rate",
+                    "pay_periods_per_year", "w4_step2", "w4_step3_dependents_credit", "w4_step4c_extra_withholding",
+                    "pretax_401k_percent", "pretax_section125"):
+            columns[key] = np.array([np.nan if r.get(key) is None else float(r[key]) for r in rows])
+        yield [columns]
+
+
+def _run_batch(chunk) -> None:
+    from payroll_batch import compute_payroll_batch
+
+    compute_payroll_batch(chunk[0])
+
+
+def _run_cents(chunk) -> None:
+    from payroll_cents import compute_payroll_cents
+
+    compute_payroll_cents(chunk[0])
+
+
+def _count_batch_rows(n: int, seed: int) -> int:
+    return sum(1 for r in generate_workforce(n, seed) if "daily_hours" not in r)
+
+
+def run_benchmarks(sizes: Iterable[int], *, seed: int = 0, only: Optional[Iterable[str]] = None,
+                   log: Optional[Callable[[str], None]] = None) -> List[Dict[str, Any]]:
+    """Run the selected benchmarks at each size and return one result dict per (benchmark, size)."""
+    selected = tuple(only) if only else BENCHMARKS
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(sorted(unknown))}")
+    plans = {
+        "compute_paycheck": (_prepared_paychecks, _run_compute_paycheck),
+        "hours_from_daily": (_prepared_daily_hours, _run_hours_from_daily),
+        "timesheet_breakdown": (_prepared_timesheets, _run_timesheet),
+        "percentage_method": (_prepared_withholding, _run_withholding),
+        "build_explanation_text": (_prepared_paychecks, _run_explanations),
+        "compute_payroll_batch": (_prepared_batch_columns, _run_batch),
+        "compute_payroll_cents": (_prepared_batch_columns, _run_cents),
+    }
+    results = []
+    for name in selected:
+        if name in _NUMPY_BENCHMARKS:
+            try:
+                import numpy  # noqa: F401
+            except ImportError:
+                if log:
+                    log(f"skipping {name}: numpy is not installed")
+                continue
+        prepare, run = plans[name]
+        for n in sizes:
+            clear_withholding_cache()
+            seconds = _time_chunked(prepare(n, seed), run)
+            items = _count_batch_rows(n, seed) if name in ("compute_payroll_batch", "compute_payroll_cents") else n
+            entry = {
+                "benchmark": name,
+                "size": n,
+                "items": items,
+                "seconds": round(seconds, 6),
+                "per_second": round(items / seconds, 1) if seconds > 0 else None,
+            }
+            results.append(entry)
+            if log:
+                log(f"{name:>24} n={n:>9,}: {seconds:9.3f}s  {entry['per_second'] or 0:>14,.0f}/s")
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                             cwd=Path(__file__).resolve().parent, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def compare_results(current: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float) -> List[str]:
+    """Return one line per benchmark/size present in both runs; lines for regressions start with 'REGRESSION'."""
+    base = {(r["benchmark"], r["size"]): r for r in baseline}
+    lines = []
+    for r in current:
+        old = base.get((r["benchmark"], r["size"]))
+        if not old or not old.get("per_second") or not r.get("per_second"):
+            continue
+        ratio = r["per_second"] / old["per_second"]
+        tag = "REGRESSION" if ratio < 1.0 - threshold else "ok"
+        lines.append(f"{tag:>10} {r['benchmark']:>24} n={r['size']:>9,}: {ratio:6.2f}x baseline throughput")
+    return lines
+
+
+def main():
+    p = argparse.ArgumentParser(description="Benchmark the payroll engine on a synthetic workforce.")
+    p.add_argument("--sizes", type=str, default=",".join(str(n) for n in DEFAULT_SIZES), help="Comma-separated workforce sizes (default 1000,100000,1000000)")
+    p.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic workforce")
+    p.add_argument("--only", type=str, default=None, help=f"Comma-separated subset of: {', '.join(BENCHMARKS)}")
+    p.add_argument("--output", type=str, default=None, help="Write JSON results to this path (default stdout)")
+    p.add_argument("--compare", type=str, default=None, help="Baseline JSON results to compare against")
+    p.add_argument("--threshold", type=float, default=0.10, help="Throughput drop that counts as a regression (default 0.10 = 10%%)")
+    args = p.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    only = [s.strip() for s in args.only.split(",")] if args.only else None
+    results = run_benchmarks(sizes, seed=args.seed, only=only, log=lambda msg: print(msg, file=sys.stderr))
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        lines = compare_results(results, baseline.get("results", []), args.threshold)
+        print(f"Compared with {args.compare} (commit {baseline.get('commit') or 'unknown'}):", file=sys.stderr)
+        for line in lines:
+            print(line, file=sys.stderr)
+        if any(line.lstrip().startswith("REGRESSION") for line in lines):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
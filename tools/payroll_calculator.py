@@ -1,15 +1,22 @@
-import argparse
-import json
-from dataclasses import dataclass
+import sys
+import time
+
+_MODULE_START = time.perf_counter()
+
+from bisect import bisect_left
+from dataclasses import asdict, dataclass, replace
+from functools import lru_cache
 from typing import Optional, Dict
 
+from payroll_results import RESULT_FIELDS, PaycheckResult
+from state_tax import state_tables, state_withholding
+from tax_params import DEFAULT_REGISTRY, BracketTable, tax_year
+
 
-# 2025 Social Security wage base (edit as needed in future years)
-SSA_WAGE_BASE_BY_YEAR = {
-    2023: 160200,
-    2024: 168600,
-    2025: 174000,
-}
+# Rates, wage bases, standard deductions and brackets live in tax_tables/<year>.json
+# and are loaded through tax_params. The legacy module-level views
+# (SSA_WAGE_BASE_BY_YEAR, STANDARD_DEDUCTION_2025, IRS_2025_BRACKETS) are kept for
+# callers that still read them directly; see __getattr__ below.
 
 
 @dataclass
@@ -17,9 +24,13 @@ class PayrollConfig:
     year: int = 2025
     ytd_wages: float = 0.0  # Year-to-date Medicare/SS taxable wages before this paycheck (FICA taxable)
     # Withholding mode
-    withholding_method: str = "flat"  # 'flat' or 'irs_percentage'
+    withholding_method: str = "flat"  # 'flat', 'irs_percentage', or for bonus/commission checks 'supplemental' or 'aggregate'
     federal_rate: Optional[float] = None  # used when withholding_method == 'flat'
-    state_rate: Optional[float] = None  # simple state flat rate
+    state_rate: Optional[float] = None  # simple state flat rate (overrides the state tables when set)
+    # State tables (state_tax): two-letter codes; blank resident state = work state
+    work_state: str = ""
+    resident_state: str = ""
+    state_allowances: int = 0
     # W-4 style inputs for percentage method
     filing_status: str = "single"  # single|married|head
     pay_periods_per_year: int = 26
@@ -28,6 +39,9 @@ class PayrollConfig:
     w4_step4a_other_income: float = 0.0      # annual
     w4_step4b_deductions: float = 0.0        # annual, in excess of standard deduction
     w4_step4c_extra_withholding: float = 0.0 # per period extra withholding
+    # Supplemental wages (withholding_method 'supplemental' or 'aggregate')
+    ytd_supplemental_wages: float = 0.0  # supplemental wages paid this year before this check (37% over $1M)
+    regular_wages: float = 0.0           # FIT-taxable regular wages of the same period ('aggregate' method)
     # Pre-tax deductions per period (dollars)
     pretax_401k: float = 0.0            # reduces FIT only (traditional 401k)
     pretax_hsa: float = 0.0             # reduces FIT and FICA when via cafeteria plan
@@ -45,15 +59,16 @@ def _clamp(val: float, lo: float, hi: float) -> float:
     return max(lo, min(hi, val))
 
 
-def social_security(employee_gross: float, *, year: int, ytd_wages: float, rate: float = 0.062) -> float:
+def social_security(employee_gross: float, *, year: int, ytd_wages: float, rate: Optional[float] = None) -> float:
     """
-    Employee Social Security (OASDI) at 6.2% up to wage base.
+    Employee Social Security (OASDI) at the year's rate (6.2%) up to the year's wage base.
     Considers YTD wages for proper capping within the year.
+    Years without tax tables use the most recent year on file.
     """
-    base = SSA_WAGE_BASE_BY_YEAR.get(year)
-    if base is None:
-        # Default to most recent known base if year not found
-        base = max(SSA_WAGE_BASE_BY_YEAR.values())
+    params = tax_year(year)
+    base = params.ss_wage_base
+    if rate is None:
+        rate = params.ss_rate
 
     # Taxable portion this period is the part that remains under the wage base
     already_counted = min(ytd_wages, base)
@@ -62,11 +77,25 @@ def social_security(employee_gross: float, *, year: int, ytd_wages: float, rate:
     return round(taxable_this_period * rate, 2)
 
 
-def medicare(employee_gross: float, *, ytd_wages: float, rate: float = 0.0145, addl_threshold: float = 200000.0, addl_rate: float = 0.009) -> float:
+def medicare(
+    employee_gross: float,
+    *,
+    ytd_wages: float,
+    rate: Optional[float] = None,
+    addl_threshold: Optional[float] = None,
+    addl_rate: Optional[float] = None,
+    year: int = 2025,
+) -> float:
     """
-    Employee Medicare at 1.45% on all wages + Additional Medicare 0.9% on wages over $200,000.
+    Employee Medicare at 1.45% on all wages + Additional Medicare 0.9% on wages over $200,000
+    (rates and threshold from the year's tax tables unless given).
     Considers YTD wages for when the additional rate kicks in.
     """
+    params = tax_year(year)
+    rate = params.medicare_rate if rate is None else rate
+    addl_threshold = params.addl_medicare_threshold if addl_threshold is None else addl_threshold
+    addl_rate = params.addl_medicare_rate if addl_rate is None else addl_rate
+
     # Base Medicare on all current wages
     base_part = employee_gross * rate
 
@@ -83,56 +112,49 @@ def medicare(employee_gross: float, *, ytd_wages: float, rate: float = 0.0145, a
     return round(base_part + addl_part, 2)
 
 
-def employer_medicare(employee_gross: float, *, ytd_wages: float, rate: float = 0.0145) -> float:
+def employer_medicare(employee_gross: float, *, ytd_wages: float, rate: Optional[float] = None, year: int = 2025) -> float:
     """
     Employer Medicare portion is 1.45% on all wages. There is no employer-paid Additional Medicare tax.
     """
+    if rate is None:
+        rate = tax_year(year).medicare_rate
     return round(employee_gross * rate, 2)
 
 
-# 2025 standard deductions (approx; for planning)
-STANDARD_DEDUCTION_2025 = {
-    "single": 14600.0,
-    "married": 29200.0,
-    "head": 21900.0,
-}
-
-# 2025 tax brackets (approximate) for percentage method (annualized)
-# Each is list of tuples: (threshold, rate)
-IRS_2025_BRACKETS = {
-    "single": [
-        (0, 0.10), (11600, 0.12), (47150, 0.22), (100525, 0.24), (191950, 0.32), (243725, 0.35), (609350, 0.37)
-    ],
-    "married": [
-        (0, 0.10), (23200, 0.12), (94300, 0.22), (201050, 0.24), (383900, 0.32), (487450, 0.35), (731200, 0.37)
-    ],
-    "head": [
-        (0, 0.10), (16550, 0.12), (63100, 0.22), (100500, 0.24), (191950, 0.32), (243700, 0.35), (609350, 0.37)
-    ],
-}
-
-
-def _progressive_tax_annual(taxable_annual: float, filing_status: str) -> float:
-    brackets = IRS_2025_BRACKETS.get(filing_status, IRS_2025_BRACKETS["single"])
-    tax = 0.0
-    last_threshold = 0.0
-    last_rate = 0.0
-    for i, (thr, rate) in enumerate(brackets):
-        if i == 0:
-            last_threshold = thr
-            last_rate = rate
-            continue
-        if taxable_annual > thr:
-            tax += (thr - last_threshold) * last_rate
-            last_threshold = thr
-            last_rate = rate
-        else:
-            break
-    # Remaining amount
-    tax += max(taxable_annual - last_threshold, 0) * last_rate
+def __getattr__(name: str):
+    # Legacy table views are built on first access, so importing this module (every
+    # CLI run) loads only the tax year actually used rather than every year on file
+    if name == "SSA_WAGE_BASE_BY_YEAR":
+        value = {y: tax_year(y).ss_wage_base for y in DEFAULT_REGISTRY.available_years()}
+    elif name == "STANDARD_DEDUCTION_2025":
+        # 2025 standard deductions (approximate; for planning), as loaded from the tax tables
+        value = dict(tax_year(2025).standard_deductions)
+    elif name == "IRS_2025_BRACKETS":
+        value = {status: list(b) for status, b in tax_year(2025).brackets.items()}
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def _bracket_table(filing_status: str, year: int = 2025) -> BracketTable:
+    return tax_year(year).bracket_table(filing_status)
+
+
+def _progressive_tax_annual(taxable_annual: float, filing_status: str, year: int = 2025) -> float:
+    table = tax_year(year).bracket_table(filing_status)
+    # Last bracket whose threshold the income strictly exceeds (first bracket if none)
+    i = max(bisect_left(table.thresholds, taxable_annual) - 1, 0)
+    tax = table.cumulative_tax[i] + max(taxable_annual - table.thresholds[i], 0) * table.rates[i]
     return max(tax, 0.0)
 
 
+# Most employees in a run share a handful of W-4 profiles and wage amounts, so the
+# percentage method is memoized on (wage, W-4 profile, year). Tax tables per year are
+# immutable, so cached values never go stale.
+WITHHOLDING_CACHE_SIZE = 8192
+
+
 def federal_withholding_percentage_method(
     fit_taxable_period: float,
     *,
@@ -143,11 +165,38 @@ def federal_withholding_percentage_method(
     w4_step4a_other_income: float,
     w4_step4b_deductions: float,
     w4_step4c_extra_withholding: float,
+    year: int = 2025,
 ) -> float:
     """
     Simplified implementation of IRS Pub 15-T percentage-method withholding using annualization.
     This is an approximation for planning and may differ from exact IRS tables.
+    Results are memoized; see ``withholding_cache_info``.
     """
+    return _percentage_method_cached(
+        fit_taxable_period,
+        filing_status,
+        pay_periods_per_year,
+        bool(w4_step2),
+        w4_step3_dependents_credit or 0.0,
+        w4_step4a_other_income or 0.0,
+        w4_step4b_deductions or 0.0,
+        w4_step4c_extra_withholding or 0.0,
+        year,
+    )
+
+
+@lru_cache(maxsize=WITHHOLDING_CACHE_SIZE)
+def _percentage_method_cached(
+    fit_taxable_period: float,
+    filing_status: str,
+    pay_periods_per_year: int,
+    w4_step2: bool,
+    w4_step3_dependents_credit: float,
+    w4_step4a_other_income: float,
+    w4_step4b_deductions: float,
+    w4_step4c_extra_withholding: float,
+    year: int,
+) -> float:
     # Annualize wages
     annual_wages = fit_taxable_period * pay_periods_per_year
     if w4_step2:
@@ -155,27 +204,37 @@ def federal_withholding_percentage_method(
         annual_wages *= 2
 
     # Apply other income and deductions (Step 4)
-    annual_taxable_income = max(annual_wages + (w4_step4a_other_income or 0.0) - (w4_step4b_deductions or 0.0), 0.0)
+    annual_taxable_income = max(annual_wages + w4_step4a_other_income - w4_step4b_deductions, 0.0)
 
     # Subtract approximate standard deduction
-    standard = STANDARD_DEDUCTION_2025.get(filing_status, STANDARD_DEDUCTION_2025["single"])
+    standard = tax_year(year).standard_deduction(filing_status)
     annual_taxable_income = max(annual_taxable_income - standard, 0.0)
 
     # Compute annual tax
-    annual_tax = _progressive_tax_annual(annual_taxable_income, filing_status)
+    annual_tax = _progressive_tax_annual(annual_taxable_income, filing_status, year)
 
     # Reduce by dependents credit (Step 3)
-    annual_tax = max(annual_tax - (w4_step3_dependents_credit or 0.0), 0.0)
+    annual_tax = max(annual_tax - w4_step3_dependents_credit, 0.0)
 
     # Convert to per-period
     per_period_tax = annual_tax / pay_periods_per_year
 
     # Add extra withholding per period (Step 4c)
-    per_period_tax += (w4_step4c_extra_withholding or 0.0)
+    per_period_tax += w4_step4c_extra_withholding
 
     return round(per_period_tax, 2)
 
 
+def withholding_cache_info():
+    """Hit/miss counters of the percentage-method cache (``functools`` ``CacheInfo``)."""
+    return _percentage_method_cached.cache_info()
+
+
+def clear_withholding_cache() -> None:
+    """Drop cached withholding amounts and reset the counters (e.g. after editing tax tables)."""
+    _percentage_method_cached.cache_clear()
+
+
 def federal_withholding_percentage_details(
     fit_taxable_period: float,
     *,
@@ -186,6 +245,7 @@ def federal_withholding_percentage_details(
     w4_step4a_other_income: float,
     w4_step4b_deductions: float,
     w4_step4c_extra_withholding: float,
+    year: int = 2025,
 ):
     # Annualize wages
     annual_wages = fit_taxable_period * pay_periods_per_year
@@ -196,11 +256,12 @@ def federal_withholding_percentage_details(
     annual_taxable_income_pre_std = max(annual_wages_adj + (w4_step4a_other_income or 0.0) - (w4_step4b_deductions or 0.0), 0.0)
 
     # Subtract approximate standard deduction
-    standard = STANDARD_DEDUCTION_2025.get(filing_status, STANDARD_DEDUCTION_2025["single"])
+    params = tax_year(year)
+    standard = params.standard_deduction(filing_status)
     annual_taxable_income = max(annual_taxable_income_pre_std - standard, 0.0)
 
     # Compute annual tax with bracket steps
-    brackets = IRS_2025_BRACKETS.get(filing_status, IRS_2025_BRACKETS["single"])
+    brackets = params.bracket_schedule(filing_status)
     remaining = annual_taxable_income
     steps = []
     tax = 0.0
@@ -252,6 +313,64 @@ def federal_withholding_percentage_details(
     return round(per_period_tax, 2), details
 
 
+SUPPLEMENTAL_METHODS = ("supplemental", "aggregate")
+
+
+def _percentage_method_for(fit_taxable_period: float, config: PayrollConfig) -> float:
+    return federal_withholding_percentage_method(
+        fit_taxable_period,
+        filing_status=config.filing_status,
+        pay_periods_per_year=config.pay_periods_per_year,
+        w4_step2=config.w4_step2,
+        w4_step3_dependents_credit=config.w4_step3_dependents_credit,
+        w4_step4a_other_income=config.w4_step4a_other_income,
+        w4_step4b_deductions=config.w4_step4b_deductions,
+        w4_step4c_extra_withholding=config.w4_step4c_extra_withholding,
+        year=config.year,
+    )
+
+
+def supplemental_withholding_details(fit_taxable_period: float, config: PayrollConfig):
+    """
+    Federal withholding on a check of supplemental wages (bonus, commission).
+    The part that takes the year's supplemental wages over the mandatory threshold
+    ($1M) is withheld at the mandatory rate (37%). The rest is withheld at the flat
+    supplemental rate (22%) with ``withholding_method='supplemental'``, or with
+    ``'aggregate'`` as the percentage-method tax on ``regular_wages`` plus these
+    wages less the tax on ``regular_wages`` alone. Returns ``(tax, details)``.
+    """
+    params = tax_year(config.year)
+    ytd = max(config.ytd_supplemental_wages, 0.0)
+    room = max(params.supplemental_mandatory_threshold - ytd, 0.0)
+    below = _clamp(fit_taxable_period, 0, room)
+    above = max(fit_taxable_period - below, 0.0)
+    details = {
+        "method": config.withholding_method,
+        "ytd_supplemental_wages": round(ytd, 2),
+        "mandatory_threshold": params.supplemental_mandatory_threshold,
+        "mandatory_rate": params.supplemental_mandatory_rate,
+        "below_threshold": round(below, 2),
+        "above_threshold": round(above, 2),
+    }
+    if config.withholding_method == "aggregate":
+        regular = max(config.regular_wages, 0.0)
+        on_regular = _percentage_method_for(regular, config)
+        on_total = _percentage_method_for(regular + below, config)
+        tax_below = max(on_total - on_regular, 0.0)
+        details.update(regular_wages=round(regular, 2), tax_on_total=on_total, tax_on_regular=on_regular)
+    else:
+        tax_below = below * params.supplemental_rate
+        details["supplemental_rate"] = params.supplemental_rate
+    details["tax_below_threshold"] = round(tax_below, 2)
+    details["tax_above_threshold"] = round(above * params.supplemental_mandatory_rate, 2)
+    return round(tax_below + above * params.supplemental_mandatory_rate, 2), details
+
+
+def supplemental_withholding(fit_taxable_period: float, config: PayrollConfig) -> float:
+    """Federal withholding on supplemental wages; see ``supplemental_withholding_details``."""
+    return supplemental_withholding_details(fit_taxable_period, config)[0]
+
+
 def federal_income_tax(employee_gross: float, federal_rate: Optional[float]) -> float:
     """
     Simplified federal withholding: flat percentage if provided. If None/0, returns 0.
@@ -268,39 +387,108 @@ def state_income_tax(employee_gross: float, state_rate: Optional[float]) -> floa
     return round(employee_gross * state_rate, 2)
 
 
-def _hours_from_daily(daily_hours: Optional[str], use_ca_daily_ot: bool) -> Dict[str, float]:
+# Overtime thresholds: CA daily OT/DT hours and the FLSA weekly OT hours
+CA_DAILY_OT_AFTER = 8.0
+CA_DAILY_DT_AFTER = 12.0
+WEEKLY_OT_AFTER = 40.0
+
+
+def _split_workweek(hours_list, use_ca_daily_ot: bool):
+    """
+    Split one workweek's day hours (first day of the workweek first) into (regular, OT, DT).
+    CA mode layers three rules: daily OT over 8 and DT over 12; the seventh consecutive
+    day worked in the workweek (OT for the first 8 hours, DT beyond); and weekly OT for
+    regular hours beyond 40. Otherwise only the weekly rule applies.
     """
-    Parse comma-separated daily hours and compute breakdown.
-    If use_ca_daily_ot is True: OT over 8 up to 12 (1.5x), DT over 12 (2.0x) per day. Weekly thresholds not layered here.
+    reg = ot = dt = 0.0
+    if not use_ca_daily_ot:
+        total = sum(hours_list)
+        reg = min(total, WEEKLY_OT_AFTER)
+        return reg, total - reg, 0.0
+    seventh_day = len(hours_list) == 7 and all(h > 0 for h in hours_list)
+    for i, h in enumerate(hours_list):
+        if seventh_day and i == 6:
+            ot += min(h, CA_DAILY_OT_AFTER)
+            dt += max(h - CA_DAILY_OT_AFTER, 0.0)
+            continue
+        day_reg = min(h, CA_DAILY_OT_AFTER)
+        ot += min(max(h - CA_DAILY_OT_AFTER, 0.0), CA_DAILY_DT_AFTER - CA_DAILY_OT_AFTER)
+        dt += max(h - CA_DAILY_DT_AFTER, 0.0)
+        # Regular hours past the weekly threshold become overtime (never counted twice)
+        over = min(max(reg + day_reg - WEEKLY_OT_AFTER, 0.0), day_reg)
+        reg += day_reg - over
+        ot += over
+    return reg, ot, dt
+
+
+def _parse_daily_hours(daily_hours: str):
+    return [float(p) for p in (p.strip() for p in daily_hours.split(",")) if p]
+
+
+def hours_from_daily(daily_hours: Optional[str], use_ca_daily_ot: bool) -> Dict[str, float]:
+    """
+    Parse comma-separated daily hours and compute breakdown. The first day starts a
+    workweek and every 7 days start the next, so a biweekly period gets two weekly
+    OT thresholds rather than one.
+    If use_ca_daily_ot is True: OT over 8 up to 12 (1.5x), DT over 12 (2.0x) per day,
+    seventh-consecutive-day OT/DT, and weekly OT for regular hours over 40.
     Else: Weekly OT over 40 hours (1.5x), no double time.
     Returns dict with keys: regular_hours, overtime_hours, doubletime_hours.
+    For many employees at once use ``payroll_timesheet``.
     """
     if not daily_hours:
         return {"regular_hours": 0.0, "overtime_hours": 0.0, "doubletime_hours": 0.0}
-    parts = [p.strip() for p in daily_hours.split(",") if p.strip()]
-    hours_list = [float(p) for p in parts]
+    hours_list = _parse_daily_hours(daily_hours)
     reg = ot = dt = 0.0
-    if use_ca_daily_ot:
-        for h in hours_list:
-            if h <= 8:
-                reg += h
-            elif h <= 12:
-                reg += 8
-                ot += (h - 8)
-            else:
-                reg += 8
-                ot += 4
-                dt += (h - 12)
-    else:
-        total = sum(hours_list)
-        if total <= 40:
-            reg = total
-        else:
-            reg = 40.0
-            ot = total - 40.0
+    for start in range(0, len(hours_list), 7):
+        week_reg, week_ot, week_dt = _split_workweek(hours_list[start:start + 7], use_ca_daily_ot)
+        reg += week_reg
+        ot += week_ot
+        dt += week_dt
     return {"regular_hours": reg, "overtime_hours": ot, "doubletime_hours": dt}
 
 
+def _blended_from_daily(
+    daily_hours: str,
+    daily_rates: str,
+    hourly_rate: Optional[float],
+    use_ca_daily_ot: bool,
+    overtime_multiplier: float,
+    doubletime_multiplier: float,
+) -> Dict[str, float]:
+    """
+    Hours and earnings for days worked at different pay rates. ``daily_rates`` holds one
+    rate per day of ``daily_hours`` (blank = ``hourly_rate``). Per workweek, overtime and
+    double time are paid on the blended regular rate (straight-time earnings / hours
+    worked): regular pay is the straight-time earnings less the OT/DT hours at that
+    rate, and OT/DT pay is those hours at the regular rate times the multiplier.
+    """
+    hours_list = _parse_daily_hours(daily_hours)
+    rate_parts = [p.strip() for p in daily_rates.split(",")]
+    if len(rate_parts) != len(hours_list):
+        raise ValueError("--daily-rates needs one rate (or a blank) per --daily-hours entry")
+    if hourly_rate is None and not all(rate_parts):
+        raise ValueError("Blank --daily-rates entries need --hourly-rate")
+    rates = [float(p) if p else hourly_rate for p in rate_parts]
+    out = dict.fromkeys(("regular_hours", "overtime_hours", "doubletime_hours", "regular_pay", "overtime_pay", "doubletime_pay"), 0.0)
+    regular_rates = []
+    for start in range(0, len(hours_list), 7):
+        week = hours_list[start:start + 7]
+        straight = sum(h * r for h, r in zip(week, rates[start:start + 7]))
+        worked = sum(week)
+        reg, ot, dt = _split_workweek(week, use_ca_daily_ot)
+        regular_rate = straight / worked if worked else 0.0
+        regular_rates.append(regular_rate)
+        out["regular_hours"] += reg
+        out["overtime_hours"] += ot
+        out["doubletime_hours"] += dt
+        out["regular_pay"] += straight - regular_rate * (ot + dt)
+        out["overtime_pay"] += regular_rate * ot * overtime_multiplier
+        out["doubletime_pay"] += regular_rate * dt * doubletime_multiplier
+    out["regular_rates"] = tuple(regular_rates)
+    return out
+
+
 def _earnings_breakdown(
     pay_type: str,
     *,
@@ -312,16 +500,30 @@ def _earnings_breakdown(
     doubletime_multiplier: float = 2.0,
     daily_hours: Optional[str] = None,
     use_ca_daily_ot: bool = False,
+    daily_rates: Optional[str] = None,
     salary: Optional[float] = None,
 ) -> Dict[str, float]:
     """
     Compute regular/OT/DT hours and earnings plus gross.
+    With ``daily_rates`` (several pay rates in the period) overtime uses the blended regular rate.
     """
-    if pay_type == "hourly":
+    regular_rates = None
+    if pay_type == "hourly" and daily_rates and not daily_hours:
+        raise ValueError("--daily-rates needs --daily-hours (one rate per day worked)")
+    if pay_type == "hourly" and daily_hours and daily_rates:
+        br = _blended_from_daily(daily_hours, daily_rates, hourly_rate, use_ca_daily_ot,
+                                 overtime_multiplier or 1.0, doubletime_multiplier or 2.0)
+        reg_hours, ot_hours, dt_hours = br["regular_hours"], br["overtime_hours"], br["doubletime_hours"]
+        if reg_hours <= 0 and ot_hours <= 0 and dt_hours <= 0:
+            raise ValueError("Provide hours via --hours/--overtime-hours or --daily-hours for hourly pay")
+        reg_pay, ot_pay, dt_pay = br["regular_pay"], br["overtime_pay"], br["doubletime_pay"]
+        gross = reg_pay + ot_pay + dt_pay
+        regular_rates = br["regular_rates"]
+    elif pay_type == "hourly":
         if hourly_rate is None:
             raise ValueError("Hourly pay requires --hourly-rate")
         if daily_hours:
-            br = _hours_from_daily(daily_hours, use_ca_daily_ot)
+            br = hours_from_daily(daily_hours, use_ca_daily_ot)
             reg_hours = br["regular_hours"]
             ot_hours = br["overtime_hours"]
             dt_hours = br["doubletime_hours"]
@@ -354,6 +556,7 @@ def _earnings_breakdown(
         "overtime_pay": ot_pay,
         "doubletime_pay": dt_pay,
         "gross": gross,
+        "regular_rates": regular_rates,
     }
 
 
@@ -368,6 +571,7 @@ def gross_pay(
     doubletime_multiplier: float = 2.0,
     daily_hours: Optional[str] = None,
     use_ca_daily_ot: bool = False,
+    daily_rates: Optional[str] = None,
     salary: Optional[float] = None,
 ) -> float:
     """
@@ -383,11 +587,46 @@ def gross_pay(
         doubletime_multiplier=doubletime_multiplier,
         daily_hours=daily_hours,
         use_ca_daily_ot=use_ca_daily_ot,
+        daily_rates=daily_rates,
         salary=salary,
     )
     return round(breakdown["gross"], 2)
 
 
+@dataclass
+class PaycheckTrace:
+    """
+    Intermediate values captured during a single ``compute_paycheck`` pass.
+    ``render_explanation`` turns them into the step-by-step breakdown, so explained
+    and audit runs do not need to recompute anything.
+    """
+
+    pay_type: str
+    config: PayrollConfig
+    hourly_rate: Optional[float]
+    overtime_multiplier: float
+    doubletime_multiplier: float
+    pretax_401k: float
+    pretax_hsa: float
+    pretax_section125: float
+    fica_taxable: float
+    fit_taxable: float
+    ss_rate: float
+    ss_wage_base: float
+    ss_ytd_counted: float
+    ss_remaining_room: float
+    ss_taxable: float
+    medicare_rate: float
+    medicare_base: float
+    addl_medicare_rate: float
+    addl_medicare_threshold: float
+    addl_medicare_taxable: float
+    addl_medicare: float
+    fit_details: Optional[Dict] = None
+    regular_rates: Optional[tuple] = None
+    state_split: Optional[tuple] = None  # (work state tax, resident state tax) from the state tables
+
+
 def compute_paycheck(pay_type: str,
                      *,
                      hourly_rate: Optional[float] = None,
@@ -398,8 +637,14 @@ def compute_paycheck(pay_type: str,
                      doubletime_multiplier: float = 2.0,
                      daily_hours: Optional[str] = None,
                      use_ca_daily_ot: bool = False,
+                     daily_rates: Optional[str] = None,
                      salary: Optional[float] = None,
-                     config: PayrollConfig) -> Dict[str, float]:
+                     config: PayrollConfig,
+                     trace: bool = False) -> PaycheckResult:
+    """
+    Compute one paycheck. With ``trace=True`` the result's ``trace`` attribute holds a
+    ``PaycheckTrace`` of the intermediate values (see ``render_explanation``).
+    """
     breakdown = _earnings_breakdown(
         pay_type,
         hourly_rate=hourly_rate,
@@ -410,6 +655,7 @@ def compute_paycheck(pay_type: str,
         doubletime_multiplier=doubletime_multiplier,
         daily_hours=daily_hours,
         use_ca_daily_ot=use_ca_daily_ot,
+        daily_rates=daily_rates,
         salary=salary,
     )
     g = round(breakdown["gross"], 2)
@@ -427,11 +673,14 @@ def compute_paycheck(pay_type: str,
 
     # Employee FICA
     ss = social_security(fica_taxable, year=config.year, ytd_wages=config.ytd_wages)
-    medi = medicare(fica_taxable, ytd_wages=config.ytd_wages)
+    medi = medicare(fica_taxable, ytd_wages=config.ytd_wages, year=config.year)
 
     # Federal withholding
+    fit_details = None
     if config.withholding_method == "irs_percentage":
-        fit = federal_withholding_percentage_method(
+        # The details variant walks the same brackets in the same order, so the tax is identical
+        fit_fn = federal_withholding_percentage_details if trace else federal_withholding_percentage_method
+        fit = fit_fn(
             fit_taxable,
             filing_status=config.filing_status,
             pay_periods_per_year=config.pay_periods_per_year,
@@ -440,12 +689,32 @@ def compute_paycheck(pay_type: str,
             w4_step4a_other_income=config.w4_step4a_other_income,
             w4_step4b_deductions=config.w4_step4b_deductions,
             w4_step4c_extra_withholding=config.w4_step4c_extra_withholding,
+            year=config.year,
         )
+        if trace:
+            fit, fit_details = fit
+    elif config.withholding_method in SUPPLEMENTAL_METHODS:
+        fit, details = supplemental_withholding_details(fit_taxable, config)
+        fit_details = details if trace else None
     else:
         fit = federal_income_tax(fit_taxable, config.federal_rate)
 
-    # State withholding (still flat, applied to FIT taxable wages)
-    sit = state_income_tax(fit_taxable, config.state_rate)
+    # State withholding on FIT taxable wages: a flat state_rate if given, else the
+    # work/resident state tables
+    state_split = None
+    if config.state_rate or not (config.work_state or config.resident_state):
+        sit = state_income_tax(fit_taxable, config.state_rate)
+    else:
+        state_split = state_withholding(
+            fit_taxable,
+            work_state=config.work_state,
+            resident_state=config.resident_state,
+            filing_status=config.filing_status,
+            pay_periods_per_year=config.pay_periods_per_year,
+            allowances=config.state_allowances,
+            year=config.year,
+        )
+        sit = round(state_split[0] + state_split[1], 2)
     base_deductions = ss + medi + fit + sit
 
     # Post-tax deductions (from net-after-tax)
@@ -458,111 +727,114 @@ def compute_paycheck(pay_type: str,
     total_deductions = round(base_deductions + posttax_total, 2)
     net = round(g - total_deductions, 2)
 
-    # Employer costs
-    employer_ss = social_security(fica_taxable, year=config.year, ytd_wages=config.ytd_wages)
-    employer_medi_amt = employer_medicare(fica_taxable, ytd_wages=config.ytd_wages)
+    # Employer costs (employer Social Security matches the employee share)
+    employer_ss = ss
+    employer_medi_amt = employer_medicare(fica_taxable, ytd_wages=config.ytd_wages, year=config.year)
     employer_total = round(employer_ss + employer_medi_amt, 2)
 
     effective_rate = round(total_deductions / g, 4) if g > 0 else 0.0
     total_employer_cost = round(g + employer_total, 2)
 
-    return {
-        "gross": g,
-        "taxable_wages_fica": round(fica_taxable, 2),
-        "taxable_wages_fit": round(fit_taxable, 2),
-        "social_security": ss,
-        "medicare": medi,
-        "federal_income_tax": fit,
-        "state_income_tax": sit,
-        "posttax_deductions": posttax_total,
-        "total_deductions": total_deductions,
-        "net": net,
-        "employer_social_security": round(employer_ss, 2),
-        "employer_medicare": round(employer_medi_amt, 2),
-        "employer_total": employer_total,
-        "regular_hours": round(breakdown["regular_hours"], 2),
-        "overtime_hours": round(breakdown["overtime_hours"], 2),
-        "doubletime_hours": round(breakdown["doubletime_hours"], 2),
-        "regular_pay": round(breakdown["regular_pay"], 2),
-        "overtime_pay": round(breakdown["overtime_pay"], 2),
-        "doubletime_pay": round(breakdown["doubletime_pay"], 2),
-        "effective_employee_tax_rate": effective_rate,
-        "total_employer_cost": total_employer_cost,
-    }
-
-
-def build_explanation_text(
-    pay_type: str,
-    *,
-    hourly_rate: Optional[float] = None,
-    hours: Optional[float] = None,
-    overtime_hours: float = 0.0,
-    overtime_multiplier: float = 1.5,
-    doubletime_hours: float = 0.0,
-    doubletime_multiplier: float = 2.0,
-    daily_hours: Optional[str] = None,
-    use_ca_daily_ot: bool = False,
-    salary: Optional[float] = None,
-    config: PayrollConfig,
-) -> str:
-    # Recompute components needed for explanation
-    breakdown = _earnings_breakdown(
-        pay_type,
+    result = PaycheckResult(
+        gross=g,
+        taxable_wages_fica=round(fica_taxable, 2),
+        taxable_wages_fit=round(fit_taxable, 2),
+        social_security=ss,
+        medicare=medi,
+        federal_income_tax=fit,
+        state_income_tax=sit,
+        posttax_deductions=posttax_total,
+        total_deductions=total_deductions,
+        net=net,
+        employer_social_security=round(employer_ss, 2),
+        employer_medicare=round(employer_medi_amt, 2),
+        employer_total=employer_total,
+        regular_hours=round(breakdown["regular_hours"], 2),
+        overtime_hours=round(breakdown["overtime_hours"], 2),
+        doubletime_hours=round(breakdown["doubletime_hours"], 2),
+        regular_pay=round(breakdown["regular_pay"], 2),
+        overtime_pay=round(breakdown["overtime_pay"], 2),
+        doubletime_pay=round(breakdown["doubletime_pay"], 2),
+        effective_employee_tax_rate=effective_rate,
+        total_employer_cost=total_employer_cost,
+    )
+    if trace:
+        result.trace = _build_trace(pay_type, config, hourly_rate, overtime_multiplier, doubletime_multiplier,
+                                    pretax_401k_amt, pretax_hsa_amt, pretax_125_amt, fica_taxable, fit_taxable, fit_details,
+                                    regular_rates=breakdown["regular_rates"], state_split=state_split)
+    return result
+
+
+def _build_trace(pay_type, config, hourly_rate, overtime_multiplier, doubletime_multiplier,
+                 pretax_401k_amt, pretax_hsa_amt, pretax_125_amt, fica_taxable, fit_taxable, fit_details,
+                 regular_rates=None, state_split=None) -> PaycheckTrace:
+    params = tax_year(config.year)
+    already = min(config.ytd_wages, params.ss_wage_base)
+    remaining = max(params.ss_wage_base - already, 0)
+    addl_taxable = 0.0
+    if config.ytd_wages + fica_taxable > params.addl_medicare_threshold:
+        crossed_from = max(params.addl_medicare_threshold - config.ytd_wages, 0)
+        addl_taxable = max(fica_taxable - crossed_from, 0)
+    return PaycheckTrace(
+        pay_type=pay_type,
+        config=config,
         hourly_rate=hourly_rate,
-        hours=hours,
-        overtime_hours=overtime_hours,
-        overtime_multiplier=overtime_multiplier,
-        doubletime_hours=doubletime_hours,
-        doubletime_multiplier=doubletime_multiplier,
-        daily_hours=daily_hours,
-        use_ca_daily_ot=use_ca_daily_ot,
-        salary=salary,
+        overtime_multiplier=overtime_multiplier or 1.0,
+        doubletime_multiplier=doubletime_multiplier or 2.0,
+        pretax_401k=pretax_401k_amt,
+        pretax_hsa=pretax_hsa_amt,
+        pretax_section125=pretax_125_amt,
+        fica_taxable=fica_taxable,
+        fit_taxable=fit_taxable,
+        ss_rate=params.ss_rate,
+        ss_wage_base=params.ss_wage_base,
+        ss_ytd_counted=already,
+        ss_remaining_room=remaining,
+        ss_taxable=_clamp(fica_taxable, 0, remaining),
+        medicare_rate=params.medicare_rate,
+        medicare_base=round(fica_taxable * params.medicare_rate, 2),
+        addl_medicare_rate=params.addl_medicare_rate,
+        addl_medicare_threshold=params.addl_medicare_threshold,
+        addl_medicare_taxable=addl_taxable,
+        addl_medicare=round(addl_taxable * params.addl_medicare_rate, 2),
+        fit_details=fit_details,
+        regular_rates=regular_rates,
+        state_split=state_split,
     )
-    reg_hours = breakdown["regular_hours"]
-    ot_hours = breakdown["overtime_hours"]
-    dt_hours = breakdown["doubletime_hours"]
-    gross = breakdown["gross"]
 
-    pretax_401k_amt = max(config.pretax_401k, 0.0) + max(config.pretax_401k_percent, 0.0) * gross
-    pretax_hsa_amt = max(config.pretax_hsa, 0.0) + max(config.pretax_hsa_percent, 0.0) * gross
-    pretax_125_amt = max(config.pretax_section125, 0.0) + max(config.pretax_section125_percent, 0.0) * gross
 
-    pretax_fit_only = pretax_401k_amt
-    pretax_fit_fica = pretax_hsa_amt + pretax_125_amt
-    fica_taxable = max(gross - pretax_fit_fica, 0.0)
-    fit_taxable = max(gross - pretax_fit_only - pretax_fit_fica, 0.0)
-
-    # Social Security details
-    base = SSA_WAGE_BASE_BY_YEAR.get(config.year, max(SSA_WAGE_BASE_BY_YEAR.values()))
-    already = min(config.ytd_wages, base)
-    remaining = max(base - already, 0)
-    ss_taxable_this = _clamp(fica_taxable, 0, remaining)
-    ss_tax = round(ss_taxable_this * 0.062, 2)
-
-    # Medicare details
-    addl_threshold = 200000.0
-    pre = config.ytd_wages
-    post = config.ytd_wages + fica_taxable
-    base_medi = round(fica_taxable * 0.0145, 2)
-    addl_medi_taxable = 0.0
-    if post > addl_threshold:
-        crossed_from = max(addl_threshold - pre, 0)
-        addl_medi_taxable = max(fica_taxable - crossed_from, 0)
-    addl_medi = round(addl_medi_taxable * 0.009, 2)
+def render_explanation(result: PaycheckResult) -> str:
+    """Step-by-step breakdown of a paycheck computed with ``compute_paycheck(..., trace=True)``."""
+    t = result.trace
+    if t is None:
+        raise ValueError("render_explanation needs a result computed with trace=True")
+    config = t.config
+    gross = result.gross
 
     lines = []
     lines.append("Earnings:")
-    if pay_type == "hourly":
-        if reg_hours:
-            lines.append(f"- Regular: {reg_hours:.2f}h x ${hourly_rate:.2f} = ${hourly_rate*reg_hours:.2f}")
-        if ot_hours:
-            lines.append(f"- Overtime: {ot_hours:.2f}h x ${hourly_rate:.2f} x {overtime_multiplier:.2f} = ${hourly_rate*ot_hours*overtime_multiplier:.2f}")
-        if dt_hours:
-            lines.append(f"- Double-time: {dt_hours:.2f}h x ${hourly_rate:.2f} x {doubletime_multiplier:.2f} = ${hourly_rate*dt_hours*doubletime_multiplier:.2f}")
+    if t.pay_type == "hourly" and t.regular_rates:
+        rates = ", ".join(f"${r:.4f}" for r in t.regular_rates)
+        lines.append(f"- Blended regular rate per workweek (straight-time earnings / hours worked): {rates}")
+        if result.regular_hours:
+            lines.append(f"- Regular: {result.regular_hours:.2f}h (straight time at each day's rate, less OT/DT hours at the regular rate) = ${result.regular_pay:.2f}")
+        if result.overtime_hours:
+            lines.append(f"- Overtime: {result.overtime_hours:.2f}h x regular rate x {t.overtime_multiplier:.2f} = ${result.overtime_pay:.2f}")
+        if result.doubletime_hours:
+            lines.append(f"- Double-time: {result.doubletime_hours:.2f}h x regular rate x {t.doubletime_multiplier:.2f} = ${result.doubletime_pay:.2f}")
+    elif t.pay_type == "hourly":
+        if result.regular_hours:
+            lines.append(f"- Regular: {result.regular_hours:.2f}h x ${t.hourly_rate:.2f} = ${result.regular_pay:.2f}")
+        if result.overtime_hours:
+            lines.append(f"- Overtime: {result.overtime_hours:.2f}h x ${t.hourly_rate:.2f} x {t.overtime_multiplier:.2f} = ${result.overtime_pay:.2f}")
+        if result.doubletime_hours:
+            lines.append(f"- Double-time: {result.doubletime_hours:.2f}h x ${t.hourly_rate:.2f} x {t.doubletime_multiplier:.2f} = ${result.doubletime_pay:.2f}")
     else:
         lines.append(f"- Salary per period = ${gross:.2f}")
     lines.append(f"Gross = ${gross:.2f}")
 
+    pretax_fit_only = t.pretax_401k
+    pretax_fit_fica = t.pretax_hsa + t.pretax_section125
     if pretax_fit_only or pretax_fit_fica:
         lines.append("Pre-tax deductions:")
         if pretax_fit_only:
@@ -571,39 +843,43 @@ def build_explanation_text(
                 lines.append(f"- 401(k) (FIT only): ${pretax_fit_only:.2f} ({pct:.2f}% of gross)")
             else:
                 lines.append(f"- 401(k) (FIT only): ${pretax_fit_only:.2f}")
-        if pretax_hsa_amt or pretax_125_amt:
+        if t.pretax_hsa or t.pretax_section125:
             text_parts = []
-            if pretax_hsa_amt:
+            if t.pretax_hsa:
                 pct = (config.pretax_hsa_percent or 0.0) * 100.0
-                text_parts.append(f"HSA ${pretax_hsa_amt:.2f}" + (f" ({pct:.2f}%)" if pct else ""))
-            if pretax_125_amt:
+                text_parts.append(f"HSA ${t.pretax_hsa:.2f}" + (f" ({pct:.2f}%)" if pct else ""))
+            if t.pretax_section125:
                 pct = (config.pretax_section125_percent or 0.0) * 100.0
-                text_parts.append(f"Section125 ${pretax_125_amt:.2f}" + (f" ({pct:.2f}%)" if pct else ""))
+                text_parts.append(f"Section125 ${t.pretax_section125:.2f}" + (f" ({pct:.2f}%)" if pct else ""))
             lines.append(f"- {' + '.join(text_parts)} (FIT+FICA)")
-        lines.append(f"FICA taxable wages = Gross - FIT+FICA pretax = ${fica_taxable:.2f}")
-        lines.append(f"FIT taxable wages = Gross - all applicable pretax = ${fit_taxable:.2f}")
-
-    lines.append("Social Security (6.2% up to wage base):")
-    lines.append(f"- Year {config.year} wage base: ${base:,.0f}; YTD counted: ${already:,.2f}; remaining room: ${remaining:,.2f}")
-    lines.append(f"- This period SS-taxable: ${ss_taxable_this:.2f} -> Tax: ${ss_tax:.2f}")
-
-    lines.append("Medicare (1.45% on all; +0.9% over $200k YTD):")
-    lines.append(f"- Base Medicare on ${fica_taxable:.2f} = ${base_medi:.2f}")
-    if addl_medi_taxable > 0:
-        lines.append(f"- Additional Medicare on ${addl_medi_taxable:.2f} = ${addl_medi:.2f}")
-    lines.append(f"- Total Medicare = ${base_medi + addl_medi:.2f}")
-
-    if config.withholding_method == "irs_percentage":
-        tax, det = federal_withholding_percentage_details(
-            fit_taxable,
-            filing_status=config.filing_status,
-            pay_periods_per_year=config.pay_periods_per_year,
-            w4_step2=config.w4_step2,
-            w4_step3_dependents_credit=config.w4_step3_dependents_credit,
-            w4_step4a_other_income=config.w4_step4a_other_income,
-            w4_step4b_deductions=config.w4_step4b_deductions,
-            w4_step4c_extra_withholding=config.w4_step4c_extra_withholding,
-        )
+        lines.append(f"FICA taxable wages = Gross - FIT+FICA pretax = ${t.fica_taxable:.2f}")
+        lines.append(f"FIT taxable wages = Gross - all applicable pretax = ${t.fit_taxable:.2f}")
+
+    lines.append(f"Social Security ({t.ss_rate*100:.1f}% up to wage base):")
+    lines.append(f"- Year {config.year} wage base: ${t.ss_wage_base:,.0f}; YTD counted: ${t.ss_ytd_counted:,.2f}; remaining room: ${t.ss_remaining_room:,.2f}")
+    lines.append(f"- This period SS-taxable: ${t.ss_taxable:.2f} -> Tax: ${result.social_security:.2f}")
+
+    lines.append(f"Medicare ({t.medicare_rate*100:.2f}% on all; +{t.addl_medicare_rate*100:.1f}% over ${t.addl_medicare_threshold/1000:,.0f}k YTD):")
+    lines.append(f"- Base Medicare on ${t.fica_taxable:.2f} = ${t.medicare_base:.2f}")
+    if t.addl_medicare_taxable > 0:
+        lines.append(f"- Additional Medicare on ${t.addl_medicare_taxable:.2f} = ${t.addl_medicare:.2f}")
+    lines.append(f"- Total Medicare = ${t.medicare_base + t.addl_medicare:.2f}")
+
+    if t.fit_details is not None and config.withholding_method in SUPPLEMENTAL_METHODS:
+        det = t.fit_details
+        lines.append(f"Federal Income Tax (supplemental wages, {det['method']} method):")
+        lines.append(f"- YTD supplemental wages before this check: ${det['ytd_supplemental_wages']:,.2f}; "
+                     f"over ${det['mandatory_threshold']:,.0f} withheld at {det['mandatory_rate']*100:.0f}%")
+        if det["method"] == "aggregate":
+            lines.append(f"- Percentage method on regular ${det['regular_wages']:.2f} + supplemental ${det['below_threshold']:.2f} "
+                         f"= ${det['tax_on_total']:.2f}, less ${det['tax_on_regular']:.2f} on regular alone = ${det['tax_below_threshold']:.2f}")
+        else:
+            lines.append(f"- ${det['below_threshold']:.2f} at {det['supplemental_rate']*100:.0f}% = ${det['tax_below_threshold']:.2f}")
+        if det["above_threshold"]:
+            lines.append(f"- ${det['above_threshold']:.2f} at {det['mandatory_rate']*100:.0f}% = ${det['tax_above_threshold']:.2f}")
+        lines.append(f"- Federal withholding this check: ${result.federal_income_tax:.2f}")
+    elif t.fit_details is not None:
+        det = t.fit_details
         lines.append("Federal Income Tax (IRS percentage method, per period):")
         lines.append(f"- Annualized wages: ${det['annualized_wages']:.2f} x Step2 = ${det['annual_wages_after_step2']:.2f}")
         lines.append(f"- +Other income ${det['other_income']:.2f} - Deductions ${det['deductions']:.2f} = Pre-standard ${det['pre_standard_taxable']:.2f}")
@@ -611,24 +887,63 @@ def build_explanation_text(
         if det['bracket_steps']:
             lines.append("- Brackets:")
             for s in det['bracket_steps']:
-                up = f"{s['upper']:,}" if s['upper'] is not None else "inf"
-                lines.append(f"  {s['lower']:,}-{up} @ {s['rate']*100:.1f}% on ${s['amount']:.2f} = ${s['tax']:.2f}")
+                up = f"{s['upper']:,.0f}" if s['upper'] is not None else "inf"
+                lines.append(f"  {s['lower']:,.0f}-{up} @ {s['rate']*100:.1f}% on ${s['amount']:.2f} = ${s['tax']:.2f}")
         lines.append(f"- Annual tax before credits: ${det['annual_tax_before_credit']:.2f}")
         lines.append(f"- Dependents credit: -${det['dependents_credit']:.2f}")
         lines.append(f"- Per-period tax before extra: ${det['per_period_tax_before_extra']:.2f}")
         lines.append(f"- Extra withholding: +${det['extra_withholding']:.2f}")
-        lines.append(f"- Federal withholding this period: ${tax:.2f}")
+        lines.append(f"- Federal withholding this period: ${result.federal_income_tax:.2f}")
     else:
         if config.federal_rate:
-            lines.append(f"Federal Income Tax (flat {config.federal_rate*100:.2f}% on FIT taxable ${fit_taxable:.2f})")
-            lines.append(f"- Federal withholding: ${round(fit_taxable * config.federal_rate, 2):.2f}")
+            lines.append(f"Federal Income Tax (flat {config.federal_rate*100:.2f}% on FIT taxable ${t.fit_taxable:.2f})")
+            lines.append(f"- Federal withholding: ${result.federal_income_tax:.2f}")
         else:
             lines.append("Federal Income Tax: (not withheld)")
 
     if config.state_rate:
-        lines.append(f"State Income Tax (flat {config.state_rate*100:.2f}% on FIT taxable ${fit_taxable:.2f})")
-        lines.append(f"- State withholding: ${round(fit_taxable * config.state_rate, 2):.2f}")
+        lines.append(f"State Income Tax (flat {config.state_rate*100:.2f}% on FIT taxable ${t.fit_taxable:.2f})")
+        lines.append(f"- State withholding: ${result.state_income_tax:.2f}")
+    elif t.state_split is not None:
+        work = (config.work_state or config.resident_state).upper()
+        resident = (config.resident_state or work).upper()
+        work_tax, resident_tax = t.state_split
+        lines.append(f"State Income Tax ({config.year} state tables on FIT taxable ${t.fit_taxable:.2f}, {config.state_allowances} allowance(s)):")
+        if resident == work:
+            lines.append(f"- {work}: ${work_tax:.2f}")
+        elif resident in state_tables(config.year).state(work).reciprocity:
+            lines.append(f"- {work}: $0.00 (reciprocity with {resident}); {resident} (resident): ${resident_tax:.2f}")
+        else:
+            lines.append(f"- {work} (work state): ${work_tax:.2f}")
+            lines.append(f"- {resident} (resident state, less credit for {work} tax): ${resident_tax:.2f}")
+        lines.append(f"- State withholding: ${result.state_income_tax:.2f}")
+
+    lines.append("")
+    lines.append(f"Post-tax deductions = ${result.posttax_deductions:.2f}")
+    lines.append(f"Total deductions = ${result.total_deductions:.2f}")
+    lines.append(f"Net pay = Gross - deductions = ${result.net:.2f}")
+    lines.append(f"Effective employee deduction rate = {result.effective_employee_tax_rate*100:.2f}%")
+    lines.append(f"Employer payroll taxes this period = ${result.employer_total:.2f}")
+    lines.append(f"Total employer cost (wages + taxes) = ${result.total_employer_cost:.2f}")
+    return "\n".join(lines)
+
 
+def build_explanation_text(
+    pay_type: str,
+    *,
+    hourly_rate: Optional[float] = None,
+    hours: Optional[float] = None,
+    overtime_hours: float = 0.0,
+    overtime_multiplier: float = 1.5,
+    doubletime_hours: float = 0.0,
+    doubletime_multiplier: float = 2.0,
+    daily_hours: Optional[str] = None,
+    use_ca_daily_ot: bool = False,
+    daily_rates: Optional[str] = None,
+    salary: Optional[float] = None,
+    config: PayrollConfig,
+) -> str:
+    """Compute a paycheck once (traced) and return its step-by-step explanation."""
     result = compute_paycheck(
         pay_type,
         hourly_rate=hourly_rate,
@@ -639,20 +954,16 @@ def build_explanation_text(
         doubletime_multiplier=doubletime_multiplier,
         daily_hours=daily_hours,
         use_ca_daily_ot=use_ca_daily_ot,
+        daily_rates=daily_rates,
         salary=salary,
         config=config,
+        trace=True,
     )
-    lines.append("")
-    lines.append(f"Post-tax deductions = ${result['posttax_deductions']:.2f}")
-    lines.append(f"Total deductions = ${result['total_deductions']:.2f}")
-    lines.append(f"Net pay = Gross - deductions = ${result['net']:.2f}")
-    lines.append(f"Effective employee deduction rate = {result['effective_employee_tax_rate']*100:.2f}%")
-    lines.append(f"Employer payroll taxes this period = ${result['employer_total']:.2f}")
-    lines.append(f"Total employer cost (wages + taxes) = ${result['total_employer_cost']:.2f}")
-    return "\n".join(lines)
+    return render_explanation(result)
 
 
-def _parse_rate(val: Optional[str]) -> Optional[float]:
+def parse_rate(val: Optional[str]) -> Optional[float]:
+    """Parse a rate given as a fraction or a percent ("0.12", "12" and "12%" all mean 12%); blank is None."""
     if val is None:
         return None
     s = val.strip().replace("%", "")
@@ -663,9 +974,11 @@ def _parse_rate(val: Optional[str]) -> Optional[float]:
     return num / 100.0 if num > 1 else num
 
 
-def main():
+def _build_parser():
+    import argparse
+
     p = argparse.ArgumentParser(description="Payroll calculator for Social Security, Medicare, and optional Fed/State withholding.")
-    p.add_argument("--pay-type", choices=["hourly", "salary"], required=True, help="Pay type for this paycheck")
+    p.add_argument("--pay-type", choices=["hourly", "salary"], help="Pay type for this paycheck (required unless --batch-input)")
     p.add_argument("--hourly-rate", type=float, help="Hourly rate (for hourly pay)")
     p.add_argument("--hours", type=float, help="Regular hours in this pay period (for hourly pay)")
     p.add_argument("--overtime-hours", type=float, default=0.0, help="Overtime hours this period (default 0). Typical FLSA weekly OT is hours over 40.")
@@ -678,14 +991,19 @@ def main():
     p.add_argument("--doubletime-hours", type=float, default=0.0, help="Double-time hours this period (default 0)")
     p.add_argument("--doubletime-multiplier", type=float, default=2.0, help="Double-time multiplier (default 2.0x)")
     p.add_argument("--daily-hours", type=str, help="Comma-separated daily hours (e.g., 8,9,10,6,7) to auto-calc OT")
+    p.add_argument("--daily-rates", type=str, help="Comma-separated pay rate per --daily-hours day (blank = --hourly-rate); OT uses the blended regular rate")
     p.add_argument("--use-ca-daily-ot", action="store_true", help="Apply CA daily OT rules to --daily-hours (OT >8, DT >12)")
     p.add_argument("--salary", type=float, help="Salary amount per pay period (for salary pay)")
 
-    p.add_argument("--year", type=int, default=2025, help="Tax year (for SSA wage base)")
+    p.add_argument("--year", type=int, default=2025, help="Tax year (selects tax_tables/<year>.json rates, wage base and brackets)")
     p.add_argument("--ytd-wages", type=float, default=0.0, help="Year-to-date taxable wages before this paycheck")
-    p.add_argument("--withholding-method", choices=["flat", "irs_percentage"], default="flat", help="Federal withholding method: flat rate or IRS percentage method")
+    p.add_argument("--withholding-method", choices=["flat", "irs_percentage", "supplemental", "aggregate"], default="flat",
+                   help="Federal withholding method: flat rate, IRS percentage method, or for bonus/commission checks the flat supplemental rate or the aggregate method")
     p.add_argument("--federal-rate", type=str, default=None, help="Flat federal rate (e.g., 12 or 0.12 or 12%) if --withholding-method flat")
-    p.add_argument("--state-rate", type=str, default=None, help="Optional state withholding rate (e.g., 5 or 0.05 or 5%)")
+    p.add_argument("--state-rate", type=str, default=None, help="Optional state withholding rate (e.g., 5 or 0.05 or 5%%); overrides the state tables")
+    p.add_argument("--work-state", type=str, default="", help="Work state code (e.g. CA) for state withholding from tax_tables/states")
+    p.add_argument("--resident-state", type=str, default="", help="Resident state code if different from --work-state")
+    p.add_argument("--state-allowances", type=int, default=0, help="State withholding allowances claimed (default 0)")
 
     # W-4 inputs (percentage method)
     p.add_argument("--filing-status", choices=["single", "married", "head"], default="single")
@@ -696,6 +1014,10 @@ def main():
     p.add_argument("--w4-step4b", type=float, default=0.0, help="W-4 Step 4(b) deductions (annual, beyond standard)")
     p.add_argument("--w4-step4c", type=float, default=0.0, help="W-4 Step 4(c) extra withholding per period")
 
+    # Supplemental wages (bonus / commission checks)
+    p.add_argument("--ytd-supplemental-wages", type=float, default=0.0, help="Supplemental wages already paid this year (mandatory 37%% rate over $1M)")
+    p.add_argument("--regular-wages", type=float, default=0.0, help="FIT-taxable regular wages of the same period (--withholding-method aggregate)")
+
     # Pre-tax deductions (per period)
     p.add_argument("--pretax-401k", type=float, default=0.0, help="Traditional 401(k) deferral amount per period (reduces FIT only)")
     p.add_argument("--pretax-hsa", type=float, default=0.0, help="HSA contribution per period (reduces FIT and FICA if via cafeteria plan)")
@@ -713,14 +1035,63 @@ def main():
     p.add_argument("--explain", action="store_true", help="Print a detailed step-by-step explanation")
     p.add_argument("--output-csv", type=str, default=None, help="Write a one-line CSV of results to this path")
 
+    # Batch pay runs
+    p.add_argument("--batch-input", type=str, default=None, help="Stream employee records from this CSV/JSONL file ('-' for stdin); other options act as defaults")
+    p.add_argument("--batch-output", type=str, default=None, help="Write batch results to this CSV/JSONL file (default stdout)")
+    p.add_argument("--batch-format", choices=["csv", "jsonl"], default=None, help="Input format for --batch-input (default: from file extension)")
+    p.add_argument("--workers", type=int, default=1, help="Worker processes for --batch-input (default 1; 0 = all cores)")
+    p.add_argument("--chunk-size", type=int, default=1000, help="Records per worker chunk for --batch-input (default 1000)")
+    p.add_argument("--engine", choices=["scalar", "batch", "cents"], default="scalar", help="--batch-input engine: per-record (default), columnar NumPy (no daily hours) or columnar in exact integer cents")
+
+    # Pay history store
+    p.add_argument("--history-db", type=str, default=None, help="SQLite pay history: YTD wages come from here instead of --ytd-wages (needs --employee-id)")
+    p.add_argument("--employee-id", type=str, default=None, help="Employee whose history --history-db reads (and --save-history writes)")
+    p.add_argument("--period-end", type=str, default=None, help="Pay period end date YYYY-MM-DD for --history-db (default today); YTD counts earlier periods")
+    p.add_argument("--save-history", action="store_true", help="Append this paycheck to --history-db")
+
+    p.add_argument("--profile-startup", action="store_true", help="Print import, setup and compute timings to stderr")
+    return p
+
+
+def _print_timings(timings, out=None) -> None:
+    out = out or sys.stderr
+    total = sum(seconds for _, seconds in timings)
+    for label, seconds in timings:
+        print(f"{label:<34}{seconds * 1000.0:8.2f} ms", file=out)
+    print(f"{'total (after interpreter start)':<34}{total * 1000.0:8.2f} ms", file=out)
+    print("Per-module import detail: python -X importtime tools/payroll_calculator.py ...", file=out)
+
+
+def main():
+    timings = [("import calculator modules", _MODULE_READY - _MODULE_START)]
+    last = time.perf_counter()
+
+    def lap(label: str) -> None:
+        nonlocal last
+        now = time.perf_counter()
+        timings.append((label, now - last))
+        last = now
+
+    p = _build_parser()
+    lap("build argument parser")
     args = p.parse_args()
+    lap("parse arguments")
+    if not args.batch_input and not args.pay_type:
+        p.error("--pay-type is required unless --batch-input is given")
+    if args.history_db and (args.batch_input or not args.employee_id):
+        p.error("--history-db needs --employee-id and works on a single paycheck")
+    if args.save_history and not args.history_db:
+        p.error("--save-history needs --history-db")
 
     config = PayrollConfig(
         year=args.year,
         ytd_wages=args.ytd_wages,
         withholding_method=args.withholding_method,
-        federal_rate=_parse_rate(args.federal_rate),
-        state_rate=_parse_rate(args.state_rate),
+        federal_rate=parse_rate(args.federal_rate),
+        state_rate=parse_rate(args.state_rate),
+        work_state=args.work_state.strip().upper(),
+        resident_state=args.resident_state.strip().upper(),
+        state_allowances=args.state_allowances,
         filing_status=args.filing_status,
         pay_periods_per_year=args.pay_periods,
         w4_step2=args.w4_step2,
@@ -728,15 +1099,53 @@ def main():
         w4_step4a_other_income=args.w4_step4a,
         w4_step4b_deductions=args.w4_step4b,
         w4_step4c_extra_withholding=args.w4_step4c,
+        ytd_supplemental_wages=args.ytd_supplemental_wages,
+        regular_wages=args.regular_wages,
         pretax_401k=args.pretax_401k,
         pretax_hsa=args.pretax_hsa,
         pretax_section125=args.pretax_section125,
-        pretax_401k_percent=_parse_rate(args.pretax_401k_pct),
-        pretax_hsa_percent=_parse_rate(args.pretax_hsa_pct),
-        pretax_section125_percent=_parse_rate(args.pretax_section125_pct),
+        pretax_401k_percent=parse_rate(args.pretax_401k_pct) or 0.0,
+        pretax_hsa_percent=parse_rate(args.pretax_hsa_pct) or 0.0,
+        pretax_section125_percent=parse_rate(args.pretax_section125_pct) or 0.0,
         posttax_flat=max(args.posttax_flat, 0.0),
-        posttax_percent_net=_parse_rate(args.posttax_percent_net),
+        posttax_percent_net=parse_rate(args.posttax_percent_net) or 0.0,
     )
+    tax_year(config.year)
+    lap("load tax tables")
+
+    store = None
+    if args.history_db:
+        from datetime import date
+
+        from payroll_history import PayHistoryStore
+
+        try:
+            period_end = date.fromisoformat(args.period_end) if args.period_end else date.today()
+        except ValueError:
+            p.error(f"--period-end must be YYYY-MM-DD, got {args.period_end!r}")
+        store = PayHistoryStore(args.history_db)
+        config = replace(config, ytd_wages=store.ytd_fica_wages(args.employee_id, config.year, before=period_end))
+        print(f"YTD wages from history ({args.employee_id}, {config.year}): ${config.ytd_wages:,.2f}", file=sys.stderr)
+        lap("read pay history")
+
+    if args.batch_input:
+        from payroll_pipeline import run_batch_file
+        run_batch_file(
+            args.batch_input,
+            args.batch_output,
+            defaults=config,
+            default_pay_type=args.pay_type,
+            input_format=args.batch_format,
+            output_format="jsonl" if args.json else None,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            report=sys.stderr,
+            engine=args.engine,
+        )
+        if args.profile_startup:
+            lap("batch run")
+            _print_timings(timings)
+        return
 
     result = compute_paycheck(
         args.pay_type,
@@ -748,45 +1157,36 @@ def main():
         doubletime_multiplier=args.doubletime_multiplier,
         daily_hours=args.daily_hours,
         use_ca_daily_ot=args.use_ca_daily_ot,
+        daily_rates=args.daily_rates,
         salary=args.salary,
         config=config,
+        trace=args.explain,
     )
+    lap("compute paycheck")
+
+    if store is not None:
+        if args.save_history:
+            earnings = {
+                "hourly_rate": args.hourly_rate, "hours": args.hours, "overtime_hours": args.overtime_hours,
+                "overtime_multiplier": args.overtime_multiplier, "doubletime_hours": args.doubletime_hours,
+                "doubletime_multiplier": args.doubletime_multiplier, "daily_hours": args.daily_hours,
+                "daily_rates": args.daily_rates, "use_ca_daily_ot": args.use_ca_daily_ot, "salary": args.salary,
+            }
+            record = {"pay_type": args.pay_type, **{k: v for k, v in earnings.items() if v is not None}, **asdict(config)}
+            store.append(args.employee_id, period_end, record, result)
+        store.close()
 
     # Output handling
     if args.output_csv:
         import csv
         with open(args.output_csv, "w", newline="") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=[
-                    "gross",
-                    "taxable_wages_fica",
-                    "taxable_wages_fit",
-                    "social_security",
-                    "medicare",
-                    "federal_income_tax",
-                    "state_income_tax",
-                    "posttax_deductions",
-                    "total_deductions",
-                    "net",
-                    "employer_social_security",
-                    "employer_medicare",
-                    "employer_total",
-                    "regular_hours",
-                    "overtime_hours",
-                    "doubletime_hours",
-                    "regular_pay",
-                    "overtime_pay",
-                    "doubletime_pay",
-                    "effective_employee_tax_rate",
-                    "total_employer_cost",
-                ],
-            )
-            writer.writeheader()
-            writer.writerow(result)
+            writer = csv.writer(f)
+            writer.writerow(RESULT_FIELDS)
+            writer.writerow(result.values_tuple())
 
     if args.json:
-        print(json.dumps(result, indent=2))
+        import json
+        print(json.dumps(result.to_dict(), indent=2))
     else:
         # Pretty print
         print("Gross:", f"${result['gross']:.2f}")
@@ -798,7 +1198,9 @@ def main():
             print("- Federal Income Tax:", f"${result['federal_income_tax']:.2f}")
         elif config.withholding_method == "irs_percentage":
             print("- Federal Income Tax (IRS % method):", f"${result['federal_income_tax']:.2f}")
-        if config.state_rate:
+        elif config.withholding_method in SUPPLEMENTAL_METHODS:
+            print(f"- Federal Income Tax ({config.withholding_method} supplemental method):", f"${result['federal_income_tax']:.2f}")
+        if config.state_rate or config.work_state or config.resident_state:
             print("- State Income Tax:", f"${result['state_income_tax']:.2f}")
         print("Total Deductions (incl. post-tax):", f"${result['total_deductions']:.2f}")
         print("Post-tax Deductions:", f"${result['posttax_deductions']:.2f}")
@@ -812,20 +1214,13 @@ def main():
         print("Total Employer Cost (wages + ER taxes):", f"${result['total_employer_cost']:.2f}")
         if args.explain:
             print()
-            print(build_explanation_text(
-                args.pay_type,
-                hourly_rate=args.hourly_rate,
-                hours=args.hours,
-                overtime_hours=args.overtime_hours,
-                overtime_multiplier=args.overtime_multiplier,
-                doubletime_hours=args.doubletime_hours if 'doubletime_hours' in args else 0.0,
-                doubletime_multiplier=args.doubletime_multiplier if 'doubletime_multiplier' in args else 2.0,
-                daily_hours=args.daily_hours if 'daily_hours' in args else None,
-                use_ca_daily_ot=args.use_ca_daily_ot if 'use_ca_daily_ot' in args else False,
-                salary=args.salary,
-                config=config,
-            ))
+            print(render_explanation(result))
+    if args.profile_startup:
+        lap("write output")
+        _print_timings(timings)
+
 
+_MODULE_READY = time.perf_counter()
 
 if __name__ == "__main__":
     main()
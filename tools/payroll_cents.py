@@ -0,0 +1,348 @@
+"""Exact money mode: the columnar payroll engine in integer cents.
+
+``compute_payroll_cents`` takes the same columns as ``payroll_batch.compute_payroll_batch``
+but carries every amount as ``int64`` cents, so totals never drift: gross is the
+sum of its earnings lines, total deductions the sum of the taxes and post-tax
+deductions, net is gross minus total deductions, and any column sum over a pay
+run is exact.
+
+Rounding happens only at these stages, always half away from zero:
+
+1. Inputs. Money (salaries, deductions, YTD wages, W-4 amounts) becomes whole cents,
+   hourly rates hundredths of a cent, hours thousandths of an hour, overtime
+   multipliers thousandths, and tax rates and percentages millionths. Inputs are
+   read at their shortest decimal form, so ``1234.565`` is a half-cent.
+2. Earnings: regular, overtime and double-time pay are each rounded to the cent.
+3. Percent-of-gross pre-tax deductions and percent-of-net post-tax deductions are
+   rounded to the cent.
+4. Each tax (Social Security, Medicare, federal and state withholding) is computed
+   exactly in millionths of a cent and rounded once to the cent. Percentage-method
+   withholding rounds once per period after dividing the annual tax.
+
+The float engines round half to even on binary values, so results can differ
+from them by a cent on a line that sits on a half-cent.
+
+    result = compute_payroll_cents(columns, config=defaults)  # money fields in cents
+    dollars = cents_to_dollars(result)                         # same shape as compute_payroll_batch
+"""
+
+from __future__ import annotations
+
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from payroll_batch import BatchInputs, Columns, round_half_even, state_allocation
+from payroll_calculator import RESULT_FIELDS, PayrollConfig
+from payroll_results import PaycheckResult
+from state_tax import state_tables
+from tax_params import BracketTable, tax_year
+
+
+# Fixed-point digits of each kind of input
+CENT_DIGITS = 2
+HOURLY_RATE_DIGITS = 4
+HOURS_DIGITS = 3
+MULTIPLIER_DIGITS = 3
+RATE_DIGITS = 6
+RATE_SCALE = 10 ** RATE_DIGITS
+
+# Result fields that are not money (kept as floats)
+NON_MONEY_FIELDS = ("regular_hours", "overtime_hours", "doubletime_hours", "effective_employee_tax_rate")
+MONEY_FIELDS = tuple(name for name in RESULT_FIELDS if name not in NON_MONEY_FIELDS)
+
+
+def to_units(values, digits: int = CENT_DIGITS) -> np.ndarray:
+    """
+    ``values`` as ``int64`` multiples of ``10**-digits`` (cents by default), half away
+    from zero. Values within float noise of a half unit are re-read from their
+    shortest decimal form, so ``2.675`` becomes 268 cents although the float is below it.
+    """
+    values = np.asarray(values, dtype=float)
+    scaled = np.abs(values) * 10.0 ** digits
+    out = np.floor(scaled + 0.5)
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        idx = np.nonzero(near_tie)
+        out[idx] = [float(abs(Decimal(repr(float(v)))).scaleb(digits).quantize(Decimal(1), ROUND_HALF_UP))
+                    for v in values[idx]]
+    return np.copysign(out, values).astype(np.int64)
+
+
+def _div_round(num: np.ndarray, den) -> np.ndarray:
+    """Integer ``num / den`` rounded half away from zero (``den`` > 0)."""
+    num = np.asarray(num, dtype=np.int64)
+    q, r = np.divmod(np.abs(num), den)
+    q = q + (2 * r >= den)
+    return np.where(num < 0, -q, q)
+
+
+def _per_rate(amount: np.ndarray, rate_units: np.ndarray) -> np.ndarray:
+    """Cents times a rate in millionths, rounded to the cent."""
+    return _div_round(amount * rate_units, RATE_SCALE)
+
+
+@lru_cache(maxsize=None)
+def _cents_table(table: BracketTable) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """A bracket table as cents thresholds, millionth rates and cumulative tax in millionths of a cent."""
+    thresholds = to_units(table.thresholds)
+    rates = to_units(table.rates, RATE_DIGITS)
+    cumulative = np.concatenate(([0], np.cumsum(np.diff(thresholds) * rates[:-1]))).astype(np.int64)
+    return thresholds, rates, cumulative
+
+
+def _bracket_tax(table: BracketTable, income: np.ndarray) -> np.ndarray:
+    """Tax on annual ``income`` cents in millionths of a cent (exact)."""
+    thresholds, rates, cumulative = _cents_table(table)
+    i = np.maximum(np.searchsorted(thresholds, income, side="left") - 1, 0)
+    return np.maximum(cumulative[i] + np.maximum(income - thresholds[i], 0) * rates[i], 0)
+
+
+def _year_cents(years: np.ndarray, attr: str, digits: int = CENT_DIGITS) -> np.ndarray:
+    """Per-row ``TaxYearParams`` attribute in fixed point."""
+    unique, inverse = np.unique(years, return_inverse=True)
+    values = np.array([to_units(getattr(tax_year(int(y)), attr), digits) for y in unique], dtype=np.int64)
+    return values[inverse.reshape(years.shape)]
+
+
+def _groups(*keys: np.ndarray):
+    """
+    ``(key values, row indices)`` for each distinct combination of the ``keys`` arrays,
+    found with one sort rather than a boolean mask per group.
+    """
+    combined = np.zeros(len(keys[0]), dtype=np.int64)
+    for key in keys:
+        unique, inverse = np.unique(key, return_inverse=True)
+        combined = combined * len(unique) + inverse.reshape(-1)
+    order = np.argsort(combined, kind="stable")
+    for idx in np.split(order, np.flatnonzero(np.diff(combined[order])) + 1):
+        if idx.size:
+            yield tuple(key[idx[0]] for key in keys), idx
+
+
+def _percentage_method_cents(
+    wages: np.ndarray,
+    *,
+    year: np.ndarray,
+    filing_status: np.ndarray,
+    pay_periods_per_year: np.ndarray,
+    w4_step2: np.ndarray,
+    w4_step3_dependents_credit: np.ndarray,
+    w4_step4a_other_income: np.ndarray,
+    w4_step4b_deductions: np.ndarray,
+    w4_step4c_extra_withholding: np.ndarray,
+) -> np.ndarray:
+    """Percentage-method withholding on period ``wages`` cents; one rounding after the annual tax is divided back."""
+    annual = wages * pay_periods_per_year
+    annual = np.where(w4_step2, annual * 2, annual)
+    annual = np.maximum(annual + w4_step4a_other_income - w4_step4b_deductions, 0)
+    annual_tax = np.zeros(wages.shape, dtype=np.int64)
+    for (y, status), rows in _groups(year, filing_status):
+        params = tax_year(int(y))
+        taxable = np.maximum(annual[rows] - to_units(params.standard_deduction(str(status))), 0)
+        annual_tax[rows] = _bracket_tax(params.bracket_table(str(status)), taxable)
+    annual_tax = np.maximum(annual_tax - w4_step3_dependents_credit * RATE_SCALE, 0)
+    return _div_round(annual_tax, pay_periods_per_year * RATE_SCALE) + w4_step4c_extra_withholding
+
+
+def _state_period_tax_cents(
+    codes: np.ndarray,
+    wages: np.ndarray,
+    filing_status: np.ndarray,
+    pay_periods_per_year: np.ndarray,
+    allowances: np.ndarray,
+    year: np.ndarray,
+) -> np.ndarray:
+    """Per-period state tax in cents, one (year, state, filing status) group at a time."""
+    out = np.zeros(wages.shape, dtype=np.int64)
+    for (y, code, status), rows in _groups(year, codes, filing_status):
+        table = state_tables(int(y)).state(str(code))
+        if table.kind == "none":
+            continue
+        periods, allow = pay_periods_per_year[rows], allowances[rows]
+        taxable = np.maximum(wages[rows] * periods - to_units(table.standard_deduction(str(status)))
+                             - allow * to_units(table.allowance_deduction), 0)
+        tax = _bracket_tax(table.bracket_table(str(status)), taxable)
+        tax = np.maximum(tax - allow * to_units(table.allowance_credit) * RATE_SCALE, 0)
+        out[rows] = _div_round(tax, periods * RATE_SCALE)
+    return out
+
+
+def compute_payroll_cents(columns: Columns, *, config: Optional[PayrollConfig] = None) -> Dict[str, np.ndarray]:
+    """
+    Compute paychecks for many employees in integer cents. Takes the same ``columns``
+    and ``config`` as ``compute_payroll_batch``; returns a dict keyed by
+    ``RESULT_FIELDS`` whose money fields are ``int64`` cents (hours and the
+    effective tax rate stay floats).
+    """
+    inputs = BatchInputs(columns, config)
+    earnings = inputs.earnings()
+
+    converted: Dict[Tuple[str, int], np.ndarray] = {}
+
+    def units(name: str, digits: int) -> np.ndarray:
+        if (name, digits) not in converted:
+            converted[name, digits] = to_units(inputs.num_or_zero(name), digits)
+        return converted[name, digits]
+
+    def cents(name: str) -> np.ndarray:
+        return units(name, CENT_DIGITS)
+
+    def rate(name: str) -> np.ndarray:
+        return units(name, RATE_DIGITS)
+
+    # Earnings: each line to the cent, gross is their sum
+    hourly, salaried = earnings["hourly"], earnings["salaried"]
+    hourly_rate = to_units(np.where(hourly, earnings["hourly_rate"], 0.0), HOURLY_RATE_DIGITS)
+    line_scale = 10 ** (HOURLY_RATE_DIGITS + HOURS_DIGITS - CENT_DIGITS)
+    reg_pay = np.where(hourly, _div_round(hourly_rate * to_units(earnings["hours"], HOURS_DIGITS), line_scale),
+                       np.where(salaried, to_units(np.where(salaried, earnings["salary"], 0.0)), 0))
+    ot_pay = _div_round(hourly_rate * to_units(earnings["overtime_hours"], HOURS_DIGITS)
+                        * to_units(earnings["overtime_multiplier"], MULTIPLIER_DIGITS), line_scale * 10 ** MULTIPLIER_DIGITS)
+    dt_pay = _div_round(hourly_rate * to_units(earnings["doubletime_hours"], HOURS_DIGITS)
+                        * to_units(earnings["doubletime_multiplier"], MULTIPLIER_DIGITS), line_scale * 10 ** MULTIPLIER_DIGITS)
+    g = reg_pay + ot_pay + dt_pay
+
+    # Pre-tax adjustments (dollar + percent-of-gross)
+    def pretax(name: str) -> np.ndarray:
+        return np.maximum(cents(name), 0) + _per_rate(g, np.maximum(rate(f"{name}_percent"), 0))
+
+    pretax_fit_fica = pretax("pretax_hsa") + pretax("pretax_section125")
+    fica_taxable = np.maximum(g - pretax_fit_fica, 0)
+    fit_taxable = np.maximum(g - pretax("pretax_401k") - pretax_fit_fica, 0)
+
+    # Employee FICA
+    ytd = cents("ytd_wages")
+    year = inputs.num("year").astype(int)
+    wage_base = _year_cents(year, "ss_wage_base")
+    medicare_rate = _year_cents(year, "medicare_rate", RATE_DIGITS)
+    room = np.maximum(wage_base - np.minimum(ytd, wage_base), 0)
+    ss = _per_rate(np.clip(fica_taxable, 0, room), _year_cents(year, "ss_rate", RATE_DIGITS))
+    addl_threshold = _year_cents(year, "addl_medicare_threshold")
+    crossed_from = np.maximum(addl_threshold - ytd, 0)
+    addl_taxable = np.where(ytd + fica_taxable > addl_threshold, np.maximum(fica_taxable - crossed_from, 0), 0)
+    medi = _div_round(fica_taxable * medicare_rate + addl_taxable * _year_cents(year, "addl_medicare_rate", RATE_DIGITS),
+                      RATE_SCALE)
+
+    # Federal withholding
+    method = inputs.text("withholding_method")
+    filing_status = inputs.text("filing_status")
+    periods = inputs.num("pay_periods_per_year").astype(np.int64)
+
+    def percentage_method(wages: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        return _percentage_method_cents(
+            wages,
+            year=year[rows],
+            filing_status=filing_status[rows],
+            pay_periods_per_year=periods[rows],
+            w4_step2=inputs.num_or_zero("w4_step2")[rows] != 0,
+            w4_step3_dependents_credit=cents("w4_step3_dependents_credit")[rows],
+            w4_step4a_other_income=cents("w4_step4a_other_income")[rows],
+            w4_step4b_deductions=cents("w4_step4b_deductions")[rows],
+            w4_step4c_extra_withholding=cents("w4_step4c_extra_withholding")[rows],
+        )
+
+    fit = _per_rate(fit_taxable, np.maximum(rate("federal_rate"), 0))
+    pct_rows = method == "irs_percentage"
+    if pct_rows.any():
+        fit[pct_rows] = percentage_method(fit_taxable[pct_rows], pct_rows)
+    sup_rows = (method == "supplemental") | (method == "aggregate")
+    if sup_rows.any():
+        # Supplemental wages: mandatory rate over the YTD threshold, flat rate or aggregate below it
+        wages = fit_taxable[sup_rows]
+        sup_year = year[sup_rows]
+        room = np.maximum(_year_cents(sup_year, "supplemental_mandatory_threshold")
+                          - np.maximum(cents("ytd_supplemental_wages")[sup_rows], 0), 0)
+        below = np.clip(wages, 0, room)
+        above = wages - below
+        tax_below = below * _year_cents(sup_year, "supplemental_rate", RATE_DIGITS)
+        agg = method[sup_rows] == "aggregate"
+        if agg.any():
+            agg_rows = np.nonzero(sup_rows)[0][agg]
+            regular = np.maximum(cents("regular_wages")[agg_rows], 0)
+            tax_below[agg] = np.maximum(percentage_method(regular + below[agg], agg_rows)
+                                        - percentage_method(regular, agg_rows), 0) * RATE_SCALE
+        fit[sup_rows] = _div_round(tax_below + above * _year_cents(sup_year, "supplemental_mandatory_rate", RATE_DIGITS),
+                                   RATE_SCALE)
+
+    # State withholding on FIT taxable wages: flat state_rate where given, else the state tables
+    state_rate = inputs.num("state_rate")
+    flat_rows = ~np.isnan(state_rate) & (state_rate != 0)
+    sit = _per_rate(fit_taxable, np.maximum(rate("state_rate"), 0))
+    work_state = inputs.text("work_state")
+    resident_state = inputs.text("resident_state")
+    table_rows = ~flat_rows & ((np.char.strip(work_state) != "") | (np.char.strip(resident_state) != ""))
+    if table_rows.any():
+        work, resident, elsewhere, reciprocal = state_allocation(work_state[table_rows], resident_state[table_rows],
+                                                                  year[table_rows])
+        wages = fit_taxable[table_rows]
+        profile = (filing_status[table_rows], periods[table_rows],
+                   inputs.num_or_zero("state_allowances")[table_rows].astype(np.int64), year[table_rows])
+        work_tax = np.zeros(wages.shape, dtype=np.int64)
+        taxed = ~reciprocal
+        work_tax[taxed] = _state_period_tax_cents(work[taxed], wages[taxed], *(a[taxed] for a in profile))
+        resident_tax = np.zeros(wages.shape, dtype=np.int64)
+        if elsewhere.any():
+            full = _state_period_tax_cents(resident[elsewhere], wages[elsewhere], *(a[elsewhere] for a in profile))
+            # Resident state credits the tax withheld for the work state
+            resident_tax[elsewhere] = np.where(reciprocal[elsewhere], full, np.maximum(full - work_tax[elsewhere], 0))
+        sit[table_rows] = work_tax + resident_tax
+    base_deductions = ss + medi + fit + sit
+
+    # Post-tax deductions (from net-after-tax)
+    net_before_posttax = np.maximum(g - base_deductions, 0)
+    posttax_total = np.maximum(cents("posttax_flat"), 0) + _per_rate(net_before_posttax,
+                                                                     np.maximum(rate("posttax_percent_net"), 0))
+    total_deductions = base_deductions + posttax_total
+    net = g - total_deductions
+
+    # Employer costs
+    employer_medi = _per_rate(fica_taxable, medicare_rate)
+    employer_total = ss + employer_medi
+    safe_g = np.where(g > 0, g, 1)
+    effective_rate = np.where(g > 0, round_half_even(total_deductions / safe_g, 4), 0.0)
+
+    result = {
+        "gross": g,
+        "taxable_wages_fica": fica_taxable,
+        "taxable_wages_fit": fit_taxable,
+        "social_security": ss,
+        "medicare": medi,
+        "federal_income_tax": fit,
+        "state_income_tax": sit,
+        "posttax_deductions": posttax_total,
+        "total_deductions": total_deductions,
+        "net": net,
+        "employer_social_security": ss.copy(),
+        "employer_medicare": employer_medi,
+        "employer_total": employer_total,
+        "regular_hours": round_half_even(earnings["hours"]),
+        "overtime_hours": round_half_even(earnings["overtime_hours"]),
+        "doubletime_hours": round_half_even(earnings["doubletime_hours"]),
+        "regular_pay": reg_pay,
+        "overtime_pay": ot_pay,
+        "doubletime_pay": dt_pay,
+        "effective_employee_tax_rate": effective_rate,
+        "total_employer_cost": g + employer_total,
+    }
+    return {key: result[key] for key in RESULT_FIELDS}
+
+
+def cents_to_dollars(result: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """``compute_payroll_cents`` output with money fields as float dollars (for CSV/JSON writers)."""
+    return {key: values / 100 if key in MONEY_FIELDS else values for key, values in result.items()}
+
+
+def compute_paycheck_cents(pay_type: str, *, config: Optional[PayrollConfig] = None, **earnings) -> PaycheckResult:
+    """
+    One paycheck in exact money mode, as a ``PaycheckResult`` in dollars. Takes the
+    ``compute_paycheck`` earnings keywords (``hourly_rate``, ``hours``, ``salary``, ...)
+    except ``daily_hours``.
+    """
+    columns = {"pay_type": np.array([pay_type])}
+    for name, value in earnings.items():
+        columns[name] = np.array([np.nan if value is None else value], dtype=float)
+    dollars = cents_to_dollars(compute_payroll_cents(columns, config=config))
+    return PaycheckResult(*(float(dollars[name][0]) for name in RESULT_FIELDS))
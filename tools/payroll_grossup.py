@@ -0,0 +1,310 @@
+"""Net-to-gross (gross-up) solver for bonuses and relocation payments.
+
+Given a target net, find the smallest gross (in cents) whose paycheck nets at least
+that much. The amount is paid as its own check (a salary-type payment of that
+gross) under the employee's ``PayrollConfig``: W-4, YTD wages, pre-tax and post-tax
+deductions all apply as they would in ``compute_paycheck``.
+
+Net pay is piecewise linear in gross: each tax bracket, the Social Security wage
+base, the Additional Medicare threshold and the deduction floors only change its
+slope. The solver brackets the target and takes secant steps (Illinois variant),
+which land on the answer once both points sit on the same linear segment, then
+polishes the result to the cent. A handful of engine evaluations per payment is
+typical; ``max_evaluations`` bounds it.
+
+    result = gross_up(2500.0, PayrollConfig(withholding_method="irs_percentage"))
+    result.gross, result.result.net
+
+``gross_up_batch`` runs the same solver on arrays through the columnar engine, for
+many payments at once.
+
+    python tools/payroll_grossup.py --net 2500 --withholding-method irs_percentage
+    python tools/payroll_grossup.py --input bonuses.csv --output grossed.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import sys
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from payroll_batch import Columns, column_names, compute_payroll_batch, row_count
+from payroll_calculator import PayrollConfig, compute_paycheck, parse_rate
+from payroll_pipeline import ID_FIELD, read_employee_records, record_to_paycheck_args
+from payroll_results import PaycheckResult
+
+
+# Engine evaluations allowed per payment before giving up
+MAX_EVALUATIONS = 60
+# Lowest net-per-gross slope assumed when extrapolating towards the target
+MIN_SLOPE = 0.05
+TARGET_FIELD = "target_net"
+# compute_paycheck earnings arguments; the solver supplies the gross itself
+_EARNINGS_COLUMNS = ("pay_type", "hourly_rate", "hours", "overtime_hours", "doubletime_hours", "salary",
+                     "daily_hours", "daily_rates")
+
+NetFunction = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+
+@dataclass
+class GrossUpResult:
+    """The solved gross, the paycheck it produces and how many engine evaluations it took."""
+
+    target_net: float
+    gross: float
+    result: PaycheckResult
+    evaluations: int
+
+
+def _cents_up(values: np.ndarray) -> np.ndarray:
+    return np.ceil(np.round(values * 100.0, 6)) / 100.0
+
+
+def _solve(net_at: NetFunction, target: np.ndarray, max_evaluations: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Smallest cent gross per row with ``net_at(gross) >= target``. ``net_at(gross, rows)``
+    returns the net for the given rows only. Returns ``(gross, evaluations per row)``.
+    """
+    n = target.shape[0]
+    evaluations = np.zeros(n, dtype=int)
+    all_rows = np.arange(n)
+
+    def f(gross: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        evaluations[rows] += 1
+        return net_at(gross, rows) - target[rows]
+
+    # Deductions are never negative, so the target itself is a lower bound on the gross
+    lo = target.copy()
+    f_lo = f(lo, all_rows)
+    hi = lo.copy()
+    f_hi = f_lo.copy()
+
+    # Bracket: extrapolate along the latest chord until the net reaches the target
+    slope = np.where(lo > 0, (f_lo + target) / np.where(lo > 0, lo, 1.0), 1.0)
+    while True:
+        rows = np.nonzero(f_hi < 0)[0]
+        if rows.size == 0:
+            break
+        if (evaluations[rows] >= max_evaluations).any():
+            row = int(rows[np.argmax(evaluations[rows] >= max_evaluations)])
+            raise ValueError(f"Net pay never reaches {target[row]:.2f} (row {row}); check post-tax deductions")
+        step = -f_hi[rows] / np.maximum(slope[rows], MIN_SLOPE)
+        # Net is concave over most of its range, so the chord undershoots: overshoot a little
+        # and at least double the bracket each round
+        step = np.maximum(step * 1.25 + 0.01, hi[rows] - lo[rows])
+        new = hi[rows] + step
+        f_new = f(new, rows)
+        lo[rows], f_lo[rows] = hi[rows], f_hi[rows]
+        hi[rows], f_hi[rows] = new, f_new
+        slope[rows] = np.where(new > lo[rows], (f_new - f_lo[rows]) / (new - lo[rows]), slope[rows])
+
+    # Illinois secant on [lo, hi]: f_lo < 0 <= f_hi (or lo == hi when the target itself suffices).
+    # f_lo/f_hi get halved, so convergence is judged on the freshly evaluated point
+    side = np.zeros(n, dtype=int)
+    done = hi - lo <= 0.01
+    while True:
+        rows = np.nonzero(~done & (evaluations < max_evaluations))[0]
+        if rows.size == 0:
+            break
+        a, b, fa, fb = lo[rows], hi[rows], f_lo[rows], f_hi[rows]
+        x = b - fb * (b - a) / (fb - fa)
+        # Stay strictly inside the bracket so every step shrinks it
+        x = np.clip(x, a + 0.005, b - 0.005)
+        fx = f(x, rows)
+        upper = fx >= 0
+        up_rows, low_rows = rows[upper], rows[~upper]
+        hi[up_rows], f_hi[up_rows] = x[upper], fx[upper]
+        lo[low_rows], f_lo[low_rows] = x[~upper], fx[~upper]
+        # Halve the stale endpoint's value when the same side moves twice in a row
+        f_lo[up_rows[side[up_rows] == 1]] /= 2.0
+        f_hi[low_rows[side[low_rows] == -1]] /= 2.0
+        side[up_rows], side[low_rows] = 1, -1
+        done[rows] = (upper & (fx < 0.01)) | (hi[rows] - lo[rows] <= 0.01)
+
+    def check_budget(rows: np.ndarray) -> None:
+        spent = evaluations[rows] >= max_evaluations
+        if spent.any():
+            row = int(rows[np.argmax(spent)])
+            raise ValueError(f"Gross-up for net {target[row]:.2f} (row {row}) did not converge "
+                             f"within {max_evaluations} evaluations")
+
+    # Cent polish: rounding makes net step by whole cents, so walk to the smallest
+    # cent gross that still reaches the target (a few steps once the secant converged)
+    gross = _cents_up(hi)
+    rows = all_rows
+    while rows.size:
+        check_budget(rows)
+        below = f(gross[rows], rows) < 0
+        gross[rows[below]] += 0.01
+        rest = rows[~below]
+        check_budget(rest)
+        can_drop = f(np.round(gross[rest] - 0.01, 2), rest) >= 0 if rest.size else np.zeros(0, dtype=bool)
+        gross[rest[can_drop]] -= 0.01
+        gross = np.round(gross, 2)
+        rows = np.concatenate((rows[below], rest[can_drop]))
+    return gross, evaluations
+
+
+def _check_targets(target: np.ndarray) -> None:
+    bad = ~(target > 0)
+    if bad.any():
+        raise ValueError(f"target net must be a positive amount (row {int(np.argmax(bad))})")
+
+
+def gross_up(
+    target_net: float,
+    config: Optional[PayrollConfig] = None,
+    *,
+    max_evaluations: int = MAX_EVALUATIONS,
+) -> GrossUpResult:
+    """
+    Smallest gross (to the cent) whose paycheck under ``config`` nets at least
+    ``target_net``. Raises ``ValueError`` if the target cannot be reached.
+    """
+    config = config or PayrollConfig()
+    target = np.array([float(target_net)])
+    _check_targets(target)
+
+    def net_at(gross: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        return np.array([compute_paycheck("salary", salary=float(g), config=config).net for g in gross])
+
+    gross, evaluations = _solve(net_at, target, max_evaluations)
+    g = float(gross[0])
+    return GrossUpResult(float(target_net), g, compute_paycheck("salary", salary=g, config=config), int(evaluations[0]))
+
+
+def _take_rows(columns: Columns, rows: np.ndarray) -> Columns:
+    if isinstance(columns, np.ndarray):
+        return columns[rows]
+    out: Dict[str, Any] = {}
+    for name, value in columns.items():
+        arr = np.asarray(value)
+        out[name] = arr if arr.ndim == 0 else arr[rows]
+    return out
+
+
+def gross_up_batch(
+    target_net: Any,
+    columns: Optional[Columns] = None,
+    *,
+    config: Optional[PayrollConfig] = None,
+    max_evaluations: int = MAX_EVALUATIONS,
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized ``gross_up``: one solved payment per element of ``target_net``.
+
+    ``columns`` holds per-payment ``PayrollConfig`` fields (``ytd_wages``,
+    ``filing_status``, ``w4_step2``, ...) as in ``compute_payroll_batch``; absent
+    fields come from ``config``. Earnings columns are not accepted, since the solver
+    chooses the gross. Returns the ``compute_payroll_batch`` result arrays at the
+    solved gross plus ``target_net`` and ``evaluations``.
+    """
+    target = np.atleast_1d(np.asarray(target_net, dtype=float))
+    _check_targets(target)
+    n = target.shape[0]
+    columns = {} if columns is None else columns
+    earnings = [name for name in column_names(columns) if name in _EARNINGS_COLUMNS]
+    if earnings:
+        raise ValueError(f"gross_up_batch chooses the gross itself; drop the {', '.join(earnings)} column(s)")
+    if column_names(columns) and row_count(columns) != n:
+        raise ValueError("columns must have one row per target net")
+
+    def batch(gross: np.ndarray, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        part = _take_rows(columns, rows)
+        if isinstance(part, np.ndarray):
+            part = {name: part[name] for name in part.dtype.names}
+        return compute_payroll_batch({**part, "pay_type": "salary", "salary": gross}, config=config)
+
+    gross, evaluations = _solve(lambda g, rows: batch(g, rows)["net"], target, max_evaluations)
+    result = batch(gross, np.arange(n))
+    result["target_net"] = target
+    result["evaluations"] = evaluations
+    return result
+
+
+GROSSUP_FIELDS = (ID_FIELD, TARGET_FIELD, "gross", "net", "social_security", "medicare",
+                  "federal_income_tax", "state_income_tax", "posttax_deductions", "total_employer_cost")
+
+
+def _records_to_columns(records: Iterable[Dict[str, Any]], defaults: PayrollConfig) -> Tuple[List[Any], np.ndarray, Dict[str, List[Any]]]:
+    ids: List[Any] = []
+    targets: List[float] = []
+    configs: List[PayrollConfig] = []
+    for i, record in enumerate(records, start=1):
+        try:
+            targets.append(float(record[TARGET_FIELD]))
+            configs.append(record_to_paycheck_args(record, defaults)[2])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Record {i} ({record.get(ID_FIELD, '?')}): {e!r}") from None
+        ids.append(record.get(ID_FIELD, i))
+    columns = {f.name: [getattr(c, f.name) for c in configs] for f in fields(PayrollConfig)}
+    return ids, np.array(targets, dtype=float), columns
+
+
+def write_grossups(ids: List[Any], result: Dict[str, np.ndarray], out) -> int:
+    writer = csv.writer(out)
+    writer.writerow(GROSSUP_FIELDS)
+    for i, employee_id in enumerate(ids):
+        writer.writerow([employee_id] + [f"{float(result[name][i]):.2f}" for name in GROSSUP_FIELDS[1:]])
+    return len(ids)
+
+
+def main():
+    p = argparse.ArgumentParser(description="Find the gross payment that yields a target net (bonus / relocation gross-up).")
+    src = p.add_mutually_exclusive_group(required=True)
+    src.add_argument("--net", type=float, help="Target net amount for one payment")
+    src.add_argument("--input", type=str, help=f"CSV/JSON-lines file of payments: {TARGET_FIELD} plus PayrollConfig fields")
+    p.add_argument("--format", choices=["csv", "jsonl"], default=None, help="Input format (default: from the file extension)")
+    p.add_argument("--output", type=str, default=None, help="Write the result CSV here instead of stdout (--input)")
+    p.add_argument("--year", type=int, default=2025)
+    p.add_argument("--ytd-wages", type=float, default=0.0, help="YTD FICA wages before this payment")
+    p.add_argument("--withholding-method", choices=["flat", "irs_percentage", "supplemental", "aggregate"], default="flat",
+                   help="Federal withholding method; supplemental/aggregate for bonus checks")
+    p.add_argument("--federal-rate", type=str, default=None, help="Flat federal rate, e.g. 0.22 or 22%%")
+    p.add_argument("--state-rate", type=str, default=None, help="Flat state rate, e.g. 0.05 or 5%%")
+    p.add_argument("--filing-status", choices=["single", "married", "head"], default="single")
+    p.add_argument("--pay-periods", type=int, default=26)
+    p.add_argument("--ytd-supplemental-wages", type=float, default=0.0,
+                   help="Supplemental wages already paid this year (mandatory 37%% rate over $1M)")
+    p.add_argument("--regular-wages", type=float, default=0.0,
+                   help="FIT-taxable regular wages of the same period (--withholding-method aggregate)")
+    args = p.parse_args()
+
+    defaults = PayrollConfig(
+        year=args.year,
+        ytd_wages=args.ytd_wages,
+        withholding_method=args.withholding_method,
+        federal_rate=parse_rate(args.federal_rate),
+        state_rate=parse_rate(args.state_rate),
+        filing_status=args.filing_status,
+        pay_periods_per_year=args.pay_periods,
+        ytd_supplemental_wages=args.ytd_supplemental_wages,
+        regular_wages=args.regular_wages,
+    )
+    try:
+        if args.net is not None:
+            solved = gross_up(args.net, defaults)
+            r = solved.result
+            print(f"Target net: {args.net:,.2f}")
+            print(f"Gross:      {solved.gross:,.2f}  (net {r.net:,.2f}, {solved.evaluations} evaluations)")
+            print(f"Taxes:      SS {r.social_security:,.2f}  Medicare {r.medicare:,.2f}  "
+                  f"FIT {r.federal_income_tax:,.2f}  SIT {r.state_income_tax:,.2f}")
+            return
+        ids, targets, columns = _records_to_columns(read_employee_records(args.input, args.format), defaults)
+        result = gross_up_batch(targets, columns, config=defaults)
+        if args.output:
+            with open(args.output, "w", newline="") as f:
+                count = write_grossups(ids, result, f)
+        else:
+            count = write_grossups(ids, result, sys.stdout)
+    except (OSError, ValueError) as e:
+        p.error(str(e))
+    print(f"{count} payment(s) grossed up", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
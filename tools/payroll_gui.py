@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from tkinter import scrolledtext
-import json
+import csv
 from pathlib import Path
 
 try:
@@ -9,11 +9,69 @@ try:
     from payroll_calculator import (
         compute_paycheck,
         PayrollConfig,
-        _parse_rate,
+        RESULT_FIELDS,
+        SUPPLEMENTAL_METHODS,
+        parse_rate,
+        render_explanation,
     )
+    from payroll_settings import SettingsStore
+    from payroll_worker import BackgroundWorker
 except Exception as e:
     raise SystemExit(f"Error importing payroll_calculator: {e}")
 
+try:
+    from payroll_payrun import DISPLAY_COLUMNS, PayRunView, Viewport, load_pay_run
+except ImportError:  # numpy is optional; only the Pay Run tab needs it
+    load_pay_run = None
+
+
+# How often the UI drains finished background jobs (ms)
+POLL_MS = 50
+# Quiet time before a calculation / settings write starts; re-clicks within it only run the latest (s)
+CALC_DEBOUNCE_S = 0.1
+SETTINGS_DEBOUNCE_S = 0.5
+# Form fields that are UI preferences rather than part of a saved employee profile
+PROFILE_EXCLUDE = ("profile", "show_explain")
+# Rows in the pay-run grid; the Treeview only ever holds this many items
+PAYRUN_ROWS = 20
+
+
+def _run_calculation(token, request):
+    """Worker job: the paycheck and (if traced) its explanation text."""
+    pay_type, kwargs, config, trace = request
+    result = compute_paycheck(pay_type, **kwargs, config=config, trace=trace)
+    token.check()
+    explanation = render_explanation(result) if result.trace is not None else None
+    return request, result, explanation
+
+
+def _write_result_csv(token, path, result):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(RESULT_FIELDS)
+        writer.writerow(result.values_tuple())
+    return path
+
+
+def _run_pay_run(token, path, defaults, default_pay_type):
+    """Worker job: compute every employee in ``path`` into a ``PayRunView``."""
+    return PayRunView(load_pay_run(path, defaults, default_pay_type, token=token))
+
+
+def _write_payrun_csv(token, path, view):
+    with open(path, "w", newline="") as f:
+        view.write_csv(f)
+    return path
+
+
+def _write_settings(token, store, data):
+    return store.save(data)
+
+
+def _write_profile(token, store, name, data):
+    store.save_profile(name, data)
+    return name
+
 
 class PayrollGUI(tk.Tk):
     def __init__(self):
@@ -21,7 +79,12 @@ class PayrollGUI(tk.Tk):
         self.title("Payroll Calculator (with Overtime)")
         self.resizable(False, False)
         self._last_result = None
-        self._settings_file = Path.home() / ".payroll_gui_settings.json"
+        self._payrun = None
+        self._viewport = Viewport(PAYRUN_ROWS) if load_pay_run is not None else None
+        self._settings = SettingsStore()
+        self._saved_form = None
+        self._worker = BackgroundWorker()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
         # Variables
         self.pay_type = tk.StringVar(value="hourly")
@@ -40,6 +103,9 @@ class PayrollGUI(tk.Tk):
         self.withholding_method = tk.StringVar(value="flat")
         self.federal_rate = tk.StringVar()
         self.state_rate = tk.StringVar()
+        # Supplemental wages ('supplemental'/'aggregate' methods)
+        self.ytd_supplemental_wages = tk.StringVar(value="0")
+        self.regular_wages = tk.StringVar(value="0")
 
         # W-4 style variables (percentage method)
         self.filing_status = tk.StringVar(value="single")
@@ -50,6 +116,9 @@ class PayrollGUI(tk.Tk):
         self.w4_step4b = tk.StringVar(value="0")
         self.w4_step4c = tk.StringVar(value="0")
 
+        # Saved profile selected in the Profile box
+        self.profile_name = tk.StringVar()
+
         # Pre-tax deductions
         self.pretax_401k = tk.StringVar(value="0")
         self.pretax_hsa = tk.StringVar(value="0")
@@ -62,18 +131,29 @@ class PayrollGUI(tk.Tk):
         self._load_settings()
         self._toggle_fields()
         self._toggle_explain()
+        self.after(POLL_MS, self._poll_worker)
 
     def _build_ui(self):
+        notebook = ttk.Notebook(self)
+        notebook.grid(row=0, column=0, sticky="nsew")
+        tab = ttk.Frame(notebook)
+        notebook.add(tab, text="Paycheck")
+        self._build_paycheck_tab(tab)
+        tab = ttk.Frame(notebook)
+        notebook.add(tab, text="Pay Run")
+        self._build_payrun_tab(tab)
+
+    def _build_paycheck_tab(self, tab):
         pad = {"padx": 6, "pady": 4}
 
         # Pay type
-        frm_type = ttk.LabelFrame(self, text="Pay Type")
+        frm_type = ttk.LabelFrame(tab, text="Pay Type")
         frm_type.grid(row=0, column=0, sticky="ew", **pad)
         ttk.Radiobutton(frm_type, text="Hourly", variable=self.pay_type, value="hourly", command=self._toggle_fields).grid(row=0, column=0, sticky="w", **pad)
         ttk.Radiobutton(frm_type, text="Salary", variable=self.pay_type, value="salary", command=self._toggle_fields).grid(row=0, column=1, sticky="w", **pad)
 
         # Hourly inputs
-        frm_hourly = ttk.LabelFrame(self, text="Hourly Inputs")
+        frm_hourly = ttk.LabelFrame(tab, text="Hourly Inputs")
         frm_hourly.grid(row=1, column=0, sticky="ew", **pad)
         self.frm_hourly = frm_hourly
 
@@ -100,7 +180,7 @@ class PayrollGUI(tk.Tk):
         ttk.Checkbutton(frm_hourly, text="Use CA daily OT", variable=self.use_ca_daily_ot).grid(row=6, column=2, sticky="w", **pad)
 
         # Salary input
-        frm_salary = ttk.LabelFrame(self, text="Salary Input")
+        frm_salary = ttk.LabelFrame(tab, text="Salary Input")
         frm_salary.grid(row=2, column=0, sticky="ew", **pad)
         self.frm_salary = frm_salary
 
@@ -108,7 +188,7 @@ class PayrollGUI(tk.Tk):
         ttk.Entry(frm_salary, textvariable=self.salary, width=16).grid(row=0, column=1, **pad)
 
         # Tax / config
-        frm_cfg = ttk.LabelFrame(self, text="Config & Withholding")
+        frm_cfg = ttk.LabelFrame(tab, text="Config & Withholding")
         frm_cfg.grid(row=3, column=0, sticky="ew", **pad)
 
         ttk.Label(frm_cfg, text="Year").grid(row=0, column=0, sticky="e", **pad)
@@ -118,7 +198,7 @@ class PayrollGUI(tk.Tk):
         ttk.Entry(frm_cfg, textvariable=self.ytd_wages, width=12).grid(row=0, column=3, **pad)
 
         ttk.Label(frm_cfg, text="Withholding Method").grid(row=1, column=0, sticky="e", **pad)
-        self.cbo_method = ttk.Combobox(frm_cfg, textvariable=self.withholding_method, values=("flat","irs_percentage"), width=14, state="readonly")
+        self.cbo_method = ttk.Combobox(frm_cfg, textvariable=self.withholding_method, values=("flat","irs_percentage","supplemental","aggregate"), width=14, state="readonly")
         self.cbo_method.grid(row=1, column=1, **pad)
         self.cbo_method.bind("<<ComboboxSelected>>", lambda e: self._toggle_fields())
 
@@ -129,6 +209,13 @@ class PayrollGUI(tk.Tk):
 
         ttk.Label(frm_cfg, text="State Rate").grid(row=2, column=0, sticky="e", **pad)
         ttk.Entry(frm_cfg, textvariable=self.state_rate, width=8).grid(row=2, column=1, **pad)
+        ttk.Label(frm_cfg, text="YTD Supplemental ($)").grid(row=2, column=2, sticky="e", **pad)
+        self.entry_ytd_supp = ttk.Entry(frm_cfg, textvariable=self.ytd_supplemental_wages, width=12)
+        self.entry_ytd_supp.grid(row=2, column=3, **pad)
+        ttk.Label(frm_cfg, text="Regular Wages ($)").grid(row=2, column=4, sticky="e", **pad)
+        self.entry_regular = ttk.Entry(frm_cfg, textvariable=self.regular_wages, width=12)
+        self.entry_regular.grid(row=2, column=5, **pad)
+        ttk.Label(frm_cfg, text="(aggregate mode)").grid(row=2, column=6, sticky="w", **pad)
 
         # W-4 (percentage method)
         ttk.Label(frm_cfg, text="Filing Status").grid(row=3, column=0, sticky="e", **pad)
@@ -154,7 +241,7 @@ class PayrollGUI(tk.Tk):
         self.entry_w4s4c.grid(row=4, column=7, **pad)
 
         # Pre-tax deductions
-        frm_pre = ttk.LabelFrame(self, text="Pre-tax Deductions (per period)")
+        frm_pre = ttk.LabelFrame(tab, text="Pre-tax Deductions (per period)")
         frm_pre.grid(row=4, column=0, sticky="ew", **pad)
         ttk.Label(frm_pre, text="401(k)").grid(row=0, column=0, sticky="e", **pad)
         ttk.Entry(frm_pre, textvariable=self.pretax_401k, width=10).grid(row=0, column=1, **pad)
@@ -163,18 +250,31 @@ class PayrollGUI(tk.Tk):
         ttk.Label(frm_pre, text="Section 125").grid(row=0, column=4, sticky="e", **pad)
         ttk.Entry(frm_pre, textvariable=self.pretax_section125, width=10).grid(row=0, column=5, **pad)
 
+        # Saved profiles: pick one to fill the form, or type a new name and Save
+        frm_prof = ttk.LabelFrame(tab, text="Profile")
+        frm_prof.grid(row=5, column=0, sticky="ew", **pad)
+        self.cbo_profile = ttk.Combobox(frm_prof, textvariable=self.profile_name, width=30, postcommand=self._refresh_profiles)
+        self.cbo_profile.grid(row=0, column=0, **pad)
+        self.cbo_profile.bind("<<ComboboxSelected>>", lambda e: self._load_profile())
+        ttk.Button(frm_prof, text="Load", command=self._load_profile).grid(row=0, column=1, **pad)
+        ttk.Button(frm_prof, text="Save", command=self._save_profile).grid(row=0, column=2, **pad)
+        ttk.Button(frm_prof, text="Delete", command=self._delete_profile).grid(row=0, column=3, **pad)
+
         # Actions
-        frm_actions = ttk.Frame(self)
+        frm_actions = ttk.Frame(tab)
         frm_actions.grid(row=6, column=0, sticky="ew", **pad)
         ttk.Button(frm_actions, text="Calculate", command=self._calculate).grid(row=0, column=0, **pad)
         ttk.Button(frm_actions, text="Overtime Rules", command=self._show_ot_rules).grid(row=0, column=1, **pad)
         ttk.Button(frm_actions, text="Copy Breakdown", command=self._copy_breakdown).grid(row=0, column=2, **pad)
         ttk.Button(frm_actions, text="Export CSV", command=self._export_csv).grid(row=0, column=3, **pad)
         ttk.Button(frm_actions, text="Reset", command=self._reset).grid(row=0, column=4, **pad)
-        ttk.Checkbutton(frm_actions, text="Show Explanation", variable=self.show_explain, command=self._toggle_explain).grid(row=0, column=5, sticky="w", **pad)
+        ttk.Button(frm_actions, text="Cancel", command=self._cancel_calculation).grid(row=0, column=5, **pad)
+        ttk.Checkbutton(frm_actions, text="Show Explanation", variable=self.show_explain, command=self._toggle_explain).grid(row=0, column=6, sticky="w", **pad)
+        self.lbl_status = ttk.Label(frm_actions, text="")
+        self.lbl_status.grid(row=0, column=7, sticky="w", **pad)
 
         # Results
-        frm_res = ttk.LabelFrame(self, text="Results")
+        frm_res = ttk.LabelFrame(tab, text="Results")
         frm_res.grid(row=7, column=0, sticky="ew", **pad)
         self.lbl_gross = ttk.Label(frm_res, text="Gross: -")
         self.lbl_gross.grid(row=0, column=0, sticky="w", **pad)
@@ -204,15 +304,67 @@ class PayrollGUI(tk.Tk):
         self.lbl_delta.grid(row=12, column=0, sticky="w", **pad)
 
         # Explanation panel
-        self.frm_explain = ttk.LabelFrame(self, text="Explanation")
+        self.frm_explain = ttk.LabelFrame(tab, text="Explanation")
         self.frm_explain.grid(row=8, column=0, sticky="nsew", **pad)
         self.txt_explain = scrolledtext.ScrolledText(self.frm_explain, width=80, height=18)
         self.txt_explain.grid(row=0, column=0, sticky="nsew", padx=4, pady=4)
 
         # Error banner
-        self.lbl_error = ttk.Label(self, text="", foreground="red")
+        self.lbl_error = ttk.Label(tab, text="", foreground="red")
         self.lbl_error.grid(row=9, column=0, sticky="w", padx=8)
 
+    def _build_payrun_tab(self, tab):
+        pad = {"padx": 6, "pady": 4}
+        if load_pay_run is None:
+            ttk.Label(tab, text="Pay runs need numpy (pip install numpy).").grid(row=0, column=0, sticky="w", **pad)
+            return
+
+        frm_file = ttk.Frame(tab)
+        frm_file.grid(row=0, column=0, sticky="ew", **pad)
+        ttk.Button(frm_file, text="Open Employee File...", command=self._open_pay_run).grid(row=0, column=0, **pad)
+        ttk.Button(frm_file, text="Cancel", command=self._cancel_pay_run).grid(row=0, column=1, **pad)
+        ttk.Button(frm_file, text="Export View CSV", command=self._export_pay_run).grid(row=0, column=2, **pad)
+        self.lbl_run_status = ttk.Label(frm_file, text="Form settings fill in fields the file leaves blank.")
+        self.lbl_run_status.grid(row=0, column=3, sticky="w", **pad)
+
+        # Filter: employee id substring and/or a min-max range on one column
+        self.run_filter_text = tk.StringVar()
+        self.run_filter_column = tk.StringVar(value="net")
+        self.run_filter_min = tk.StringVar()
+        self.run_filter_max = tk.StringVar()
+        frm_filter = ttk.LabelFrame(tab, text="Filter")
+        frm_filter.grid(row=1, column=0, sticky="ew", **pad)
+        ttk.Label(frm_filter, text="Employee ID contains").grid(row=0, column=0, sticky="e", **pad)
+        ttk.Entry(frm_filter, textvariable=self.run_filter_text, width=12).grid(row=0, column=1, **pad)
+        ttk.Combobox(frm_filter, textvariable=self.run_filter_column, values=list(RESULT_FIELDS),
+                     state="readonly", width=24).grid(row=0, column=2, **pad)
+        ttk.Label(frm_filter, text="Min").grid(row=0, column=3, sticky="e", **pad)
+        ttk.Entry(frm_filter, textvariable=self.run_filter_min, width=10).grid(row=0, column=4, **pad)
+        ttk.Label(frm_filter, text="Max").grid(row=0, column=5, sticky="e", **pad)
+        ttk.Entry(frm_filter, textvariable=self.run_filter_max, width=10).grid(row=0, column=6, **pad)
+        ttk.Button(frm_filter, text="Apply", command=self._filter_pay_run).grid(row=0, column=7, **pad)
+        ttk.Button(frm_filter, text="Clear", command=self._clear_pay_run_filter).grid(row=0, column=8, **pad)
+
+        # Results grid: a fixed page of items refilled from the view as it scrolls
+        frm_grid = ttk.Frame(tab)
+        frm_grid.grid(row=2, column=0, sticky="nsew", **pad)
+        self.tree_run = ttk.Treeview(frm_grid, columns=DISPLAY_COLUMNS, show="headings",
+                                     height=PAYRUN_ROWS, selectmode="browse")
+        for col in DISPLAY_COLUMNS:
+            self.tree_run.heading(col, text=col, command=lambda c=col: self._sort_pay_run(c))
+            self.tree_run.column(col, width=110 if col == "employee_id" else 95,
+                                 anchor=("w" if col == "employee_id" else "e"), stretch=False)
+        self.tree_run.grid(row=0, column=0, sticky="nsew")
+        self.scr_run = ttk.Scrollbar(frm_grid, orient="vertical", command=self._scroll_pay_run)
+        self.scr_run.grid(row=0, column=1, sticky="ns")
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree_run.bind(sequence, self._wheel_pay_run)
+        self.tree_run.bind("<Prior>", lambda e: self._scroll_pay_run("scroll", "-1", "pages"))
+        self.tree_run.bind("<Next>", lambda e: self._scroll_pay_run("scroll", "1", "pages"))
+
+        self.lbl_run_totals = ttk.Label(tab, text="Totals: -", justify="left")
+        self.lbl_run_totals.grid(row=3, column=0, sticky="w", **pad)
+
     def _toggle_fields(self):
         hourly = self.pay_type.get() == "hourly"
         for child in self.frm_hourly.winfo_children():
@@ -232,121 +384,256 @@ class PayrollGUI(tk.Tk):
             self.entry_federal_rate.configure(state=("normal" if flat else "disabled"))
         except tk.TclError:
             pass
+        # W-4 fields drive the percentage method ('aggregate' applies it to regular + supplemental)
+        w4 = method in ("irs_percentage", "aggregate")
         for ctrl in [self.cbo_status, self.entry_periods, self.chk_step2, self.entry_w4s3, self.entry_w4s4a, self.entry_w4s4b, self.entry_w4s4c]:
             try:
-                ctrl.configure(state=("disabled" if flat else "normal"))
+                ctrl.configure(state=("normal" if w4 else "disabled"))
+            except tk.TclError:
+                pass
+        for ctrl, enabled in ((self.entry_ytd_supp, method in SUPPLEMENTAL_METHODS), (self.entry_regular, method == "aggregate")):
+            try:
+                ctrl.configure(state=("normal" if enabled else "disabled"))
             except tk.TclError:
                 pass
 
     def _calculate(self):
         try:
-            pay_type = self.pay_type.get()
-            year = int(self.year.get() or 2025)
-            ytd = float(self.ytd_wages.get() or 0.0)
-            method = self.withholding_method.get()
-            fed_rate = _parse_rate(self.federal_rate.get()) if (self.federal_rate.get() and method == "flat") else None
-            st_rate = _parse_rate(self.state_rate.get()) if self.state_rate.get() else None
-
-            if pay_type == "hourly":
-                rate = float(self.hourly_rate.get())
-                hrs = float(self.hours.get()) if self.hours.get() else 0.0
-                ot_hrs = float(self.overtime_hours.get()) if self.overtime_hours.get() else 0.0
-                ot_mult = float(self.overtime_multiplier.get()) if self.overtime_multiplier.get() else 1.5
-                dt_hrs = float(self.doubletime_hours.get()) if self.doubletime_hours.get() else 0.0
-                dt_mult = float(self.doubletime_multiplier.get()) if self.doubletime_multiplier.get() else 2.0
-                daily = self.daily_hours.get().strip() if self.daily_hours.get() else None
-                use_ca = bool(self.use_ca_daily_ot.get())
-                salary = None
-            else:
-                rate = None
-                hrs = None
-                ot_hrs = 0.0
-                ot_mult = 1.5
-                dt_hrs = 0.0
-                dt_mult = 2.0
-                daily = None
-                use_ca = False
-                salary = float(self.salary.get())
-
-            config = PayrollConfig(
-                year=year,
-                ytd_wages=ytd,
-                withholding_method=method,
-                federal_rate=fed_rate,
-                state_rate=st_rate,
-                filing_status=self.filing_status.get(),
-                pay_periods_per_year=int(self.pay_periods.get() or 26),
-                w4_step2=bool(self.w4_step2.get()),
-                w4_step3_dependents_credit=float(self.w4_step3.get() or 0.0),
-                w4_step4a_other_income=float(self.w4_step4a.get() or 0.0),
-                w4_step4b_deductions=float(self.w4_step4b.get() or 0.0),
-                w4_step4c_extra_withholding=float(self.w4_step4c.get() or 0.0),
-                pretax_401k=float(self.pretax_401k.get() or 0.0),
-                pretax_hsa=float(self.pretax_hsa.get() or 0.0),
-                pretax_section125=float(self.pretax_section125.get() or 0.0),
-            )
-
-            result = compute_paycheck(
-                pay_type,
-                hourly_rate=rate,
-                hours=hrs,
-                overtime_hours=ot_hrs,
-                overtime_multiplier=ot_mult,
-                doubletime_hours=dt_hrs,
-                doubletime_multiplier=dt_mult,
-                daily_hours=daily,
-                use_ca_daily_ot=use_ca,
-                salary=salary,
-                config=config,
-            )
-
-            self.lbl_gross.configure(text=f"Gross: ${result['gross']:.2f}")
-            self.lbl_tax_fica.configure(text=f"FICA Taxable: ${result['taxable_wages_fica']:.2f}")
-            self.lbl_tax_fit.configure(text=f"FIT Taxable: ${result['taxable_wages_fit']:.2f}")
-            self.lbl_ss.configure(text=f"Social Security: ${result['social_security']:.2f}")
-            self.lbl_medi.configure(text=f"Medicare: ${result['medicare']:.2f}")
-            if method == "irs_percentage":
-                self.lbl_fit.configure(text=f"Federal Income Tax (IRS %): ${result['federal_income_tax']:.2f}")
-            else:
-                self.lbl_fit.configure(text=f"Federal Income Tax: ${result['federal_income_tax']:.2f}" if fed_rate else "Federal Income Tax: -")
-            self.lbl_sit.configure(text=f"State Income Tax: ${result['state_income_tax']:.2f}" if st_rate else "State Income Tax: -")
-            self.lbl_total.configure(text=f"Total Deductions: ${result['total_deductions']:.2f}")
-            self.lbl_net.configure(text=f"Net Pay: ${result['net']:.2f}")
-            self.lbl_erss.configure(text=f"Employer Social Security: ${result['employer_social_security']:.2f}")
-            self.lbl_ermedi.configure(text=f"Employer Medicare: ${result['employer_medicare']:.2f}")
-            self.lbl_ertotal.configure(text=f"Employer Total Payroll Taxes: ${result['employer_total']:.2f}")
-            
-            # Compare vs previous
-            if self._last_result is not None:
-                dnet = result['net'] - self._last_result.get('net', 0)
-                sign = "+" if dnet >= 0 else ""
-                self.lbl_delta.configure(text=f"Compared to previous: Net {sign}{dnet:.2f}")
-            self._last_result = result
-
-            # Explanation
-            if self.show_explain.get():
-                from payroll_calculator import build_explanation_text
-                explain = build_explanation_text(
-                    pay_type,
-                    hourly_rate=rate,
-                    hours=hrs,
-                    overtime_hours=ot_hrs,
-                    overtime_multiplier=ot_mult,
-                    doubletime_hours=dt_hrs,
-                    doubletime_multiplier=dt_mult,
-                    daily_hours=daily,
-                    use_ca_daily_ot=use_ca,
-                    salary=salary,
-                    config=config,
-                )
-                self.txt_explain.delete("1.0", tk.END)
-                self.txt_explain.insert(tk.END, explain)
-
-            # Save settings
-            self._save_settings()
-
+            request = self._read_request()
         except Exception as e:
             self.lbl_error.configure(text=str(e))
+            return
+        self.lbl_error.configure(text="")
+        self.lbl_status.configure(text="Calculating...")
+        self._worker.submit("calculate", _run_calculation, request,
+                            on_done=self._show_result, on_error=self._show_error, delay=CALC_DEBOUNCE_S)
+
+    def _read_request(self):
+        """Read the form on the UI thread into ``(pay_type, earnings kwargs, config, trace)`` for the worker."""
+        pay_type = self.pay_type.get()
+        if pay_type == "hourly":
+            rate = float(self.hourly_rate.get())
+            hrs = float(self.hours.get()) if self.hours.get() else 0.0
+            ot_hrs = float(self.overtime_hours.get()) if self.overtime_hours.get() else 0.0
+            ot_mult = float(self.overtime_multiplier.get()) if self.overtime_multiplier.get() else 1.5
+            dt_hrs = float(self.doubletime_hours.get()) if self.doubletime_hours.get() else 0.0
+            dt_mult = float(self.doubletime_multiplier.get()) if self.doubletime_multiplier.get() else 2.0
+            daily = self.daily_hours.get().strip() if self.daily_hours.get() else None
+            use_ca = bool(self.use_ca_daily_ot.get())
+            salary = None
+        else:
+            rate = None
+            hrs = None
+            ot_hrs = 0.0
+            ot_mult = 1.5
+            dt_hrs = 0.0
+            dt_mult = 2.0
+            daily = None
+            use_ca = False
+            salary = float(self.salary.get())
+
+        kwargs = dict(
+            hourly_rate=rate,
+            hours=hrs,
+            overtime_hours=ot_hrs,
+            overtime_multiplier=ot_mult,
+            doubletime_hours=dt_hrs,
+            doubletime_multiplier=dt_mult,
+            daily_hours=daily,
+            use_ca_daily_ot=use_ca,
+            salary=salary,
+        )
+        return pay_type, kwargs, self._read_config(), bool(self.show_explain.get())
+
+    def _read_config(self):
+        """The form's ``PayrollConfig`` (also the defaults for fields a pay-run file leaves blank)."""
+        method = self.withholding_method.get()
+        fed_rate = parse_rate(self.federal_rate.get()) if (self.federal_rate.get() and method == "flat") else None
+        st_rate = parse_rate(self.state_rate.get()) if self.state_rate.get() else None
+        return PayrollConfig(
+            year=int(self.year.get() or 2025),
+            ytd_wages=float(self.ytd_wages.get() or 0.0),
+            ytd_supplemental_wages=float(self.ytd_supplemental_wages.get() or 0.0),
+            regular_wages=float(self.regular_wages.get() or 0.0),
+            withholding_method=method,
+            federal_rate=fed_rate,
+            state_rate=st_rate,
+            filing_status=self.filing_status.get(),
+            pay_periods_per_year=int(self.pay_periods.get() or 26),
+            w4_step2=bool(self.w4_step2.get()),
+            w4_step3_dependents_credit=float(self.w4_step3.get() or 0.0),
+            w4_step4a_other_income=float(self.w4_step4a.get() or 0.0),
+            w4_step4b_deductions=float(self.w4_step4b.get() or 0.0),
+            w4_step4c_extra_withholding=float(self.w4_step4c.get() or 0.0),
+            pretax_401k=float(self.pretax_401k.get() or 0.0),
+            pretax_hsa=float(self.pretax_hsa.get() or 0.0),
+            pretax_section125=float(self.pretax_section125.get() or 0.0),
+        )
+
+    def _show_result(self, outcome):
+        (_, _, config, _), result, explanation = outcome
+        method = config.withholding_method
+        self.lbl_status.configure(text="")
+        self.lbl_gross.configure(text=f"Gross: ${result['gross']:.2f}")
+        self.lbl_tax_fica.configure(text=f"FICA Taxable: ${result['taxable_wages_fica']:.2f}")
+        self.lbl_tax_fit.configure(text=f"FIT Taxable: ${result['taxable_wages_fit']:.2f}")
+        self.lbl_ss.configure(text=f"Social Security: ${result['social_security']:.2f}")
+        self.lbl_medi.configure(text=f"Medicare: ${result['medicare']:.2f}")
+        if method == "irs_percentage":
+            self.lbl_fit.configure(text=f"Federal Income Tax (IRS %): ${result['federal_income_tax']:.2f}")
+        elif method in SUPPLEMENTAL_METHODS:
+            self.lbl_fit.configure(text=f"Federal Income Tax ({method}): ${result['federal_income_tax']:.2f}")
+        else:
+            self.lbl_fit.configure(text=f"Federal Income Tax: ${result['federal_income_tax']:.2f}" if config.federal_rate else "Federal Income Tax: -")
+        self.lbl_sit.configure(text=f"State Income Tax: ${result['state_income_tax']:.2f}" if config.state_rate else "State Income Tax: -")
+        self.lbl_total.configure(text=f"Total Deductions: ${result['total_deductions']:.2f}")
+        self.lbl_net.configure(text=f"Net Pay: ${result['net']:.2f}")
+        self.lbl_erss.configure(text=f"Employer Social Security: ${result['employer_social_security']:.2f}")
+        self.lbl_ermedi.configure(text=f"Employer Medicare: ${result['employer_medicare']:.2f}")
+        self.lbl_ertotal.configure(text=f"Employer Total Payroll Taxes: ${result['employer_total']:.2f}")
+
+        # Compare vs previous
+        if self._last_result is not None:
+            dnet = result['net'] - self._last_result.get('net', 0)
+            sign = "+" if dnet >= 0 else ""
+            self.lbl_delta.configure(text=f"Compared to previous: Net {sign}{dnet:.2f}")
+        self._last_result = result
+
+        # Explanation (rendered by the worker from the trace of the same calculation)
+        if explanation is not None:
+            self.txt_explain.delete("1.0", tk.END)
+            self.txt_explain.insert(tk.END, explanation)
+
+        self._save_settings()
+
+    def _show_error(self, error):
+        self.lbl_status.configure(text="")
+        self.lbl_error.configure(text=str(error))
+
+    def _cancel_calculation(self):
+        if self._worker.cancel("calculate"):
+            self.lbl_status.configure(text="Cancelled")
+
+    def _poll_worker(self):
+        self._worker.poll()
+        self.after(POLL_MS, self._poll_worker)
+
+    def _on_close(self):
+        self._worker.shutdown()
+        # A debounced settings write still waiting was dropped by shutdown; write the form now
+        try:
+            self._settings.save(self._form_data())
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Settings", f"Settings were not saved: {e}")
+        self.destroy()
+
+    def _open_pay_run(self):
+        path = filedialog.askopenfilename(filetypes=[("Employee files", "*.csv *.jsonl *.json"), ("All Files", "*.*")])
+        if not path:
+            return
+        try:
+            defaults = self._read_config()
+        except Exception as e:
+            self.lbl_run_status.configure(text=str(e))
+            return
+        self.lbl_run_status.configure(text=f"Computing {Path(path).name}...")
+        self._worker.submit("payrun", _run_pay_run, path, defaults, self.pay_type.get(),
+                            on_done=self._show_pay_run, on_error=self._pay_run_error)
+
+    def _cancel_pay_run(self):
+        if self._worker.cancel("payrun"):
+            self.lbl_run_status.configure(text="Cancelled")
+
+    def _pay_run_error(self, error):
+        self.lbl_run_status.configure(text=f"Error: {error}")
+
+    def _show_pay_run(self, view):
+        self._payrun = view
+        for col in DISPLAY_COLUMNS:
+            self.tree_run.heading(col, text=col)
+        self.lbl_run_status.configure(text=f"{view.total_rows:,} paychecks")
+        self._viewport.resize(len(view))
+        self._viewport.scroll_to(0)
+        self._refresh_pay_run()
+
+    def _sort_pay_run(self, column):
+        if self._payrun is None:
+            return
+        self._payrun.sort(column)
+        for col in DISPLAY_COLUMNS:
+            arrow = (" \u25bc" if self._payrun.descending else " \u25b2") if col == column else ""
+            self.tree_run.heading(col, text=col + arrow)
+        self._viewport.scroll_to(0)
+        self._refresh_pay_run()
+
+    def _filter_pay_run(self):
+        if self._payrun is None:
+            return
+        try:
+            minimum = float(self.run_filter_min.get()) if self.run_filter_min.get().strip() else None
+            maximum = float(self.run_filter_max.get()) if self.run_filter_max.get().strip() else None
+            self._payrun.filter(self.run_filter_text.get().strip(), self.run_filter_column.get(), minimum, maximum)
+        except ValueError as e:
+            self.lbl_run_status.configure(text=f"Filter: {e}")
+            return
+        self._viewport.resize(len(self._payrun))
+        self._viewport.scroll_to(0)
+        self._refresh_pay_run()
+
+    def _clear_pay_run_filter(self):
+        self.run_filter_text.set("")
+        self.run_filter_min.set("")
+        self.run_filter_max.set("")
+        self._filter_pay_run()
+
+    def _scroll_pay_run(self, *args):
+        if self._payrun is not None and self._viewport.command(*args):
+            self._refresh_pay_run(totals=False)
+
+    def _wheel_pay_run(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self._scroll_pay_run("scroll", "-3", "units")
+        else:
+            self._scroll_pay_run("scroll", "3", "units")
+        return "break"
+
+    def _refresh_pay_run(self, totals=True):
+        """Refill the grid's fixed items from the viewport's slice of the view."""
+        view, port = self._payrun, self._viewport
+        rows = view.rows(port.offset, port.stop)
+        items = self.tree_run.get_children()
+        for i, values in enumerate(rows):
+            iid = f"row{i}"
+            if i < len(items):
+                self.tree_run.item(iid, values=values)
+            else:
+                self.tree_run.insert("", "end", iid=iid, values=values)
+        if len(items) > len(rows):
+            self.tree_run.delete(*items[len(rows):])
+        self.scr_run.set(*port.fractions())
+        if totals:
+            sums = view.totals()
+            shown = f"{len(view):,} of {view.total_rows:,} paychecks"
+            self.lbl_run_totals.configure(text=(
+                f"Totals ({shown}): gross ${sums['gross']:,.2f}   net ${sums['net']:,.2f}   "
+                f"FIT ${sums['federal_income_tax']:,.2f}   SIT ${sums['state_income_tax']:,.2f}\n"
+                f"Social Security ${sums['social_security']:,.2f}   Medicare ${sums['medicare']:,.2f}   "
+                f"employer taxes ${sums['employer_total']:,.2f}"
+            ))
+
+    def _export_pay_run(self):
+        if self._payrun is None:
+            messagebox.showinfo("Export View CSV", "No pay run yet. Open an employee file first.")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV Files", "*.csv")])
+        if not path:
+            return
+        self.lbl_run_status.configure(text="Exporting...")
+        self._worker.submit("payrun_export", _write_payrun_csv, path, self._payrun,
+                            on_done=self._export_pay_run_done, on_error=self._pay_run_error)
+
+    def _export_pay_run_done(self, path):
+        self.lbl_run_status.configure(text=f"Saved: {path}")
 
     def _show_ot_rules(self):
         text = (
@@ -392,18 +679,13 @@ class PayrollGUI(tk.Tk):
         path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV Files","*.csv")])
         if not path:
             return
-        import csv
-        with open(path, "w", newline="") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=[
-                    "gross","taxable_wages_fica","taxable_wages_fit","social_security","medicare",
-                    "federal_income_tax","state_income_tax","total_deductions","net",
-                    "employer_social_security","employer_medicare","employer_total"
-                ],
-            )
-            writer.writeheader()
-            writer.writerow(self._last_result)
+        self.lbl_status.configure(text="Exporting...")
+        # One channel per target file: an export to another path must not supersede this one
+        self._worker.submit(f"export:{path}", _write_result_csv, path, self._last_result,
+                            on_done=self._export_done, on_error=self._show_error)
+
+    def _export_done(self, path):
+        self.lbl_status.configure(text="")
         messagebox.showinfo("Export CSV", f"Saved: {path}")
 
     def _reset(self):
@@ -419,6 +701,7 @@ class PayrollGUI(tk.Tk):
         self.salary.set("")
         self.federal_rate.set("")
         self.state_rate.set("")
+        self.regular_wages.set("0")
         self.w4_step2.set(False)
         self.w4_step3.set("0")
         self.w4_step4a.set("0")
@@ -430,74 +713,141 @@ class PayrollGUI(tk.Tk):
         self.txt_explain.delete("1.0", tk.END)
         self.lbl_error.configure(text="")
 
+    def _form_data(self):
+        """The form as a JSON-ready dict (settings file and profiles)."""
+        return {
+            "pay_type": self.pay_type.get(),
+            "hourly_rate": self.hourly_rate.get(),
+            "hours": self.hours.get(),
+            "overtime_hours": self.overtime_hours.get(),
+            "overtime_multiplier": self.overtime_multiplier.get(),
+            "doubletime_hours": self.doubletime_hours.get(),
+            "doubletime_multiplier": self.doubletime_multiplier.get(),
+            "daily_hours": self.daily_hours.get(),
+            "use_ca_daily_ot": bool(self.use_ca_daily_ot.get()),
+            "salary": self.salary.get(),
+            "year": self.year.get(),
+            "ytd_wages": self.ytd_wages.get(),
+            "ytd_supplemental_wages": self.ytd_supplemental_wages.get(),
+            "regular_wages": self.regular_wages.get(),
+            "withholding_method": self.withholding_method.get(),
+            "federal_rate": self.federal_rate.get(),
+            "state_rate": self.state_rate.get(),
+            "filing_status": self.filing_status.get(),
+            "pay_periods": self.pay_periods.get(),
+            "w4_step2": bool(self.w4_step2.get()),
+            "w4_step3": self.w4_step3.get(),
+            "w4_step4a": self.w4_step4a.get(),
+            "w4_step4b": self.w4_step4b.get(),
+            "w4_step4c": self.w4_step4c.get(),
+            "pretax_401k": self.pretax_401k.get(),
+            "pretax_hsa": self.pretax_hsa.get(),
+            "pretax_section125": self.pretax_section125.get(),
+            "show_explain": bool(self.show_explain.get()),
+            "profile": self.profile_name.get(),
+        }
+
+    def _apply_form_data(self, data):
+        self.pay_type.set(data.get("pay_type", self.pay_type.get()))
+        self.hourly_rate.set(data.get("hourly_rate", ""))
+        self.hours.set(data.get("hours", ""))
+        self.overtime_hours.set(data.get("overtime_hours", "0"))
+        self.overtime_multiplier.set(data.get("overtime_multiplier", "1.5"))
+        self.doubletime_hours.set(data.get("doubletime_hours", "0"))
+        self.doubletime_multiplier.set(data.get("doubletime_multiplier", "2.0"))
+        self.daily_hours.set(data.get("daily_hours", ""))
+        self.use_ca_daily_ot.set(bool(data.get("use_ca_daily_ot", False)))
+        self.salary.set(data.get("salary", ""))
+        self.year.set(data.get("year", self.year.get()))
+        self.ytd_wages.set(data.get("ytd_wages", "0"))
+        self.ytd_supplemental_wages.set(data.get("ytd_supplemental_wages", "0"))
+        self.regular_wages.set(data.get("regular_wages", "0"))
+        self.withholding_method.set(data.get("withholding_method", self.withholding_method.get()))
+        self.federal_rate.set(data.get("federal_rate", ""))
+        self.state_rate.set(data.get("state_rate", ""))
+        self.filing_status.set(data.get("filing_status", self.filing_status.get()))
+        self.pay_periods.set(data.get("pay_periods", self.pay_periods.get()))
+        self.w4_step2.set(bool(data.get("w4_step2", False)))
+        self.w4_step3.set(data.get("w4_step3", "0"))
+        self.w4_step4a.set(data.get("w4_step4a", "0"))
+        self.w4_step4b.set(data.get("w4_step4b", "0"))
+        self.w4_step4c.set(data.get("w4_step4c", "0"))
+        self.pretax_401k.set(data.get("pretax_401k", "0"))
+        self.pretax_hsa.set(data.get("pretax_hsa", "0"))
+        self.pretax_section125.set(data.get("pretax_section125", "0"))
+        self.show_explain.set(bool(data.get("show_explain", True)))
+        self.profile_name.set(data.get("profile", ""))
+
     def _save_settings(self):
-        try:
-            data = {
-                "pay_type": self.pay_type.get(),
-                "hourly_rate": self.hourly_rate.get(),
-                "hours": self.hours.get(),
-                "overtime_hours": self.overtime_hours.get(),
-                "overtime_multiplier": self.overtime_multiplier.get(),
-                "doubletime_hours": self.doubletime_hours.get(),
-                "doubletime_multiplier": self.doubletime_multiplier.get(),
-                "daily_hours": self.daily_hours.get(),
-                "use_ca_daily_ot": bool(self.use_ca_daily_ot.get()),
-                "salary": self.salary.get(),
-                "year": self.year.get(),
-                "ytd_wages": self.ytd_wages.get(),
-                "withholding_method": self.withholding_method.get(),
-                "federal_rate": self.federal_rate.get(),
-                "state_rate": self.state_rate.get(),
-                "filing_status": self.filing_status.get(),
-                "pay_periods": self.pay_periods.get(),
-                "w4_step2": bool(self.w4_step2.get()),
-                "w4_step3": self.w4_step3.get(),
-                "w4_step4a": self.w4_step4a.get(),
-                "w4_step4b": self.w4_step4b.get(),
-                "w4_step4c": self.w4_step4c.get(),
-                "pretax_401k": self.pretax_401k.get(),
-                "pretax_hsa": self.pretax_hsa.get(),
-                "pretax_section125": self.pretax_section125.get(),
-                "show_explain": bool(self.show_explain.get()),
-            }
-            self._settings_file.write_text(json.dumps(data, indent=2))
-        except Exception:
-            pass
+        """Queue a debounced settings write on the worker if the form changed since the last one."""
+        data = self._form_data()
+        if data == self._saved_form:
+            return
+        self._saved_form = data
+        self._worker.submit("settings", _write_settings, self._settings, data,
+                            on_error=self._settings_error, delay=SETTINGS_DEBOUNCE_S)
 
     def _load_settings(self):
         try:
-            if not self._settings_file.exists():
-                return
-            data = json.loads(self._settings_file.read_text())
-            self.pay_type.set(data.get("pay_type", self.pay_type.get()))
-            self.hourly_rate.set(data.get("hourly_rate", ""))
-            self.hours.set(data.get("hours", ""))
-            self.overtime_hours.set(data.get("overtime_hours", "0"))
-            self.overtime_multiplier.set(data.get("overtime_multiplier", "1.5"))
-            self.doubletime_hours.set(data.get("doubletime_hours", "0"))
-            self.doubletime_multiplier.set(data.get("doubletime_multiplier", "2.0"))
-            self.daily_hours.set(data.get("daily_hours", ""))
-            self.use_ca_daily_ot.set(bool(data.get("use_ca_daily_ot", False)))
-            self.salary.set(data.get("salary", ""))
-            self.year.set(data.get("year", self.year.get()))
-            self.ytd_wages.set(data.get("ytd_wages", "0"))
-            self.withholding_method.set(data.get("withholding_method", self.withholding_method.get()))
-            self.federal_rate.set(data.get("federal_rate", ""))
-            self.state_rate.set(data.get("state_rate", ""))
-            self.filing_status.set(data.get("filing_status", self.filing_status.get()))
-            self.pay_periods.set(data.get("pay_periods", self.pay_periods.get()))
-            self.w4_step2.set(bool(data.get("w4_step2", False)))
-            self.w4_step3.set(data.get("w4_step3", "0"))
-            self.w4_step4a.set(data.get("w4_step4a", "0"))
-            self.w4_step4b.set(data.get("w4_step4b", "0"))
-            self.w4_step4c.set(data.get("w4_step4c", "0"))
-            self.pretax_401k.set(data.get("pretax_401k", "0"))
-            self.pretax_hsa.set(data.get("pretax_hsa", "0"))
-            self.pretax_section125.set(data.get("pretax_section125", "0"))
-            self.show_explain.set(bool(data.get("show_explain", True)))
-        except Exception:
-            pass
+            data = self._settings.load()
+        except (OSError, ValueError) as e:
+            self._settings_error(e)
+            return
+        self._apply_form_data(data)
+        self._saved_form = self._form_data()
+
+    def _settings_error(self, error):
+        self._saved_form = None  # retry on the next save
+        self.lbl_error.configure(text=f"Settings: {error}")
+
+    def _refresh_profiles(self):
+        try:
+            self.cbo_profile.configure(values=self._settings.profile_names())
+        except OSError as e:
+            self._settings_error(e)
+
+    def _load_profile(self):
+        name = self.profile_name.get().strip()
+        if not name:
+            return
+        try:
+            data = self._settings.load_profile(name)
+        except (OSError, ValueError) as e:
+            self._settings_error(e)
+            return
+        self._apply_form_data({**data, "profile": name, "show_explain": self.show_explain.get()})
+        self._toggle_fields()
+        self.lbl_error.configure(text="")
+        self.lbl_status.configure(text=f"Loaded profile {name}")
+        self._save_settings()
 
+    def _save_profile(self):
+        name = self.profile_name.get().strip()
+        if not name:
+            self.lbl_error.configure(text="Type a profile name to save the form under.")
+            return
+        data = {k: v for k, v in self._form_data().items() if k not in PROFILE_EXCLUDE}
+        # One channel per profile: saving another profile must not supersede this write
+        self._worker.submit(f"profile:{name}", _write_profile, self._settings, name, data,
+                            on_done=self._profile_saved, on_error=self._settings_error)
+
+    def _profile_saved(self, name):
+        self.lbl_status.configure(text=f"Saved profile {name}")
+        self._refresh_profiles()
+        self._save_settings()
+
+    def _delete_profile(self):
+        name = self.profile_name.get().strip()
+        if not name or not messagebox.askyesno("Delete Profile", f"Delete saved profile {name!r}?"):
+            return
+        try:
+            self._settings.delete_profile(name)
+        except (OSError, ValueError) as e:
+            self._settings_error(e)
+            return
+        self.profile_name.set("")
+        self._refresh_profiles()
+        self._save_settings()
 
 def main():
     app = PayrollGUI()
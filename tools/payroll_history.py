@@ -0,0 +1,203 @@
+"""Append-only pay history store (SQLite).
+
+Every paycheck is stored as one row: employee, pay period end date, pay date
+(``NULL`` = paid on the period end), tax year, the input record it was computed from (JSON, as in ``payroll_pipeline``) and one REAL
+column per result field. Rows are never updated or deleted (triggers reject it);
+retro corrections are appended as ``adjustment`` rows holding the deltas and the
+corrected record, dated to the period they correct and paid on their own pay date, so sums over an employee's rows are always the corrected YTD
+totals. Per-period reads fold a period's adjustments into its paycheck: the
+result is the sum of its rows and the record is the latest one, so a second
+retro starts from the already-corrected period.
+
+Indexes cover lookups by employee (and year), by pay period and by year, and the
+database is opened in WAL mode with memory-mapped I/O so aggregate report scans
+read pages straight from the OS cache.
+
+    store = PayHistoryStore("payroll.db")
+    store.append("E1", date(2025, 1, 10), record, result)
+    store.ytd_fica_wages("E1", 2025)
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from payroll_results import RESULT_FIELDS, PaycheckResult
+
+
+# Bytes of the database file SQLite may memory-map for reads
+MMAP_SIZE = 256 * 1024 * 1024
+KINDS = ("paycheck", "adjustment")
+
+_COLUMNS = ", ".join(f"{name} REAL NOT NULL" for name in RESULT_FIELDS)
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS paychecks (
+    id INTEGER PRIMARY KEY,
+    employee_id TEXT NOT NULL,
+    period_end TEXT NOT NULL,
+    tax_year INTEGER NOT NULL,
+    pay_date TEXT,
+    kind TEXT NOT NULL DEFAULT 'paycheck',
+    reason TEXT,
+    record TEXT NOT NULL,
+    {_COLUMNS}
+);
+CREATE INDEX IF NOT EXISTS paychecks_employee ON paychecks (employee_id, tax_year, period_end);
+CREATE INDEX IF NOT EXISTS paychecks_period ON paychecks (period_end);
+CREATE INDEX IF NOT EXISTS paychecks_year ON paychecks (tax_year);
+CREATE TRIGGER IF NOT EXISTS paychecks_no_update BEFORE UPDATE ON paychecks
+    BEGIN SELECT RAISE(ABORT, 'pay history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS paychecks_no_delete BEFORE DELETE ON paychecks
+    BEGIN SELECT RAISE(ABORT, 'pay history is append-only'); END;
+"""
+_INSERT = (
+    f"INSERT INTO paychecks (employee_id, period_end, pay_date, tax_year, kind, reason, record, "
+    f"{', '.join(RESULT_FIELDS)}) VALUES ({', '.join('?' * (7 + len(RESULT_FIELDS)))})"
+)
+_SUMS = ", ".join(f"ROUND(COALESCE(SUM({name}), 0), 2)" for name in RESULT_FIELDS)
+# Adjustment deltas and folded sums keep 4 places: money is exact at 2 and the
+# effective tax rate is stored to 4
+DELTA_PLACES = 4
+# One row per (employee, period) with its adjustments folded in. SQLite takes the bare
+# ``record`` column from the row holding MAX(id), i.e. the latest correction.
+_FOLDED = ", ".join(f"ROUND(SUM({name}), {DELTA_PLACES})" for name in RESULT_FIELDS)
+_CURRENT = f"SELECT employee_id, period_end, MAX(id), record, {_FOLDED} FROM paychecks"
+_CURRENT_GROUP = " GROUP BY employee_id, period_end ORDER BY employee_id, period_end"
+
+
+def _row(employee_id: str, period_end: date, record: Mapping[str, Any], values: Iterable[float],
+         kind: str = "paycheck", reason: Optional[str] = None, tax_year: Optional[int] = None,
+         pay_date: Optional[date] = None) -> Tuple[Any, ...]:
+    year = tax_year if tax_year is not None else int(float(record.get("year") or period_end.year))
+    return (str(employee_id), period_end.isoformat(), pay_date.isoformat() if pay_date else None, year, kind, reason,
+            json.dumps(record, sort_keys=True), *values)
+
+
+class PayHistoryStore:
+    """Append-only paycheck history in one SQLite file (``":memory:"`` for a throwaway store)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        self.conn.executescript(_SCHEMA)
+        # Stores created before pay dates were kept get the column (NULL: paid on the period end)
+        if "pay_date" not in {row[1] for row in self.conn.execute("PRAGMA table_info(paychecks)")}:
+            self.conn.execute("ALTER TABLE paychecks ADD COLUMN pay_date TEXT")
+
+    # Writing
+
+    def append(self, employee_id: str, period_end: date, record: Mapping[str, Any], result: PaycheckResult,
+               pay_date: Optional[date] = None) -> int:
+        """Store one computed paycheck (paid on ``pay_date``, default the period end) and return its row id."""
+        with self.conn:
+            cur = self.conn.execute(_INSERT, _row(employee_id, period_end, record, result.values_tuple(), pay_date=pay_date))
+        return cur.lastrowid
+
+    def append_periods(self, periods: Iterable[Any]) -> int:
+        """Store many ``payroll_retro.PayPeriod``-like entries in one transaction; returns the count."""
+        rows = (_row(p.employee_id, p.period_end, p.record, p.result.values_tuple()) for p in periods)
+        with self.conn:
+            return self.conn.executemany(_INSERT, rows).rowcount
+
+    def append_adjustments(self, lines: Iterable[Any], pay_date: Optional[date] = None) -> int:
+        """
+        Store ``payroll_retro.RetroLine`` corrections as adjustment rows (corrected minus
+        stored values), dated to the period they correct and paid on ``pay_date``
+        (default today). Returns the count.
+        """
+        paid = pay_date or date.today()
+        rows = (
+            _row(line.employee_id, line.period_end, line.record,
+                 (round(c - o, DELTA_PLACES) for c, o in zip(line.corrected.values_tuple(), line.original.values_tuple())),
+                 kind="adjustment", reason=line.reason, pay_date=paid)
+            for line in lines
+        )
+        with self.conn:
+            return self.conn.executemany(_INSERT, rows).rowcount
+
+    # Indexed lookups
+
+    def ytd_fica_wages(self, employee_id: str, year: int, before: Optional[date] = None) -> float:
+        """FICA wages paid to ``employee_id`` in ``year`` (only periods ending before ``before``, if given)."""
+        sql = "SELECT COALESCE(SUM(taxable_wages_fica), 0) FROM paychecks WHERE employee_id = ? AND tax_year = ?"
+        args: List[Any] = [str(employee_id), year]
+        if before is not None:
+            sql += " AND period_end < ?"
+            args.append(before.isoformat())
+        (total,) = self.conn.execute(sql, args).fetchone()
+        return round(total, 2)
+
+    def ytd_totals(self, employee_id: str, year: int) -> Dict[str, float]:
+        """Sum of every result field for one employee and year, adjustments included."""
+        row = self.conn.execute(
+            f"SELECT {_SUMS} FROM paychecks WHERE employee_id = ? AND tax_year = ?", (str(employee_id), year)
+        ).fetchone()
+        return dict(zip(RESULT_FIELDS, row))
+
+    def _current(self, where: str, args: List[Any]) -> Iterator[Any]:
+        from payroll_retro import PayPeriod
+
+        for employee_id, period_end, _, record, *values in self.conn.execute(_CURRENT + where + _CURRENT_GROUP, args):
+            yield PayPeriod(employee_id, date.fromisoformat(period_end), json.loads(record), PaycheckResult(*values))
+
+    def employee_history(self, employee_id: str, year: Optional[int] = None) -> Iterator[Any]:
+        """An employee's paychecks as corrected so far, as ``PayPeriod`` entries in period order."""
+        where, args = " WHERE employee_id = ?", [str(employee_id)]
+        if year is not None:
+            where += " AND tax_year = ?"
+            args.append(year)
+        return self._current(where, args)
+
+    def history(self, year: Optional[int] = None) -> Iterator[Any]:
+        """Every paycheck as corrected so far (optionally one year), by employee then period."""
+        if year is None:
+            return self._current("", [])
+        return self._current(" WHERE tax_year = ?", [year])
+
+    def period_rows(self, period_end: date) -> List[Tuple[str, PaycheckResult]]:
+        """``(employee_id, result)`` for every paycheck of one pay period, adjustments folded in."""
+        return [(p.employee_id, p.result) for p in self._current(" WHERE period_end = ?", [period_end.isoformat()])]
+
+    def paid_rows(self, year: Optional[int] = None) -> Iterator[Tuple[date, str, PaycheckResult]]:
+        """
+        ``(pay_date, kind, result)`` for every stored row in pay date order (optionally
+        paid in one calendar year). Adjustments are their own rows, paid when the
+        correction was; rows without a pay date are dated by their period end.
+        """
+        paid = "COALESCE(pay_date, period_end)"
+        sql = f"SELECT {paid}, kind, {', '.join(RESULT_FIELDS)} FROM paychecks"
+        args: List[Any] = []
+        if year is not None:
+            sql += f" WHERE {paid} BETWEEN ? AND ?"
+            args += [f"{year}-01-01", f"{year}-12-31"]
+        for pay_date, kind, *values in self.conn.execute(sql + f" ORDER BY {paid}, id", args):
+            yield date.fromisoformat(pay_date), kind, PaycheckResult(*values)
+
+    # Aggregate reports (full scans over the memory-mapped file)
+
+    def year_totals(self, year: int) -> Dict[str, float]:
+        row = self.conn.execute(f"SELECT {_SUMS} FROM paychecks WHERE tax_year = ?", (year,)).fetchone()
+        return dict(zip(RESULT_FIELDS, row))
+
+    def employee_totals(self, year: int) -> Iterator[Tuple[str, Dict[str, float]]]:
+        """Per-employee YTD totals for ``year``, ordered by employee."""
+        rows = self.conn.execute(
+            f"SELECT employee_id, {_SUMS} FROM paychecks WHERE tax_year = ? GROUP BY employee_id ORDER BY employee_id", (year,)
+        )
+        for employee_id, *sums in rows:
+            yield employee_id, dict(zip(RESULT_FIELDS, sums))
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "PayHistoryStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,152 @@
+"""Year-to-date ledger for running an employee through consecutive pay periods.
+
+``compute_paycheck`` needs the FICA wages paid so far this year (``ytd_wages``)
+to apply the Social Security wage base and the Additional Medicare threshold.
+``EmployeeLedger`` keeps those running totals so callers do not have to thread
+them through every call; each period is an O(1) update. It also tracks YTD
+supplemental wages (bonus and commission checks), which decide when the
+mandatory supplemental withholding rate applies.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from payroll_calculator import SUPPLEMENTAL_METHODS, PayrollConfig, compute_paycheck
+from payroll_results import PaycheckResult
+from tax_params import tax_year
+
+
+# Result fields accumulated into the ledger's YTD totals
+YTD_FIELDS = (
+    "gross",
+    "taxable_wages_fica",
+    "taxable_wages_fit",
+    "social_security",
+    "medicare",
+    "federal_income_tax",
+    "state_income_tax",
+    "posttax_deductions",
+    "net",
+    "employer_social_security",
+    "employer_medicare",
+)
+
+
+@dataclass
+class EmployeeLedger:
+    """
+    Running YTD totals for one employee in one tax year.
+
+    Attributes:
+        config: W-4 and deduction settings used for every period. Its ``ytd_wages``
+            and ``ytd_supplemental_wages`` seed the amounts already paid this year
+            (e.g. from a prior employer system); afterwards the ledger supplies them.
+        employee_id: Optional identifier carried for reporting.
+        periods: Number of regular pay periods processed so far (supplemental checks excluded).
+        totals: YTD sums of the ``YTD_FIELDS`` result values.
+        supplemental_wages: FIT-taxable wages posted from supplemental-wage checks.
+        last_regular_wages: FIT-taxable wages of the latest regular check (the
+            default ``regular_wages`` for the aggregate method).
+    """
+
+    config: PayrollConfig = field(default_factory=PayrollConfig)
+    employee_id: str = ""
+    periods: int = 0
+    totals: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(YTD_FIELDS, 0.0))
+    supplemental_wages: float = 0.0
+    last_regular_wages: float = 0.0
+
+    def __post_init__(self) -> None:
+        self._seed_fica_wages = self.config.ytd_wages
+        self._seed_supplemental_wages = self.config.ytd_supplemental_wages
+
+    @property
+    def year(self) -> int:
+        return self.config.year
+
+    @property
+    def ytd_fica_wages(self) -> float:
+        """FICA wages paid this year before the next paycheck (the next ``ytd_wages``)."""
+        return round(self._seed_fica_wages + self.totals["taxable_wages_fica"], 2)
+
+    @property
+    def ytd_supplemental_wages(self) -> float:
+        """Supplemental wages paid this year before the next check."""
+        return round(self._seed_supplemental_wages + self.supplemental_wages, 2)
+
+    @property
+    def ss_wage_base_remaining(self) -> float:
+        return max(tax_year(self.year).ss_wage_base - self.ytd_fica_wages, 0.0)
+
+    @property
+    def additional_medicare_active(self) -> bool:
+        return self.ytd_fica_wages > tax_year(self.year).addl_medicare_threshold
+
+    def process(self, pay_type: str, **earnings: Any) -> PaycheckResult:
+        """
+        Compute the next paycheck with the ledger's YTD wages and post it.
+        ``earnings`` are the ``compute_paycheck`` keyword arguments other than ``config``.
+        """
+        config = replace(self.config, ytd_wages=self.ytd_fica_wages, ytd_supplemental_wages=self.ytd_supplemental_wages)
+        result = compute_paycheck(pay_type, **earnings, config=config)
+        self.post(result, supplemental=config.withholding_method in SUPPLEMENTAL_METHODS)
+        return result
+
+    def process_supplemental(self, amount: float, *, method: str = "supplemental",
+                             regular_wages: Optional[float] = None) -> PaycheckResult:
+        """
+        Pay ``amount`` (bonus, commission) as its own supplemental-wage check withheld
+        by ``method`` ('supplemental' or 'aggregate') and post it. ``regular_wages``
+        for the aggregate method defaults to the latest regular check's FIT wages.
+        """
+        if method not in SUPPLEMENTAL_METHODS:
+            raise ValueError(f"method must be one of {', '.join(SUPPLEMENTAL_METHODS)}")
+        config = replace(
+            self.config,
+            withholding_method=method,
+            ytd_wages=self.ytd_fica_wages,
+            ytd_supplemental_wages=self.ytd_supplemental_wages,
+            regular_wages=self.last_regular_wages if regular_wages is None else regular_wages,
+        )
+        result = compute_paycheck("salary", salary=amount, config=config)
+        self.post(result, supplemental=True)
+        return result
+
+    def post(self, result: Mapping[str, float], supplemental: bool = False) -> None:
+        """Add an already computed paycheck to the YTD totals."""
+        totals = self.totals
+        for key in YTD_FIELDS:
+            totals[key] += result[key]
+        if supplemental:
+            self.supplemental_wages += result["taxable_wages_fit"]
+        else:
+            self.last_regular_wages = result["taxable_wages_fit"]
+            self.periods += 1
+
+    def process_periods(self, periods: Iterable[Mapping[str, Any]]) -> List[PaycheckResult]:
+        """Process a sequence of periods, each a mapping with ``pay_type`` plus earnings arguments."""
+        results = []
+        for period in periods:
+            earnings = dict(period)
+            pay_type = earnings.pop("pay_type")
+            results.append(self.process(pay_type, **earnings))
+        return results
+
+    def project_year(self, pay_type: str, *, periods: Optional[int] = None, **earnings: Any) -> List[PaycheckResult]:
+        """
+        Run the same earnings for the rest of the year (``config.pay_periods_per_year``
+        minus periods already processed, or exactly ``periods``) and return every paycheck.
+        """
+        remaining = self.config.pay_periods_per_year - self.periods if periods is None else periods
+        return [self.process(pay_type, **earnings) for _ in range(max(remaining, 0))]
+
+    def summary(self) -> Dict[str, Any]:
+        """YTD totals rounded to cents, plus period count and cap status."""
+        out: Dict[str, Any] = {"employee_id": self.employee_id, "year": self.year, "periods": self.periods}
+        out.update({f"ytd_{key}": round(value, 2) for key, value in self.totals.items()})
+        out["ytd_supplemental_wages"] = self.ytd_supplemental_wages
+        out["ss_wage_base_remaining"] = round(self.ss_wage_base_remaining, 2)
+        out["additional_medicare_active"] = self.additional_medicare_active
+        return out
@@ -0,0 +1,352 @@
+"""Employer federal tax liability: Form 941 totals and deposit schedules.
+
+``LiabilityLedger`` streams paycheck results (dated by pay date) in one pass and
+keeps running totals per pay date in integer cents. Totals over millions of
+paychecks are therefore exact, and memory grows with the number of pay dates
+rather than paychecks. Quarter totals, monthly liabilities and deposits are
+built from those few hundred rows a year when asked for. The 941 liability of a paycheck is the federal
+income tax withheld plus both halves of Social Security and Medicare, as
+withheld (line 12 before adjustments). Fractions-of-cents differences are
+therefore already included.
+
+Deposits follow Publication 15:
+
+- monthly: a month's liability is due on the 15th of the next month;
+- semiweekly: Wed-Fri paydays are due the following Wednesday and Sat-Tue paydays
+  the following Friday. A period that spans two quarters gets one deposit per quarter;
+- $100,000 next-day rule: once the undeposited liability of a deposit period
+  reaches $100,000 on any day, it is due the next business day. A monthly
+  depositor is then semiweekly for the rest of that year and all of the next.
+
+The schedule for a year comes from the lookback period (``deposit_schedule``):
+$50,000 or less reported in the four quarters ending June 30 of the prior year
+means monthly. Due dates move past weekends but not federal holidays.
+
+    ledger = LiabilityLedger(schedule="monthly")
+    ledger.add_results(date(2025, 1, 10), compute_payroll_batch(...))   # or add(pay_date, result) per check
+    ledger.add_rows(read_results_file("results.csv", pay_date=date(2025, 1, 24)))
+    ledger.quarter(2025, 1), ledger.deposits(2025)
+
+    python tools/payroll_liability.py jan10.csv@2025-01-10 jan24.csv@2025-01-24 --schedule semiweekly
+    python tools/payroll_liability.py --history-db payroll.db --year 2025 --lookback-total 48000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from payroll_pipeline import is_blank, read_employee_records
+
+
+SCHEDULES = ("monthly", "semiweekly")
+# Lookback-period total above which a 941 filer deposits semiweekly
+MONTHLY_LOOKBACK_LIMIT = 50_000.0
+NEXT_DAY_THRESHOLD = 100_000.0
+# Running totals kept per pay date and quarter (cents; "paychecks" is a count)
+TOTAL_FIELDS = ("paychecks", "wages", "federal_income_tax", "social_security", "medicare")
+_NEXT_DAY_CENTS = round(NEXT_DAY_THRESHOLD * 100)
+
+
+@dataclass(frozen=True)
+class LiabilityTotals:
+    """
+    941 amounts for a pay date, quarter or year.
+
+    Attributes:
+        wages: FIT-taxable wages (line 2).
+        federal_income_tax: Federal income tax withheld (line 3).
+        social_security: Employee plus employer Social Security.
+        medicare: Employee plus employer Medicare, including Additional Medicare.
+        total: Total tax liability (line 12 before adjustments).
+    """
+
+    paychecks: int = 0
+    wages: float = 0.0
+    federal_income_tax: float = 0.0
+    social_security: float = 0.0
+    medicare: float = 0.0
+    total: float = 0.0
+
+    @classmethod
+    def _from_cents(cls, sums: List[int]) -> "LiabilityTotals":
+        paychecks, wages, fit, ss, medicare = sums
+        return cls(paychecks, wages / 100, fit / 100, ss / 100, medicare / 100, (fit + ss + medicare) / 100)
+
+
+@dataclass(frozen=True)
+class QuarterLiability:
+    year: int
+    quarter: int
+    totals: LiabilityTotals
+    # Liability for each month of the quarter (941 line 16 for monthly depositors)
+    months: Tuple[float, float, float]
+
+
+@dataclass(frozen=True)
+class Deposit:
+    """One federal tax deposit: the liability of pay dates ``first_day`` to ``last_day``, due on ``due``."""
+
+    due: date
+    first_day: date
+    last_day: date
+    amount: float
+    rule: str  # "monthly", "semiweekly" or "next_day"
+    year: int
+    quarter: int
+
+
+def _quarter(day: date) -> int:
+    return (day.month - 1) // 3 + 1
+
+
+def _business_day(day: date) -> date:
+    """``day``, or the Monday after it if it falls on a weekend."""
+    return day + timedelta(days=max(0, 7 - day.weekday())) if day.weekday() >= 5 else day
+
+
+def _deposit_period(schedule: str, day: date) -> Tuple[Tuple[Any, ...], date]:
+    """The deposit period ``day`` belongs to (as a key) and that period's due date."""
+    if schedule == "monthly":
+        year, month = (day.year + 1, 1) if day.month == 12 else (day.year, day.month + 1)
+        return (day.year, day.month), _business_day(date(year, month, 15))
+    weekday = day.weekday()
+    if weekday in (2, 3, 4):  # Wed-Fri: due the Wednesday after
+        start = day - timedelta(days=weekday - 2)
+        due = start + timedelta(days=7)
+    else:  # Sat-Tue: due the Friday after
+        start = day - timedelta(days=(weekday - 5) % 7)
+        due = start + timedelta(days=6)
+    return (start, _quarter(day)), _business_day(due)
+
+
+def lookback_quarters(year: int) -> List[Tuple[int, int]]:
+    """The four quarters whose liability sets ``year``'s deposit schedule (July 1 two years back to June 30 last year)."""
+    return [(year - 2, 3), (year - 2, 4), (year - 1, 1), (year - 1, 2)]
+
+
+def deposit_schedule(lookback_total: float) -> str:
+    return "monthly" if lookback_total <= MONTHLY_LOOKBACK_LIMIT else "semiweekly"
+
+
+class LiabilityLedger:
+    """
+    Running employer tax liability. ``schedule`` is the depositor status for the
+    years added (see ``deposit_schedule``); new employers are monthly.
+    """
+
+    def __init__(self, schedule: str = "monthly"):
+        if schedule not in SCHEDULES:
+            raise ValueError(f"schedule must be one of {', '.join(SCHEDULES)}")
+        self.schedule = schedule
+        # Running cents per pay date (TOTAL_FIELDS order); quarters and deposits are built from these
+        self._days: Dict[date, List[int]] = {}
+
+    def _row(self, pay_date: date) -> List[int]:
+        row = self._days.get(pay_date)
+        if row is None:
+            row = self._days[pay_date] = [0] * len(TOTAL_FIELDS)
+        return row
+
+    def add(self, pay_date: date, result: Mapping[str, Any], paycheck: bool = True) -> None:
+        """
+        Post one paycheck (a ``PaycheckResult`` or a mapping of its fields). A retro
+        adjustment (``paycheck=False``) adds its amounts without counting a paycheck.
+        """
+        row = self._row(pay_date)
+        row[0] += 1 if paycheck else 0
+        row[1] += round(float(result["taxable_wages_fit"]) * 100)
+        row[2] += round(float(result["federal_income_tax"]) * 100)
+        row[3] += round(float(result["social_security"]) * 100) + round(float(result["employer_social_security"]) * 100)
+        row[4] += round(float(result["medicare"]) * 100) + round(float(result["employer_medicare"]) * 100)
+
+    def add_rows(self, rows: Iterable[Tuple[date, Mapping[str, Any]]]) -> int:
+        """Post ``(pay_date, result)`` pairs, e.g. from ``read_results_file``; returns the count."""
+        count = 0
+        for pay_date, result in rows:
+            self.add(pay_date, result)
+            count += 1
+        return count
+
+    def add_results(self, pay_date: date, results: Any) -> int:
+        """
+        Post a whole pay run paid on ``pay_date``. ``results`` is a ``PaycheckResults``
+        or a dict of columns (``compute_payroll_batch`` output). Returns the paycheck count.
+        """
+        columns = results.column if hasattr(results, "column") else results.__getitem__
+
+        def cents(name: str) -> int:
+            return sum(round(value * 100) for value in map(float, columns(name)))
+
+        count = len(columns("gross"))
+        row = self._row(pay_date)
+        row[0] += count
+        row[1] += cents("taxable_wages_fit")
+        row[2] += cents("federal_income_tax")
+        row[3] += cents("social_security") + cents("employer_social_security")
+        row[4] += cents("medicare") + cents("employer_medicare")
+        return count
+
+    def pay_dates(self, year: Optional[int] = None) -> List[Tuple[date, LiabilityTotals]]:
+        """Totals per pay date, in date order (the daily liabilities of Schedule B)."""
+        return [(day, LiabilityTotals._from_cents(self._days[day]))
+                for day in sorted(self._days) if year is None or day.year == year]
+
+    def quarter(self, year: int, quarter: int) -> QuarterLiability:
+        """941 totals for one quarter (zeros if nothing was paid in it)."""
+        sums = [0] * len(TOTAL_FIELDS)
+        months = [0, 0, 0]
+        for day, row in self._days.items():
+            if day.year == year and _quarter(day) == quarter:
+                for i, value in enumerate(row):
+                    sums[i] += value
+                months[(day.month - 1) % 3] += row[2] + row[3] + row[4]
+        return QuarterLiability(year, quarter, LiabilityTotals._from_cents(sums), tuple(m / 100 for m in months))
+
+    def quarters(self, year: Optional[int] = None) -> List[QuarterLiability]:
+        """Every quarter with pay dates (optionally only ``year``'s), in order."""
+        keys = sorted({(day.year, _quarter(day)) for day in self._days})
+        return [self.quarter(y, q) for y, q in keys if year is None or y == year]
+
+    def lookback_total(self, year: int) -> float:
+        """Liability in ``year``'s lookback period, for ``deposit_schedule``."""
+        return sum(self.quarter(y, q).totals.total for y, q in lookback_quarters(year))
+
+    def deposits(self, year: Optional[int] = None) -> List[Deposit]:
+        """The deposits due for the liabilities added so far, in pay-date order."""
+        out: List[Deposit] = []
+        semiweekly_through: Optional[int] = None  # last year a next-day deposit made us semiweekly
+        key: Any = None
+        first: Optional[date] = None
+        last = due = date.min
+        cents, rule = 0, ""
+
+        def close(next_day: bool = False) -> None:
+            if cents:
+                when = _business_day(last + timedelta(days=1)) if next_day else due
+                out.append(Deposit(when, first, last, cents / 100, "next_day" if next_day else rule,
+                                   last.year, _quarter(last)))
+
+        for day in sorted(self._days):
+            row = self._days[day]
+            semiweekly = self.schedule == "semiweekly" or (semiweekly_through is not None and day.year <= semiweekly_through)
+            day_rule = "semiweekly" if semiweekly else "monthly"
+            day_key, day_due = _deposit_period(day_rule, day)
+            if (day_rule, day_key) != key:
+                close()
+                key, due, rule, first, cents = (day_rule, day_key), day_due, day_rule, None, 0
+            if first is None:
+                first = day
+            cents += row[2] + row[3] + row[4]
+            last = day
+            if cents >= _NEXT_DAY_CENTS:
+                close(next_day=True)
+                first, cents = None, 0  # accumulation restarts within the same deposit period
+                if not semiweekly:
+                    semiweekly_through = day.year + 1
+        close()
+        if year is not None:
+            out = [d for d in out if d.year == year]
+        return out
+
+
+def read_results_file(
+    path: str,
+    pay_date: Optional[date] = None,
+    *,
+    date_field: str = "pay_date",
+    fmt: Optional[str] = None,
+) -> Iterator[Tuple[date, Dict[str, Any]]]:
+    """
+    Stream ``(pay_date, result)`` from a results file (CSV or JSON lines, as written by
+    ``--batch-output``). Rows take their date from ``date_field`` when the file has
+    one, otherwise ``pay_date``.
+    """
+    for line_no, record in enumerate(read_employee_records(path, fmt), start=1):
+        value = record.get(date_field)
+        if not is_blank(value):
+            try:
+                day = date.fromisoformat(str(value).strip())
+            except ValueError:
+                raise ValueError(f"{path}:{line_no}: bad {date_field} {value!r}") from None
+        elif pay_date is not None:
+            day = pay_date
+        else:
+            raise ValueError(f"{path}:{line_no}: no {date_field}; give the file's pay date")
+        yield day, record
+
+
+def _money(value: float) -> str:
+    return f"{value:,.2f}"
+
+
+def format_liability_report(ledger: LiabilityLedger, year: Optional[int] = None) -> str:
+    lines = [f"Form 941 liability ({ledger.schedule} depositor)", ""]
+    header = ("Quarter", "Checks", "Wages", "FIT", "Soc Sec", "Medicare", "Total", "Month 1", "Month 2", "Month 3")
+    rows = [header]
+    for q in ledger.quarters(year):
+        t = q.totals
+        rows.append((f"{q.year} Q{q.quarter}", str(t.paychecks), _money(t.wages), _money(t.federal_income_tax),
+                     _money(t.social_security), _money(t.medicare), _money(t.total)) + tuple(_money(m) for m in q.months))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines += ["  ".join(cell.ljust(w) if i == 0 else cell.rjust(w) for i, (cell, w) in enumerate(zip(row, widths)))
+              for row in rows]
+    lines += ["", "Deposits"]
+    for d in ledger.deposits(year):
+        lines.append(f"  due {d.due.isoformat()}  {_money(d.amount):>16}  {d.rule:<10}  "
+                     f"pay dates {d.first_day.isoformat()} to {d.last_day.isoformat()} ({d.year} Q{d.quarter})")
+    return "\n".join(lines)
+
+
+def _file_arg(text: str) -> Tuple[str, Optional[date]]:
+    path, _, day = text.rpartition("@") if "@" in text else (text, "", "")
+    return path, (date.fromisoformat(day) if day else None)
+
+
+def main():
+    p = argparse.ArgumentParser(description="Employer federal tax liability by quarter, with the deposit schedule.")
+    p.add_argument("inputs", nargs="*", help="Results files (CSV/JSON lines); PATH@YYYY-MM-DD gives the pay date "
+                                             "for files without a pay_date column")
+    p.add_argument("--history-db", type=str, default=None,
+                   help="Read paychecks and retro adjustments from a pay history store instead, each on its stored "
+                        "pay date (paychecks stored without one are dated by their period end)")
+    p.add_argument("--year", type=int, default=None, help="Report one year")
+    p.add_argument("--schedule", choices=SCHEDULES, default=None, help="Depositor status (default: from --lookback-total)")
+    p.add_argument("--lookback-total", type=float, default=None,
+                   help="941 liability in the lookback period; $50,000 or less means monthly (default: monthly)")
+    p.add_argument("--json", action="store_true", help="Print quarters and deposits as JSON")
+    args = p.parse_args()
+
+    if not args.inputs and not args.history_db:
+        p.error("give results files or --history-db")
+    schedule = args.schedule or (deposit_schedule(args.lookback_total) if args.lookback_total is not None else "monthly")
+    ledger = LiabilityLedger(schedule)
+    try:
+        if args.history_db:
+            from payroll_history import PayHistoryStore
+
+            with PayHistoryStore(args.history_db) as store:
+                for pay_date, kind, result in store.paid_rows(args.year):
+                    ledger.add(pay_date, result, paycheck=kind == "paycheck")
+        for text in args.inputs:
+            path, pay_date = _file_arg(text)
+            ledger.add_rows(read_results_file(path, pay_date))
+    except (OSError, ValueError) as e:
+        p.error(str(e))
+
+    if args.json:
+        report = {
+            "schedule": schedule,
+            "quarters": [asdict(q) for q in ledger.quarters(args.year)],
+            "deposits": [asdict(d) for d in ledger.deposits(args.year)],
+        }
+        print(json.dumps(report, indent=2, default=date.isoformat))
+    else:
+        print(format_liability_report(ledger, args.year))
+
+
+if __name__ == "__main__":
+    main()
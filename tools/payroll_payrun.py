@@ -0,0 +1,225 @@
+"""Pay-run loading and the table model behind the GUI's pay-run tab.
+
+``load_pay_run`` computes a whole employee file (CSV or JSON lines, as in
+``payroll_pipeline``). It uses the columnar engine in chunks, or the per-record
+engine when the file has daily hours, and checks a cancel token between chunks
+so it can run on the GUI's background worker.
+
+``PayRunView`` is the Tk-free model for the results grid. It keeps the results as
+columns, and sorting and filtering only reorder an index array. ``rows(start, stop)``
+formats just the slice on screen. ``Viewport`` tracks which slice that is and turns
+scrollbar and mouse-wheel commands into offsets. Together they let a ``ttk.Treeview``
+hold one page of items however many rows the run has.
+
+    results = load_pay_run("employees.csv", defaults=PayrollConfig(withholding_method="irs_percentage"))
+    view = PayRunView(results)
+    view.sort("net", descending=True)
+    view.filter(text="E1", column="gross", minimum=1000)
+    view.rows(0, 25), view.totals()
+"""
+
+from __future__ import annotations
+
+import csv
+from typing import Any, Dict, List, Optional, Sequence, TextIO, Tuple
+
+import numpy as np
+
+from payroll_calculator import RESULT_FIELDS, PayrollConfig
+from payroll_pipeline import DAILY_FIELDS, is_blank, iter_paychecks, read_employee_records
+from payroll_results import PaycheckResults
+
+
+ID_COLUMN = "employee_id"
+# Columns shown in the grid (every result field can still be sorted, filtered and exported)
+DISPLAY_COLUMNS = (
+    ID_COLUMN,
+    "gross",
+    "taxable_wages_fit",
+    "social_security",
+    "medicare",
+    "federal_income_tax",
+    "state_income_tax",
+    "posttax_deductions",
+    "net",
+    "employer_total",
+)
+# Columns summed in the totals row (hours and rates are not money)
+TOTAL_COLUMNS = tuple(name for name in RESULT_FIELDS if not name.endswith("_hours") and name != "effective_employee_tax_rate")
+CHUNK_SIZE = 10_000
+
+
+def load_pay_run(
+    path: str,
+    defaults: Optional[PayrollConfig] = None,
+    default_pay_type: Optional[str] = None,
+    *,
+    input_format: Optional[str] = None,
+    token: Any = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> PaycheckResults:
+    """
+    Compute every record in ``path``. ``token`` is an optional ``payroll_worker.CancelToken``;
+    its ``check()`` runs between chunks.
+    """
+    from payroll_batch import compute_payroll_batch, records_to_columns
+
+    records = list(read_employee_records(path, input_format))
+    results = PaycheckResults()
+    if any(not is_blank(record.get(name)) for record in records for name in DAILY_FIELDS):
+        for i, (employee_id, result) in enumerate(iter_paychecks(records, defaults, default_pay_type)):
+            if token is not None and i % chunk_size == 0:
+                token.check()
+            results.append(result, employee_id)
+        return results
+    for start in range(0, len(records), chunk_size):
+        if token is not None:
+            token.check()
+        ids, columns = records_to_columns(records[start:start + chunk_size], defaults, default_pay_type)
+        chunk = PaycheckResults.from_columns(compute_payroll_batch(columns, config=defaults), ids)
+        for name in RESULT_FIELDS:
+            results.column(name).extend(chunk.column(name))
+        results.employee_ids.extend(ids)
+    return results
+
+
+def _format_cell(column: str, value: Any) -> str:
+    if column == ID_COLUMN:
+        return str(value)
+    if column == "effective_employee_tax_rate":
+        return f"{value:.2%}"
+    return f"{value:,.2f}"
+
+
+class PayRunView:
+    """
+    Sorted and filtered view over a pay run's results. ``view`` holds the row numbers
+    shown, in display order. Sorting and filtering rebuild that index array and never
+    copy or format the results themselves.
+    """
+
+    def __init__(self, results: PaycheckResults):
+        self.results = results
+        self.employee_ids = np.array(results.employee_ids, dtype=str)
+        # Zero-copy views over the array('d') result columns
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.frombuffer(results.column(name), dtype=float) if len(results) else np.zeros(0)
+            for name in RESULT_FIELDS
+        }
+        self.sort_column: Optional[str] = None
+        self.descending = False
+        self._order = np.arange(len(results))
+        self._keep = np.ones(len(results), dtype=bool)
+        self.view = self._order
+
+    def __len__(self) -> int:
+        return len(self.view)
+
+    @property
+    def total_rows(self) -> int:
+        return len(self.results)
+
+    def _values(self, column: str) -> np.ndarray:
+        if column == ID_COLUMN:
+            return self.employee_ids
+        if column not in self.columns:
+            raise ValueError(f"Unknown pay-run column: {column}")
+        return self.columns[column]
+
+    def sort(self, column: str, descending: Optional[bool] = None) -> None:
+        """Sort by ``column``; without ``descending``, re-sorting the same column flips the direction."""
+        if descending is None:
+            descending = not self.descending if column == self.sort_column else False
+        order = np.argsort(self._values(column), kind="stable")
+        self._order = order[::-1] if descending else order
+        self.sort_column, self.descending = column, descending
+        self._apply()
+
+    def filter(self, text: str = "", column: Optional[str] = None,
+               minimum: Optional[float] = None, maximum: Optional[float] = None) -> None:
+        """
+        Keep rows whose employee id contains ``text`` (case-insensitive) and whose
+        ``column`` value lies within ``[minimum, maximum]`` (either bound optional).
+        """
+        keep = np.ones(self.total_rows, dtype=bool)
+        if text:
+            keep &= np.char.find(np.char.lower(self.employee_ids), text.lower()) >= 0
+        if column and (minimum is not None or maximum is not None):
+            values = self._values(column)
+            if column == ID_COLUMN:
+                raise ValueError("Range filters need a numeric column")
+            if minimum is not None:
+                keep &= values >= minimum
+            if maximum is not None:
+                keep &= values <= maximum
+        self._keep = keep
+        self._apply()
+
+    def _apply(self) -> None:
+        self.view = self._order[self._keep[self._order]]
+
+    def rows(self, start: int, stop: int, columns: Sequence[str] = DISPLAY_COLUMNS) -> List[Tuple[str, ...]]:
+        """Display strings for view rows ``start`` to ``stop`` (only these are formatted)."""
+        index = self.view[max(start, 0):max(stop, 0)]
+        cells = [[_format_cell(column, value) for value in self._values(column)[index]] for column in columns]
+        return list(zip(*cells))
+
+    def totals(self) -> Dict[str, float]:
+        """Sum of each money column over the rows in the view."""
+        return {name: round(float(self.columns[name][self.view].sum()), 2) for name in TOTAL_COLUMNS}
+
+    def write_csv(self, out: TextIO) -> int:
+        """Write the rows in the view (all result fields, display order); returns the row count."""
+        index = self.view  # one snapshot, in case the UI re-sorts while a worker writes
+        writer = csv.writer(out)
+        writer.writerow((ID_COLUMN,) + RESULT_FIELDS)
+        values = [self.columns[name][index].tolist() for name in RESULT_FIELDS]
+        writer.writerows(zip(self.employee_ids[index].tolist(), *values))
+        return len(index)
+
+
+class Viewport:
+    """
+    The window of ``height`` rows shown out of ``total``, moved by Tk scrollbar
+    commands (``moveto`` fraction, ``scroll`` n units or pages) or by row offsets.
+    """
+
+    def __init__(self, height: int, total: int = 0):
+        self.height = max(int(height), 1)
+        self.total = total
+        self.offset = 0
+
+    def resize(self, total: int) -> None:
+        self.total = total
+        self.offset = self._clamp(self.offset)
+
+    def _clamp(self, offset: int) -> int:
+        return max(0, min(int(offset), max(self.total - self.height, 0)))
+
+    def scroll_to(self, offset: int) -> bool:
+        """Move to ``offset``; returns whether the window moved."""
+        offset = self._clamp(offset)
+        moved = offset != self.offset
+        self.offset = offset
+        return moved
+
+    def command(self, *args: str) -> bool:
+        """Apply a scrollbar command: ``("moveto", fraction)`` or ``("scroll", n, "units"|"pages")``."""
+        if not args:
+            return False
+        if args[0] == "moveto":
+            return self.scroll_to(round(float(args[1]) * self.total))
+        if args[0] == "scroll":
+            step = self.height if args[2].startswith("page") else 1
+            return self.scroll_to(self.offset + int(args[1]) * step)
+        raise ValueError(f"Unknown scroll command: {args[0]}")
+
+    @property
+    def stop(self) -> int:
+        return min(self.offset + self.height, self.total)
+
+    def fractions(self) -> Tuple[float, float]:
+        """``(first, last)`` for ``Scrollbar.set``."""
+        if self.total <= 0:
+            return 0.0, 1.0
+        return self.offset / self.total, self.stop / self.total
@@ -0,0 +1,376 @@
+"""Streaming pay-run pipeline: employee records in, paycheck rows out.
+
+Every stage is a generator, so an employee file of any size is processed in
+constant memory: records are read one at a time, run through
+``compute_paycheck`` and written out immediately.
+
+Input records are CSV rows or JSON objects (one per line) whose keys are the
+``compute_paycheck`` keyword arguments (``pay_type``, ``hourly_rate``, ``hours``,
+``daily_hours``, ``daily_rates``, ``salary``, ...) and ``PayrollConfig`` field names
+(``ytd_wages``, ``filing_status``, ``federal_rate``, ...). Missing or blank values
+fall back to a defaults ``PayrollConfig``. An optional ``employee_id`` column is
+passed through to the output.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields, replace
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from payroll_calculator import RESULT_FIELDS, PayrollConfig, compute_paycheck, parse_rate, withholding_cache_info
+from payroll_results import PaycheckResult
+
+
+ID_FIELD = "employee_id"
+OUTPUT_FIELDS = (ID_FIELD,) + RESULT_FIELDS
+
+# compute_paycheck earnings arguments and how to parse them from text
+FLOAT_ARGS = (
+    "hourly_rate",
+    "hours",
+    "overtime_hours",
+    "overtime_multiplier",
+    "doubletime_hours",
+    "doubletime_multiplier",
+    "salary",
+)
+# Daily-hours inputs; only the per-record engine (compute_paycheck) takes them
+DAILY_FIELDS = ("daily_hours", "daily_rates", "use_ca_daily_ot")
+# PayrollConfig fields that accept 12 / 0.12 / 12% style rates
+_RATE_FIELDS = {
+    "federal_rate",
+    "state_rate",
+    "pretax_401k_percent",
+    "pretax_hsa_percent",
+    "pretax_section125_percent",
+    "posttax_percent_net",
+}
+_CONFIG_TYPES = {f.name: f.type for f in fields(PayrollConfig)}
+
+
+def _parse_bool(val: Any) -> bool:
+    if isinstance(val, bool):
+        return val
+    return str(val).strip().lower() in ("1", "true", "yes", "y", "x")
+
+
+def is_blank(val: Any) -> bool:
+    """Whether a record value counts as not given (None or an empty/whitespace string)."""
+    return val is None or (isinstance(val, str) and not val.strip())
+
+
+def _detect_format(path: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    return "jsonl" if Path(path).suffix.lower() in (".jsonl", ".ndjson", ".json") else "csv"
+
+
+def read_employee_records(path: str, fmt: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield employee records one at a time from a CSV or JSON-lines file.
+    ``path`` may be ``-`` for stdin. The format is taken from ``fmt`` ('csv' or
+    'jsonl') or guessed from the file extension.
+    """
+    fmt = _detect_format(path, fmt)
+    f = sys.stdin if path == "-" else open(path, newline="")
+    try:
+        if fmt == "jsonl":
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_no}: invalid JSON ({e})") from None
+        else:
+            yield from csv.DictReader(f)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def record_to_paycheck_args(
+    record: Dict[str, Any],
+    defaults: PayrollConfig,
+    default_pay_type: Optional[str] = None,
+) -> Tuple[str, Dict[str, Any], PayrollConfig]:
+    """
+    Convert one employee record into ``(pay_type, earnings_kwargs, config)``
+    suitable for ``compute_paycheck(pay_type, **earnings_kwargs, config=config)``.
+    """
+    pay_type = str(record.get("pay_type") or default_pay_type or "").strip()
+    kwargs: Dict[str, Any] = {}
+    for name in FLOAT_ARGS:
+        val = record.get(name)
+        if not is_blank(val):
+            kwargs[name] = float(val)
+    for name in ("daily_hours", "daily_rates"):
+        daily = record.get(name)
+        if not is_blank(daily):
+            # JSON records may carry daily hours/rates as a list (null = default rate)
+            kwargs[name] = ",".join("" if h is None else str(h) for h in daily) if isinstance(daily, list) else str(daily)
+    if not is_blank(record.get("use_ca_daily_ot")):
+        kwargs["use_ca_daily_ot"] = _parse_bool(record["use_ca_daily_ot"])
+
+    overrides: Dict[str, Any] = {}
+    for name in _CONFIG_TYPES:
+        val = record.get(name)
+        if not is_blank(val):
+            overrides[name] = parse_config_value(name, val)
+    config = replace(defaults, **overrides) if overrides else defaults
+    return pay_type, kwargs, config
+
+
+def parse_config_value(name: str, val: Any) -> Any:
+    """Parse one non-blank record value for the ``PayrollConfig`` field ``name``."""
+    typ = _CONFIG_TYPES[name]
+    if name in _RATE_FIELDS:
+        return parse_rate(str(val))  # 12 (number or text) means 12%, as on the CLI
+    if typ in (bool, "bool"):
+        return _parse_bool(val)
+    if typ in (int, "int"):
+        return int(float(val))
+    if typ in (str, "str"):
+        return str(val).strip()
+    return float(val)
+
+
+def iter_paychecks(
+    records: Iterable[Dict[str, Any]],
+    defaults: Optional[PayrollConfig] = None,
+    default_pay_type: Optional[str] = None,
+    start: int = 1,
+) -> Iterator[Tuple[str, PaycheckResult]]:
+    """
+    Compute a paycheck for each record, yielding ``(employee_id, result)`` pairs.
+    ``start`` is the record number of the first record, used in error messages.
+    """
+    defaults = defaults or PayrollConfig()
+    for n, record in enumerate(records, start=start):
+        try:
+            pay_type, kwargs, config = record_to_paycheck_args(record, defaults, default_pay_type)
+            result = compute_paycheck(pay_type, **kwargs, config=config)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Record {n} ({record.get(ID_FIELD, 'no employee_id')}): {e}") from None
+        yield str(record.get(ID_FIELD) or ""), result
+
+
+@dataclass
+class WorkerStats:
+    """Throughput of one worker process in a parallel pay run."""
+
+    records: int = 0
+    chunks: int = 0
+    busy_seconds: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.busy_seconds if self.busy_seconds > 0 else 0.0
+
+
+def _chunked(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    it = iter(records)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _compute_chunk(chunk: List[Dict[str, Any]], defaults: PayrollConfig, default_pay_type: Optional[str], first_index: int):
+    # Runs in a worker process; record numbers in errors stay relative to the whole input
+    start = time.perf_counter()
+    before = withholding_cache_info()
+    rows = list(iter_paychecks(chunk, defaults, default_pay_type, start=first_index))
+    after = withholding_cache_info()
+    cache = (after.hits - before.hits, after.misses - before.misses)
+    return rows, os.getpid(), time.perf_counter() - start, cache
+
+
+def iter_paychecks_parallel(
+    records: Iterable[Dict[str, Any]],
+    defaults: Optional[PayrollConfig] = None,
+    default_pay_type: Optional[str] = None,
+    *,
+    workers: Optional[int] = None,
+    chunk_size: int = 1000,
+    stats: Optional[Dict[int, WorkerStats]] = None,
+) -> Iterator[Tuple[str, PaycheckResult]]:
+    """
+    Like ``iter_paychecks`` but computes chunks of ``chunk_size`` records on a pool of
+    ``workers`` processes (default: all cores). Results are yielded in input order.
+    At most two chunks per worker are in flight, so memory stays bounded.
+    If ``stats`` is given it is filled with per-worker ``WorkerStats`` keyed by PID.
+    """
+    defaults = defaults or PayrollConfig()
+    workers = workers or os.cpu_count() or 1
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        next_index = 1
+        chunks = _chunked(records, chunk_size)
+
+        def submit_next() -> bool:
+            nonlocal next_index
+            chunk = next(chunks, None)
+            if chunk is None:
+                return False
+            pending.append(pool.submit(_compute_chunk, chunk, defaults, default_pay_type, next_index))
+            next_index += len(chunk)
+            return True
+
+        for _ in range(workers * 2):
+            if not submit_next():
+                break
+        while pending:
+            try:
+                rows, pid, elapsed, (hits, misses) = pending.popleft().result()
+            except Exception:
+                for future in pending:
+                    future.cancel()
+                raise
+            submit_next()
+            if stats is not None:
+                ws = stats.setdefault(pid, WorkerStats())
+                ws.records += len(rows)
+                ws.chunks += 1
+                ws.busy_seconds += elapsed
+                ws.cache_hits += hits
+                ws.cache_misses += misses
+            yield from rows
+
+
+def format_worker_stats(stats: Dict[int, WorkerStats], wall_seconds: float) -> str:
+    """Human-readable per-worker throughput summary."""
+    total = sum(ws.records for ws in stats.values())
+    lines = [f"Computed {total} paychecks on {len(stats)} worker(s) in {wall_seconds:.2f}s "
+             f"({total / wall_seconds if wall_seconds > 0 else 0.0:,.0f}/s overall)"]
+    for pid, ws in sorted(stats.items()):
+        lines.append(f"- worker {pid}: {ws.records} records in {ws.chunks} chunk(s), "
+                     f"{ws.busy_seconds:.2f}s busy, {ws.records_per_second:,.0f}/s")
+    lines.append(format_cache_stats(sum(ws.cache_hits for ws in stats.values()),
+                                    sum(ws.cache_misses for ws in stats.values())))
+    return "\n".join(lines)
+
+
+def format_cache_stats(hits: int, misses: int) -> str:
+    lookups = hits + misses
+    rate = hits / lookups * 100.0 if lookups else 0.0
+    return f"Withholding cache: {hits} hits, {misses} misses ({rate:.1f}% hit rate)"
+
+
+def write_results(rows: Iterable[Tuple[str, PaycheckResult]], out: TextIO, fmt: str = "csv") -> int:
+    """
+    Stream ``(employee_id, result)`` pairs to ``out`` as CSV (with header) or JSON lines.
+    Returns the row count.
+    """
+    count = 0
+    if fmt == "jsonl":
+        for employee_id, result in rows:
+            out.write(result.to_json(employee_id))
+            out.write("\n")
+            count += 1
+    else:
+        writer = csv.writer(out)
+        writer.writerow(OUTPUT_FIELDS)
+        for employee_id, result in rows:
+            writer.writerow((employee_id,) + result.values_tuple())
+            count += 1
+    return count
+
+
+def run_batch_file(
+    input_path: str,
+    output_path: Optional[str] = None,
+    *,
+    defaults: Optional[PayrollConfig] = None,
+    default_pay_type: Optional[str] = None,
+    input_format: Optional[str] = None,
+    output_format: Optional[str] = None,
+    workers: int = 1,
+    chunk_size: int = 1000,
+    report: Optional[TextIO] = None,
+    engine: str = "scalar",
+) -> int:
+    """
+    Stream ``input_path`` through the calculator into ``output_path`` (stdout if None or '-').
+    With ``workers`` other than 1 the records are sharded across a process pool
+    (0 means all cores) and per-worker throughput is written to ``report``.
+    ``engine="batch"`` loads the whole file and computes it as columns with
+    ``payroll_batch`` instead (no daily hours; much faster for large runs such
+    as bonus day), and ``engine="cents"`` does the same in exact integer cents
+    (``payroll_cents``).
+    """
+    to_stdout = output_path in (None, "-")
+    out_fmt = output_format or ("csv" if to_stdout else _detect_format(output_path, None))
+    records = read_employee_records(input_path, input_format)
+    if engine in ("batch", "cents"):
+        return _run_batch_engine(records, output_path if not to_stdout else None, out_fmt, defaults, default_pay_type, report,
+                                 exact=engine == "cents")
+    stats: Dict[int, WorkerStats] = {}
+    cache_before = withholding_cache_info()
+    if workers == 1:
+        rows = iter_paychecks(records, defaults, default_pay_type)
+    else:
+        rows = iter_paychecks_parallel(
+            records, defaults, default_pay_type, workers=workers or None, chunk_size=chunk_size, stats=stats
+        )
+    start = time.perf_counter()
+    if to_stdout:
+        count = write_results(rows, sys.stdout, out_fmt)
+    else:
+        with open(output_path, "w", newline="") as out:
+            count = write_results(rows, out, out_fmt)
+    if report is not None:
+        if stats:
+            print(format_worker_stats(stats, time.perf_counter() - start), file=report)
+        else:
+            cache_after = withholding_cache_info()
+            print(format_cache_stats(cache_after.hits - cache_before.hits, cache_after.misses - cache_before.misses), file=report)
+    return count
+
+
+def _run_batch_engine(
+    records: Iterable[Dict[str, Any]],
+    output_path: Optional[str],
+    out_fmt: str,
+    defaults: Optional[PayrollConfig],
+    default_pay_type: Optional[str],
+    report: Optional[TextIO],
+    exact: bool = False,
+) -> int:
+    from payroll_batch import compute_payroll_batch, records_to_columns
+    from payroll_results import PaycheckResults
+
+    start = time.perf_counter()
+    ids, columns = records_to_columns(records, defaults, default_pay_type)
+    if not ids:
+        results = PaycheckResults()
+    elif exact:
+        from payroll_cents import cents_to_dollars, compute_payroll_cents
+
+        results = PaycheckResults.from_columns(cents_to_dollars(compute_payroll_cents(columns, config=defaults)), ids)
+    else:
+        results = PaycheckResults.from_columns(compute_payroll_batch(columns, config=defaults), ids)
+    write = results.write_jsonl if out_fmt == "jsonl" else results.write_csv
+    if output_path is None:
+        write(sys.stdout)
+    else:
+        with open(output_path, "w", newline="") as out:
+            write(out)
+    if report is not None:
+        print(f"{'Cents' if exact else 'Batch'} engine: {len(results)} records in {time.perf_counter() - start:.3f}s", file=report)
+    return len(results)
@@ -0,0 +1,175 @@
+"""Compact paycheck result types.
+
+``PaycheckResult`` is a ``__slots__`` record with read-only mapping access
+(``result["net"]``, ``result.get(...)``, ``dict(result)``), so code written
+against the old result dicts keeps working while each result costs a fraction
+of the memory. ``PaycheckResults`` stores many results column by column in
+``array('d')`` buffers for large pay runs. Both serialize straight to CSV rows
+and JSON text without building intermediate dicts.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+
+# Keys of a paycheck result, in output/CSV column order
+RESULT_FIELDS = (
+    "gross",
+    "taxable_wages_fica",
+    "taxable_wages_fit",
+    "social_security",
+    "medicare",
+    "federal_income_tax",
+    "state_income_tax",
+    "posttax_deductions",
+    "total_deductions",
+    "net",
+    "employer_social_security",
+    "employer_medicare",
+    "employer_total",
+    "regular_hours",
+    "overtime_hours",
+    "doubletime_hours",
+    "regular_pay",
+    "overtime_pay",
+    "doubletime_pay",
+    "effective_employee_tax_rate",
+    "total_employer_cost",
+)
+_FIELD_INDEX = {name: i for i, name in enumerate(RESULT_FIELDS)}
+
+
+def _json_object(pairs: Iterable[Tuple[str, Any]]) -> str:
+    # Field names are plain identifiers and values are floats (or a str id);
+    # float repr() is the same text json.dumps would produce
+    parts = []
+    for key, value in pairs:
+        if isinstance(value, str):
+            import json  # deferred: only id strings need escaping, and the text CLI never gets here
+
+            text = json.dumps(value)
+        else:
+            text = repr(float(value))
+        parts.append(f'"{key}": {text}')
+    return "{" + ", ".join(parts) + "}"
+
+
+class PaycheckResult(Mapping):
+    """
+    One paycheck's results with attribute and read-only mapping access.
+    ``trace`` holds the optional calculation trace and is not one of the mapping keys.
+    """
+
+    __slots__ = RESULT_FIELDS + ("trace",)
+
+    def __init__(self, *values: float, **named: float):
+        if len(values) > len(RESULT_FIELDS):
+            raise TypeError(f"PaycheckResult takes at most {len(RESULT_FIELDS)} values")
+        self.trace = None
+        for name, value in zip(RESULT_FIELDS, values):
+            setattr(self, name, value)
+        for name, value in named.items():
+            if name not in _FIELD_INDEX:
+                raise TypeError(f"Unknown paycheck field: {name}")
+            setattr(self, name, value)
+        for name in RESULT_FIELDS[len(values):]:
+            if name not in named:
+                raise TypeError(f"Missing paycheck field: {name}")
+
+    def __getitem__(self, key: str) -> float:
+        if key not in _FIELD_INDEX:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(RESULT_FIELDS)
+
+    def __len__(self) -> int:
+        return len(RESULT_FIELDS)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _FIELD_INDEX
+
+    def __reduce__(self):
+        return (PaycheckResult, self.values_tuple())
+
+    def __repr__(self) -> str:
+        return f"PaycheckResult(gross={self.gross!r}, net={self.net!r}, ...)"
+
+    def values_tuple(self) -> Tuple[float, ...]:
+        """Values in ``RESULT_FIELDS`` order (a ready-made CSV row)."""
+        return tuple(getattr(self, name) for name in RESULT_FIELDS)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {name: getattr(self, name) for name in RESULT_FIELDS}
+
+    def to_json(self, employee_id: Optional[str] = None) -> str:
+        """JSON object text, optionally led by an ``employee_id`` key."""
+        pairs: List[Tuple[str, Any]] = [] if employee_id is None else [("employee_id", str(employee_id))]
+        pairs.extend(zip(RESULT_FIELDS, self.values_tuple()))
+        return _json_object(pairs)
+
+
+class PaycheckResults:
+    """
+    Column-oriented container for many paycheck results: one ``array('d')`` per
+    result field plus a list of employee ids. Indexing returns a ``PaycheckResult``.
+    """
+
+    __slots__ = ("employee_ids", "_columns")
+
+    def __init__(self) -> None:
+        self.employee_ids: List[str] = []
+        self._columns = tuple(array("d") for _ in RESULT_FIELDS)
+
+    @classmethod
+    def from_columns(cls, columns: Mapping[str, Sequence[float]], employee_ids: Optional[Sequence[str]] = None) -> "PaycheckResults":
+        """Build from a dict of equal-length columns (e.g. ``compute_payroll_batch`` output)."""
+        out = cls()
+        for col, name in zip(out._columns, RESULT_FIELDS):
+            values = columns[name]
+            col.extend(values.tolist() if hasattr(values, "tolist") else values)
+        n = len(out._columns[0])
+        out.employee_ids = list(employee_ids) if employee_ids is not None else [""] * n
+        if len(out.employee_ids) != n:
+            raise ValueError("employee_ids must match the number of results")
+        return out
+
+    def append(self, result: Mapping[str, float], employee_id: str = "") -> None:
+        values = result.values_tuple() if isinstance(result, PaycheckResult) else [result[name] for name in RESULT_FIELDS]
+        for col, value in zip(self._columns, values):
+            col.append(value)
+        self.employee_ids.append(employee_id)
+
+    def __len__(self) -> int:
+        return len(self.employee_ids)
+
+    def __getitem__(self, index: int) -> PaycheckResult:
+        return PaycheckResult(*(col[index] for col in self._columns))
+
+    def __iter__(self) -> Iterator[PaycheckResult]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def column(self, name: str) -> array:
+        """The underlying ``array('d')`` for one result field (shared, not copied)."""
+        return self._columns[_FIELD_INDEX[name]]
+
+    def totals(self) -> Dict[str, float]:
+        return {name: round(sum(col), 2) for name, col in zip(RESULT_FIELDS, self._columns)}
+
+    def write_csv(self, out: TextIO, header: bool = True) -> None:
+        import csv
+
+        writer = csv.writer(out)
+        if header:
+            writer.writerow(("employee_id",) + RESULT_FIELDS)
+        writer.writerows(zip(self.employee_ids, *self._columns))
+
+    def write_jsonl(self, out: TextIO) -> None:
+        for i, employee_id in enumerate(self.employee_ids):
+            out.write(_json_object(zip(("employee_id",) + RESULT_FIELDS, (employee_id,) + tuple(col[i] for col in self._columns))))
+            out.write("\n")
@@ -0,0 +1,335 @@
+"""Retroactive pay adjustments over stored pay history.
+
+A back-dated change (a new hourly rate or salary, a percentage raise, or corrected
+hours) is applied to every stored period ending on or after its effective date.
+Only those periods are recomputed, plus later periods of the same tax year whose
+Social Security or Additional Medicare outcome depends on the changed YTD wages;
+everything else is left alone. Each recomputed period with a different outcome
+yields a ``RetroLine`` of deltas against the stored result.
+
+History is a sequence of ``PayPeriod`` entries: the pipeline-format input record
+(``compute_paycheck`` arguments and ``PayrollConfig`` fields, including the
+``ytd_wages`` it was run with) plus the stored result. As a JSON-lines file, one
+period per line:
+
+    {"employee_id": "E1", "period_end": "2025-01-10", "record": {...}, "result": {...}}
+
+    python tools/payroll_retro.py history.jsonl --effective 2025-03-01 --raise-percent 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO, Tuple
+
+from payroll_calculator import SUPPLEMENTAL_METHODS, PayrollConfig, compute_paycheck
+from payroll_pipeline import ID_FIELD, record_to_paycheck_args
+from payroll_results import RESULT_FIELDS, PaycheckResult
+from tax_params import tax_year
+
+
+# Result fields reported as retro deltas
+DELTA_FIELDS = (
+    "gross",
+    "taxable_wages_fica",
+    "taxable_wages_fit",
+    "social_security",
+    "medicare",
+    "federal_income_tax",
+    "state_income_tax",
+    "posttax_deductions",
+    "net",
+    "employer_social_security",
+    "employer_medicare",
+)
+
+
+@dataclass
+class PayPeriod:
+    """One stored paycheck: its input record (as run, including ``ytd_wages``) and result."""
+
+    employee_id: str
+    period_end: date
+    record: Dict[str, Any]
+    result: PaycheckResult
+
+    @property
+    def ytd_wages(self) -> float:
+        return float(self.record.get("ytd_wages") or 0.0)
+
+    @property
+    def ytd_supplemental_wages(self) -> float:
+        return float(self.record.get("ytd_supplemental_wages") or 0.0)
+
+
+@dataclass
+class RetroChange:
+    """
+    A back-dated change applied to periods ending on or after ``effective`` (and on or
+    before ``through``, if given) for ``employee_ids`` (``None`` = every employee).
+    ``hourly_rate``/``salary`` replace the stored amount, ``raise_percent`` scales it
+    (3 = +3%), and ``hours``/``overtime_hours`` correct the hours worked.
+    """
+
+    effective: date
+    employee_ids: Optional[FrozenSet[str]] = None
+    through: Optional[date] = None
+    hourly_rate: Optional[float] = None
+    salary: Optional[float] = None
+    raise_percent: Optional[float] = None
+    hours: Optional[float] = None
+    overtime_hours: Optional[float] = None
+    reason: str = "retro change"
+
+    def applies_to(self, employee_id: str) -> bool:
+        return self.employee_ids is None or employee_id in self.employee_ids
+
+    def covers(self, period_end: date) -> bool:
+        return period_end >= self.effective and (self.through is None or period_end <= self.through)
+
+    def apply(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        updated = dict(record)
+        for name in ("hourly_rate", "salary", "hours", "overtime_hours"):
+            value = getattr(self, name)
+            if value is not None:
+                updated[name] = value
+        if self.raise_percent:
+            factor = 1.0 + self.raise_percent / 100.0
+            for name in ("hourly_rate", "salary"):
+                if updated.get(name) not in (None, ""):
+                    updated[name] = round(float(updated[name]) * factor, 4)
+            if updated.get("daily_rates"):
+                updated["daily_rates"] = ",".join(
+                    f"{float(r) * factor:.4f}" if r.strip() else "" for r in str(updated["daily_rates"]).split(",")
+                )
+        return updated
+
+
+@dataclass
+class RetroLine:
+    """A recomputed period: the stored and corrected results and why it changed."""
+
+    employee_id: str
+    period_end: date
+    reason: str
+    original: PaycheckResult
+    corrected: PaycheckResult
+    record: Dict[str, Any]
+
+    def deltas(self) -> Dict[str, float]:
+        return {name: round(self.corrected[name] - self.original[name], 2) for name in DELTA_FIELDS}
+
+
+def _crosses(old_ytd: float, new_ytd: float, wages: float, threshold: float) -> bool:
+    # Whether moving the YTD amount changes how much of ``wages`` falls over ``threshold``
+    lo, hi = min(old_ytd, new_ytd), max(old_ytd, new_ytd)
+    return not (hi + wages <= threshold or lo >= threshold)
+
+
+def _ytd_shift_matters(year: int, old_ytd: float, new_ytd: float, fica_wages: float,
+                       old_supplemental: float = 0.0, new_supplemental: float = 0.0,
+                       supplemental_wages: float = 0.0) -> bool:
+    # An unchanged paycheck only moves if a YTD shift changes how much of it falls under
+    # the SS wage base, over the Additional Medicare threshold or (for a supplemental-wage
+    # check) over the mandatory supplemental withholding threshold
+    params = tax_year(year)
+    return (_crosses(old_ytd, new_ytd, fica_wages, params.ss_wage_base)
+            or _crosses(old_ytd, new_ytd, fica_wages, params.addl_medicare_threshold)
+            or _crosses(old_supplemental, new_supplemental, supplemental_wages, params.supplemental_mandatory_threshold))
+
+
+def _is_supplemental(record: Mapping[str, Any], defaults: PayrollConfig) -> bool:
+    method = record.get("withholding_method")
+    return (method if method not in (None, "") else defaults.withholding_method) in SUPPLEMENTAL_METHODS
+
+
+def _tax_year_of(period: PayPeriod, defaults: PayrollConfig) -> int:
+    year = period.record.get("year")
+    return int(float(year)) if year not in (None, "") else defaults.year
+
+
+def compute_retro(
+    history: Iterable[PayPeriod],
+    changes: Sequence[RetroChange],
+    defaults: Optional[PayrollConfig] = None,
+) -> Iterator[RetroLine]:
+    """
+    Apply ``changes`` to ``history`` and yield a ``RetroLine`` for every period whose
+    result changes, employee by employee in period order. Employees no change applies
+    to are skipped without any computation, and so are periods before the earliest
+    effective date. A corrected period's FICA wage change is carried into the
+    ``ytd_wages`` of later periods in the same tax year, and a corrected
+    supplemental-wage check's FIT wage change into their ``ytd_supplemental_wages``.
+    """
+    defaults = defaults or PayrollConfig()
+    by_employee: Dict[str, List[PayPeriod]] = defaultdict(list)
+    for period in history:
+        by_employee[period.employee_id].append(period)
+
+    for employee_id, periods in by_employee.items():
+        mine = [c for c in changes if c.applies_to(employee_id)]
+        if not mine:
+            continue
+        periods.sort(key=lambda p: p.period_end)
+        earliest = min(c.effective for c in mine)
+        ytd_shift: Dict[int, float] = defaultdict(float)
+        supplemental_shift: Dict[int, float] = defaultdict(float)
+        for period in periods:
+            if period.period_end < earliest:
+                continue
+            applied = [c for c in mine if c.covers(period.period_end)]
+            # YTD wages run per calendar year of the pay date
+            year = period.period_end.year
+            shift, supp_shift = ytd_shift[year], supplemental_shift[year]
+            old_ytd, old_supp = period.ytd_wages, period.ytd_supplemental_wages
+            supplemental = _is_supplemental(period.record, defaults)
+            if not supplemental:
+                supp_shift = 0.0  # only supplemental-wage checks look at YTD supplemental wages
+            if not applied and (not (shift or supp_shift) or not _ytd_shift_matters(
+                    _tax_year_of(period, defaults), old_ytd, old_ytd + shift, period.result.taxable_wages_fica,
+                    old_supp, old_supp + supp_shift, period.result.taxable_wages_fit)):
+                continue
+            record = period.record
+            for change in applied:
+                record = change.apply(record)
+            record = {**record, "ytd_wages": round(old_ytd + shift, 2)}
+            if supplemental:
+                record["ytd_supplemental_wages"] = round(old_supp + supp_shift, 2)
+            pay_type, kwargs, config = record_to_paycheck_args(record, defaults)
+            corrected = compute_paycheck(pay_type, **kwargs, config=config)
+            ytd_shift[year] = round(shift + corrected.taxable_wages_fica - period.result.taxable_wages_fica, 2)
+            if supplemental:
+                supplemental_shift[year] = round(
+                    supp_shift + corrected.taxable_wages_fit - period.result.taxable_wages_fit, 2)
+            if corrected.values_tuple() != period.result.values_tuple():
+                reason = "; ".join(c.reason for c in applied) if applied else "YTD carry-forward"
+                yield RetroLine(employee_id, period.period_end, reason, period.result, corrected, record)
+
+
+def retro_totals(lines: Iterable[RetroLine]) -> Dict[str, Dict[str, float]]:
+    """Sum of deltas per employee (the retro amounts to pay or recover)."""
+    totals: Dict[str, Dict[str, float]] = {}
+    for line in lines:
+        acc = totals.setdefault(line.employee_id, dict.fromkeys(DELTA_FIELDS, 0.0))
+        for name, value in line.deltas().items():
+            acc[name] = round(acc[name] + value, 2)
+    return totals
+
+
+def run_pay_history(
+    employee_id: str,
+    periods: Iterable[Tuple[date, Mapping[str, Any]]],
+    defaults: Optional[PayrollConfig] = None,
+) -> List[PayPeriod]:
+    """
+    Compute a run of ``(period_end, record)`` paychecks for one employee in order,
+    carrying ``ytd_wages`` (and, for supplemental-wage checks, ``ytd_supplemental_wages``)
+    forward within each calendar year, and return them as ``PayPeriod`` history
+    (e.g. to seed a history file or test retro changes).
+    Records without a ``year`` are taxed in the year of their ``period_end``.
+    """
+    defaults = defaults or PayrollConfig()
+    out: List[PayPeriod] = []
+    ytd: Dict[int, float] = defaultdict(float)
+    ytd_supplemental: Dict[int, float] = defaultdict(float)
+    for period_end, record in periods:
+        record = {"year": period_end.year, **record, "ytd_wages": round(ytd[period_end.year], 2)}
+        supplemental = _is_supplemental(record, defaults)
+        if supplemental:
+            record["ytd_supplemental_wages"] = round(ytd_supplemental[period_end.year], 2)
+        pay_type, kwargs, config = record_to_paycheck_args(record, defaults)
+        result = compute_paycheck(pay_type, **kwargs, config=config)
+        ytd[period_end.year] += result.taxable_wages_fica
+        if supplemental:
+            ytd_supplemental[period_end.year] += result.taxable_wages_fit
+        out.append(PayPeriod(employee_id, period_end, record, result))
+    return out
+
+
+def read_pay_history(path: str) -> Iterator[PayPeriod]:
+    """Stream ``PayPeriod`` entries from a JSON-lines history file (``-`` for stdin)."""
+    f = sys.stdin if path == "-" else open(path)
+    try:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+                yield PayPeriod(
+                    employee_id=str(data[ID_FIELD]),
+                    period_end=date.fromisoformat(data["period_end"]),
+                    record=data["record"],
+                    result=PaycheckResult(**{name: float(data["result"][name]) for name in RESULT_FIELDS}),
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                raise ValueError(f"{path}:{line_no}: invalid pay history entry ({e})") from None
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def write_pay_history(periods: Iterable[PayPeriod], out: TextIO) -> None:
+    for p in periods:
+        out.write(json.dumps({ID_FIELD: p.employee_id, "period_end": p.period_end.isoformat(),
+                              "record": p.record, "result": p.result.to_dict()}))
+        out.write("\n")
+
+
+def write_retro_csv(lines: Iterable[RetroLine], out: TextIO) -> int:
+    """Write one delta row per retro line; returns the row count."""
+    writer = csv.writer(out)
+    writer.writerow((ID_FIELD, "period_end", "reason") + tuple(f"delta_{name}" for name in DELTA_FIELDS))
+    count = 0
+    for line in lines:
+        deltas = line.deltas()
+        writer.writerow((line.employee_id, line.period_end.isoformat(), line.reason) + tuple(deltas[name] for name in DELTA_FIELDS))
+        count += 1
+    return count
+
+
+def main():
+    p = argparse.ArgumentParser(description="Recompute stored pay periods for a back-dated rate or hours change and print deltas.")
+    p.add_argument("history", help="Pay history JSON-lines file ('-' for stdin)")
+    p.add_argument("--effective", required=True, help="First period end date the change applies to (YYYY-MM-DD)")
+    p.add_argument("--through", default=None, help="Last period end date the change applies to (default: all later periods)")
+    p.add_argument("--employee-id", action="append", default=None, help="Limit the change to this employee (repeatable; default all)")
+    p.add_argument("--hourly-rate", type=float, default=None, help="New hourly rate")
+    p.add_argument("--salary", type=float, default=None, help="New salary per period")
+    p.add_argument("--raise-percent", type=float, default=None, help="Raise the stored rate/salary by this percent (e.g. 3)")
+    p.add_argument("--hours", type=float, default=None, help="Corrected regular hours")
+    p.add_argument("--overtime-hours", type=float, default=None, help="Corrected overtime hours")
+    p.add_argument("--reason", default="retro change", help="Reason text for the delta lines")
+    p.add_argument("--output", default=None, help="Write delta CSV here instead of stdout")
+    args = p.parse_args()
+
+    try:
+        change = RetroChange(
+            effective=date.fromisoformat(args.effective),
+            through=date.fromisoformat(args.through) if args.through else None,
+            employee_ids=frozenset(args.employee_id) if args.employee_id else None,
+            hourly_rate=args.hourly_rate,
+            salary=args.salary,
+            raise_percent=args.raise_percent,
+            hours=args.hours,
+            overtime_hours=args.overtime_hours,
+            reason=args.reason,
+        )
+        lines = compute_retro(read_pay_history(args.history), [change])
+        if args.output:
+            with open(args.output, "w", newline="") as f:
+                count = write_retro_csv(lines, f)
+        else:
+            count = write_retro_csv(lines, sys.stdout)
+    except (OSError, ValueError) as e:
+        p.error(str(e))
+    print(f"{count} period(s) changed", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""Long-running local payroll server speaking JSON lines.
+
+Starting the server once keeps the interpreter, tax tables and withholding cache
+warm, so callers that need one paycheck at a time (e.g. an HR system) skip the
+per-invocation startup of ``payroll_calculator.py``. It listens on a Unix socket
+or on a TCP port bound to localhost only; nothing leaves the machine.
+
+Each request is one JSON object per line; each response is one JSON line with the
+same ``id``:
+
+    {"id": 1, "record": {"pay_type": "hourly", "hourly_rate": 30, "hours": 80}}
+    {"id": 2, "records": [{...}, {...}]}          # batch: results in input order
+    {"id": 3, "record": {...}, "explain": true}   # adds the step-by-step text
+    {"id": 4, "op": "stats"}                      # request counts and latency percentiles
+    {"id": 5, "op": "ping"}
+
+Records use the ``payroll_pipeline`` record format (``compute_paycheck`` arguments
+and ``PayrollConfig`` fields). Requests on different connections are served
+concurrently; large batches yield to other connections between slices.
+
+    python tools/payroll_server.py --unix-socket /tmp/payroll.sock
+    python tools/payroll_server.py --port 8765
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+from payroll_calculator import PayrollConfig, compute_paycheck, render_explanation, withholding_cache_info
+from payroll_pipeline import ID_FIELD, record_to_paycheck_args
+from tax_params import DEFAULT_REGISTRY
+
+
+# Longest request line accepted (batched bodies can be large)
+MAX_LINE_BYTES = 64 * 1024 * 1024
+# Batch records computed between yields to the event loop
+YIELD_EVERY = 256
+
+
+class LatencyStats:
+    """Request latencies over a sliding window of the most recent ``window`` requests."""
+
+    def __init__(self, window: int = 10_000):
+        self._samples = deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentiles(self) -> Dict[str, float]:
+        samples = sorted(self._samples)
+        if not samples:
+            return {"count": 0}
+        out: Dict[str, float] = {"count": len(samples)}
+        for name, q in (("p50", 0.50), ("p90", 0.90), ("p99", 0.99)):
+            out[name] = round(samples[min(int(q * len(samples)), len(samples) - 1)] * 1000.0, 3)
+        out["max"] = round(samples[-1] * 1000.0, 3)
+        return out
+
+
+class PayrollServer:
+    """
+    Request handling and counters for the JSON-lines protocol. ``defaults`` fills in
+    fields a record leaves blank, as ``--batch-input`` does on the CLI.
+    """
+
+    def __init__(self, defaults: Optional[PayrollConfig] = None, default_pay_type: Optional[str] = None,
+                 *, latency_window: int = 10_000):
+        self.defaults = defaults or PayrollConfig()
+        self.default_pay_type = default_pay_type
+        self.latency = LatencyStats(latency_window)
+        self.started = time.monotonic()
+        self.requests = 0
+        self.records = 0
+        self.errors = 0
+
+    def warm_up(self) -> None:
+        """Load every tax year on file and run one paycheck so the first real request is not slow."""
+        for year in DEFAULT_REGISTRY.available_years():
+            DEFAULT_REGISTRY.get(year)
+        compute_paycheck("hourly", hourly_rate=20.0, hours=40.0, config=self.defaults)
+
+    def compute_record(self, record: Dict[str, Any], explain: bool = False) -> Dict[str, Any]:
+        """One record's response entry: the result fields (plus ``explanation``) or an ``error``."""
+        try:
+            pay_type, kwargs, config = record_to_paycheck_args(record, self.defaults, self.default_pay_type)
+            result = compute_paycheck(pay_type, **kwargs, config=config, trace=explain)
+        except (TypeError, ValueError) as e:
+            self.errors += 1
+            return {ID_FIELD: record.get(ID_FIELD), "error": str(e)}
+        self.records += 1
+        out: Dict[str, Any] = {ID_FIELD: record[ID_FIELD]} if ID_FIELD in record else {}
+        out.update(result.to_dict())
+        if explain:
+            out["explanation"] = render_explanation(result)
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        cache = withholding_cache_info()
+        return {
+            "uptime_seconds": round(time.monotonic() - self.started, 3),
+            "requests": self.requests,
+            "records": self.records,
+            "errors": self.errors,
+            "latency_ms": self.latency.percentiles(),
+            "withholding_cache": {"hits": cache.hits, "misses": cache.misses, "size": cache.currsize},
+            "tax_years": list(DEFAULT_REGISTRY.available_years()),
+        }
+
+    async def handle_message(self, message: Any) -> Dict[str, Any]:
+        """Answer one decoded request object."""
+        if not isinstance(message, dict):
+            self.errors += 1
+            return {"ok": False, "error": "request must be a JSON object"}
+        reply: Dict[str, Any] = {"id": message.get("id")}
+        op = message.get("op", "compute")
+        explain = bool(message.get("explain"))
+        if op == "ping":
+            reply["ok"] = True
+        elif op == "stats":
+            reply.update(ok=True, stats=self.stats())
+        elif op != "compute":
+            self.errors += 1
+            reply.update(ok=False, error=f"unknown op: {op}")
+        elif isinstance(message.get("records"), list):
+            results: List[Dict[str, Any]] = []
+            for i, record in enumerate(message["records"]):
+                if i and i % YIELD_EVERY == 0:
+                    await asyncio.sleep(0)  # let other connections in during large batches
+                results.append(self.compute_record(record, explain) if isinstance(record, dict)
+                               else {"error": "record must be a JSON object"})
+            reply.update(ok=True, results=results)
+        elif isinstance(message.get("record"), dict):
+            result = self.compute_record(message["record"], explain)
+            reply.update(ok="error" not in result, result=result)
+        else:
+            self.errors += 1
+            reply.update(ok=False, error="compute needs a 'record' object or a 'records' list")
+        return reply
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Line over MAX_LINE_BYTES: the stream cannot be resynchronised
+                    writer.write(b'{"ok": false, "error": "request line too long"}\n')
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                start = time.perf_counter()
+                try:
+                    reply = await self.handle_message(json.loads(line))
+                except json.JSONDecodeError as e:
+                    self.errors += 1
+                    reply = {"ok": False, "error": f"invalid JSON ({e})"}
+                self.requests += 1
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+                self.latency.add(time.perf_counter() - start)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, *, host: str = "127.0.0.1", port: Optional[int] = None,
+                    unix_socket: Optional[str] = None) -> asyncio.AbstractServer:
+        """Start listening on ``unix_socket`` or on ``host``:``port`` and return the asyncio server."""
+        if unix_socket:
+            return await asyncio.start_unix_server(self.handle_connection, path=unix_socket, limit=MAX_LINE_BYTES)
+        return await asyncio.start_server(self.handle_connection, host=host, port=port, limit=MAX_LINE_BYTES)
+
+
+class PayrollClient:
+    """Small blocking client for the JSON-lines protocol (one request at a time)."""
+
+    def __init__(self, *, host: str = "127.0.0.1", port: Optional[int] = None,
+                 unix_socket: Optional[str] = None, timeout: float = 30.0):
+        if unix_socket:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(timeout)
+            self._sock.connect(unix_socket)
+        else:
+            self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._file = self._sock.makefile("rwb")
+        self._next_id = 0
+
+    def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        self._next_id += 1
+        message = {"id": self._next_id, **message}
+        self._file.write(json.dumps(message).encode() + b"\n")
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("payroll server closed the connection")
+        return json.loads(line)
+
+    def compute(self, record: Dict[str, Any], explain: bool = False) -> Dict[str, Any]:
+        return self.request({"record": record, "explain": explain})
+
+    def compute_many(self, records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        return self.request({"records": list(records)})
+
+    def stats(self) -> Dict[str, Any]:
+        return self.request({"op": "stats"})["stats"]
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self) -> "PayrollClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+async def serve(server: PayrollServer, **listen: Any) -> None:
+    srv = await server.start(**listen)
+    where = ", ".join(str(s.getsockname()) for s in srv.sockets)
+    print(f"Payroll server listening on {where}", file=sys.stderr)
+    async with srv:
+        await srv.serve_forever()
+
+
+def main():
+    p = argparse.ArgumentParser(description="Serve compute_paycheck requests over a local JSON-lines socket.")
+    p.add_argument("--unix-socket", type=str, default=None, help="Listen on this Unix socket path")
+    p.add_argument("--host", type=str, default="127.0.0.1", help="TCP host (default 127.0.0.1; keep it local)")
+    p.add_argument("--port", type=int, default=8765, help="TCP port when --unix-socket is not given (default 8765)")
+    p.add_argument("--year", type=int, default=2025, help="Default tax year for records without one")
+    p.add_argument("--pay-type", choices=["hourly", "salary"], default=None, help="Default pay type for records without one")
+    args = p.parse_args()
+
+    server = PayrollServer(PayrollConfig(year=args.year), args.pay_type)
+    server.warm_up()
+    listen = {"unix_socket": args.unix_socket} if args.unix_socket else {"host": args.host, "port": args.port}
+    try:
+        asyncio.run(serve(server, **listen))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
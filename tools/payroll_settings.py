@@ -0,0 +1,141 @@
+"""Settings and saved employee profiles for the payroll GUI.
+
+Everything lives in one directory (``~/.payroll_gui`` by default):
+
+    settings.json            the form as last used, plus the selected profile name
+    profiles/<name>.json     one file per saved profile (name URL-quoted)
+
+Writes go to a temp file in the same directory that is then renamed over the
+target, so a crash mid-write never leaves a truncated file. A save whose JSON
+matches what is already on disk is skipped. Profiles are listed from the file
+names alone and each one is parsed the first time it is opened, so startup cost
+does not grow with the number of employees. Debouncing is left to the caller
+(the GUI submits saves to its ``BackgroundWorker`` with a delay).
+
+    store = SettingsStore()
+    form = store.load()
+    store.save_profile("E1 Jane Doe", form)
+    store.profile_names(), store.load_profile("E1 Jane Doe")
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+from urllib.parse import quote, unquote
+
+
+DEFAULT_DIR = Path.home() / ".payroll_gui"
+# Single-file settings written by earlier versions; read once if settings.json is missing
+LEGACY_FILE = Path.home() / ".payroll_gui_settings.json"
+
+
+def _dumps(data: Mapping[str, Any]) -> str:
+    return json.dumps(data, indent=2, sort_keys=True)
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write ``text`` to a temp file beside ``path``, fsync it, then rename it over ``path``."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class SettingsStore:
+    """GUI settings plus named profiles. Safe to call from the UI thread and a worker thread."""
+
+    def __init__(self, directory: Optional[Path] = None, legacy_file: Optional[Path] = LEGACY_FILE):
+        self.directory = Path(directory) if directory is not None else DEFAULT_DIR
+        self.settings_file = self.directory / "settings.json"
+        self.profiles_dir = self.directory / "profiles"
+        self.legacy_file = legacy_file
+        self._lock = threading.Lock()
+        # Last text read from or written to each file, to skip unchanged saves
+        self._on_disk: Dict[Path, str] = {}
+        self._profiles: Dict[str, Dict[str, Any]] = {}
+
+    def _read(self, path: Path) -> Dict[str, Any]:
+        text = path.read_text(encoding="utf-8")
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise ValueError(f"Settings file {path} is not valid JSON: {e}") from None
+        if not isinstance(data, dict):
+            raise ValueError(f"Settings file {path} does not hold a JSON object")
+        self._on_disk[path] = _dumps(data)
+        return data
+
+    def _write(self, path: Path, data: Mapping[str, Any]) -> bool:
+        text = _dumps(data)
+        with self._lock:
+            if self._on_disk.get(path) == text:
+                return False
+            atomic_write_text(path, text)
+            self._on_disk[path] = text
+            return True
+
+    def load(self) -> Dict[str, Any]:
+        """The saved form (``{}`` if nothing was saved yet)."""
+        if self.settings_file.exists():
+            return self._read(self.settings_file)
+        if self.legacy_file is not None and self.legacy_file.exists():
+            data = self._read(self.legacy_file)
+            self._on_disk.pop(self.legacy_file, None)
+            return data
+        return {}
+
+    def save(self, data: Mapping[str, Any]) -> bool:
+        """Write the form if it changed since the last load or save; returns whether it wrote."""
+        return self._write(self.settings_file, data)
+
+    def _profile_path(self, name: str) -> Path:
+        if not name.strip():
+            raise ValueError("Profile name cannot be blank")
+        return self.profiles_dir / f"{quote(name, safe=' ')}.json"
+
+    def profile_names(self) -> List[str]:
+        """Saved profile names, sorted (from file names only; nothing is parsed)."""
+        if not self.profiles_dir.is_dir():
+            return []
+        return sorted((unquote(p.stem) for p in self.profiles_dir.glob("*.json")), key=str.casefold)
+
+    def load_profile(self, name: str) -> Dict[str, Any]:
+        """One profile's fields, parsed on first use and cached."""
+        if name not in self._profiles:
+            path = self._profile_path(name)
+            if not path.exists():
+                raise ValueError(f"No saved profile named {name!r}")
+            self._profiles[name] = self._read(path)
+        return dict(self._profiles[name])
+
+    def save_profile(self, name: str, data: Mapping[str, Any]) -> bool:
+        """Create or overwrite a profile; returns whether it wrote (False if unchanged)."""
+        wrote = self._write(self._profile_path(name), data)
+        self._profiles[name] = dict(data)
+        return wrote
+
+    def delete_profile(self, name: str) -> bool:
+        path = self._profile_path(name)
+        self._profiles.pop(name, None)
+        with self._lock:
+            self._on_disk.pop(path, None)
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                return False
+        return True
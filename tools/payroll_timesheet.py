@@ -0,0 +1,312 @@
+"""Timesheet engine: day-level hours for many employees, parsed once into arrays.
+
+Records are streamed from CSV or JSON lines (see ``payroll_pipeline.read_employee_records``)
+with an ``employee_id`` plus either ``hours`` or a ``clock_in``/``clock_out`` punch pair,
+a ``date`` (ISO) or 0-based ``day`` within the pay period, and an optional pay ``rate``.
+Records without a date or day are taken as consecutive days per employee. Several
+records for the same day (split shifts, or different jobs) are summed. The result is a
+``Timesheet`` of compact NumPy arrays; ``compute_hours_breakdown`` turns it into
+regular/OT/DT hours per 7-day workweek for every employee in one vectorized pass, using
+the same rules as ``hours_from_daily``, and ``compute_timesheet_earnings`` adds pay with
+overtime on the blended regular rate (as ``daily_rates`` does for one paycheck):
+
+    python tools/payroll_timesheet.py punches.csv --ca-daily-ot --period-start 2025-01-06
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import sys
+from array import array
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, TextIO
+
+import numpy as np
+
+from payroll_calculator import CA_DAILY_DT_AFTER, CA_DAILY_OT_AFTER, WEEKLY_OT_AFTER
+from payroll_pipeline import ID_FIELD, is_blank, read_employee_records
+
+
+BREAKDOWN_FIELDS = ("regular_hours", "overtime_hours", "doubletime_hours")
+EARNINGS_FIELDS = BREAKDOWN_FIELDS + ("regular_pay", "overtime_pay", "doubletime_pay", "gross")
+
+
+@dataclass
+class Timesheet:
+    """
+    Day-level hours sorted by employee then day, one row per (employee, day).
+
+    Attributes:
+        employee_ids: Employee ids in first-seen order; ``employee`` indexes into it.
+        employee: Employee index per row (int32).
+        day: Day offset from the start of the pay period per row (int32); day 0 starts a workweek.
+        hours: Hours worked per row (float64).
+        period_start: Date of day 0 when the records carried dates.
+        rated_hours: Hours per row that carried their own ``rate`` (float64).
+        rated_pay: Straight-time pay (hours x rate) of those hours per row (float64).
+    """
+
+    employee_ids: List[str]
+    employee: np.ndarray
+    day: np.ndarray
+    hours: np.ndarray
+    period_start: Optional[date] = None
+    rated_hours: Optional[np.ndarray] = None
+    rated_pay: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.employee_ids)
+
+
+def _parse_clock(text: Any) -> datetime:
+    text = str(text).strip()
+    if "T" in text or " " in text:
+        return datetime.fromisoformat(text)
+    return datetime.strptime(text, "%H:%M")
+
+
+def _record_hours(record: Mapping[str, Any]) -> float:
+    if not is_blank(record.get("hours")):
+        return float(record["hours"])
+    if is_blank(record.get("clock_in")) or is_blank(record.get("clock_out")):
+        raise ValueError("needs hours or clock_in/clock_out")
+    start, end = _parse_clock(record["clock_in"]), _parse_clock(record["clock_out"])
+    seconds = (end - start).total_seconds()
+    if seconds < 0:
+        seconds += 24 * 3600  # HH:MM punches that cross midnight
+    return seconds / 3600.0
+
+
+def _record_date(record: Mapping[str, Any]) -> Optional[date]:
+    if not is_blank(record.get("date")):
+        return date.fromisoformat(str(record["date"]).strip()[:10])
+    clock_in = record.get("clock_in")
+    if not is_blank(clock_in) and ("T" in str(clock_in) or " " in str(clock_in).strip()):
+        return _parse_clock(clock_in).date()
+    return None
+
+
+def load_timesheet(records: Iterable[Mapping[str, Any]], *, period_start: Optional[date] = None) -> Timesheet:
+    """
+    Build a ``Timesheet`` from day or punch records in a single streaming pass.
+    ``period_start`` anchors day 0 (and so the workweeks) for dated records; it
+    defaults to the earliest date seen.
+    """
+    index: Dict[str, int] = {}
+    employee = array("i")
+    position = array("q")  # date ordinal, explicit day, or per-employee sequence number
+    hours = array("d")
+    rated = array("d")
+    seen: Dict[int, int] = {}
+    mode = None
+    for n, record in enumerate(records, start=1):
+        emp_id = str(record.get(ID_FIELD) or "").strip()
+        try:
+            if not emp_id:
+                raise ValueError(f"missing {ID_FIELD}")
+            emp = index.setdefault(emp_id, len(index))
+            when = _record_date(record)
+            if when is not None:
+                kind, pos = "date", when.toordinal()
+            elif not is_blank(record.get("day")):
+                kind, pos = "day", int(float(record["day"]))
+            else:
+                kind, pos = "sequence", seen.get(emp, 0)
+            if mode is None:
+                mode = kind
+            elif kind != mode:
+                raise ValueError(f"mixes {kind} records with {mode} records")
+            seen[emp] = seen.get(emp, 0) + 1
+            worked = _record_hours(record)
+            if worked < 0:
+                raise ValueError("hours cannot be negative")
+            rate = np.nan if is_blank(record.get("rate")) else float(record["rate"])
+        except ValueError as e:
+            raise ValueError(f"Timesheet record {n} ({emp_id or 'no id'}): {e}") from None
+        employee.append(emp)
+        position.append(pos)
+        hours.append(worked)
+        rated.append(rate)
+
+    emp_arr = np.frombuffer(employee, dtype=np.int32) if employee else np.zeros(0, dtype=np.int32)
+    pos_arr = np.frombuffer(position, dtype=np.int64) if position else np.zeros(0, dtype=np.int64)
+    hrs_arr = np.frombuffer(hours, dtype=np.float64) if hours else np.zeros(0)
+    rate_arr = np.frombuffer(rated, dtype=np.float64) if rated else np.zeros(0)
+    has_rate = ~np.isnan(rate_arr)
+    if mode == "date":
+        start = period_start.toordinal() if period_start is not None else int(pos_arr.min())
+        pos_arr = pos_arr - start
+        period_start = date.fromordinal(start)
+    if (pos_arr < 0).any():
+        raise ValueError("Timesheet has days before the start of the pay period")
+
+    # Sum split shifts: one row per (employee, day), sorted by employee then day
+    span = int(pos_arr.max()) + 1 if len(pos_arr) else 1
+    keys, inverse = np.unique(emp_arr.astype(np.int64) * span + pos_arr, return_inverse=True)
+    inverse = inverse.ravel()
+    day_hours = np.bincount(inverse, weights=hrs_arr, minlength=len(keys))
+    rated_hours = np.bincount(inverse, weights=np.where(has_rate, hrs_arr, 0.0), minlength=len(keys))
+    rated_pay = np.bincount(inverse, weights=np.where(has_rate, hrs_arr * rate_arr, 0.0), minlength=len(keys))
+    return Timesheet(
+        employee_ids=list(index),
+        employee=(keys // span).astype(np.int32),
+        day=(keys % span).astype(np.int32),
+        hours=day_hours,
+        period_start=period_start if mode == "date" else None,
+        rated_hours=rated_hours,
+        rated_pay=rated_pay,
+    )
+
+
+def read_timesheet(path: str, fmt: Optional[str] = None, *, period_start: Optional[date] = None) -> Timesheet:
+    """Stream a CSV/JSON-lines timesheet file (``-`` for stdin) into a ``Timesheet``."""
+    return load_timesheet(read_employee_records(path, fmt), period_start=period_start)
+
+
+def _workweek_grids(timesheet: Timesheet, *values: np.ndarray):
+    """
+    Scatter each per-row array into a dense (workweek, weekday) grid.
+    Returns the grids followed by the employee index of each workweek row.
+    """
+    week = timesheet.day // 7
+    weeks_per_employee = int(week.max()) + 1
+    group_keys, group = np.unique(timesheet.employee.astype(np.int64) * weeks_per_employee + week, return_inverse=True)
+    rows, cols = group.ravel(), timesheet.day % 7
+    grids = []
+    for vals in values:
+        grid = np.zeros((len(group_keys), 7))
+        grid[rows, cols] = vals
+        grids.append(grid)
+    return (*grids, group_keys // weeks_per_employee)
+
+
+def _split_workweeks(grid: np.ndarray, use_ca_daily_ot: bool):
+    # Vectorized _split_workweek: one row per workweek, one column per weekday
+    if not use_ca_daily_ot:
+        total = grid.sum(axis=1)
+        week_reg = np.minimum(total, WEEKLY_OT_AFTER)
+        return week_reg, total - week_reg, np.zeros(len(total))
+    reg = np.minimum(grid, CA_DAILY_OT_AFTER)
+    ot = np.clip(grid - CA_DAILY_OT_AFTER, 0.0, CA_DAILY_DT_AFTER - CA_DAILY_OT_AFTER)
+    dt = np.maximum(grid - CA_DAILY_DT_AFTER, 0.0)
+    seventh = (grid > 0).all(axis=1)
+    last = grid[seventh, 6]
+    reg[seventh, 6] = 0.0
+    ot[seventh, 6] = np.minimum(last, CA_DAILY_OT_AFTER)
+    dt[seventh, 6] = np.maximum(last - CA_DAILY_OT_AFTER, 0.0)
+    # Regular hours past the weekly threshold become overtime
+    over = np.clip(np.cumsum(reg, axis=1) - WEEKLY_OT_AFTER, 0.0, reg)
+    return (reg - over).sum(axis=1), (ot + over).sum(axis=1), dt.sum(axis=1)
+
+
+def compute_hours_breakdown(timesheet: Timesheet, *, use_ca_daily_ot: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Regular, overtime and double-time hours per employee (arrays aligned with
+    ``timesheet.employee_ids``), keyed like ``hours_from_daily``. Days are grouped
+    into 7-day workweeks from day 0 and each workweek is split with the rules of
+    ``_split_workweek``; the workweek totals are then summed per employee.
+    """
+    n = len(timesheet.employee_ids)
+    if not len(timesheet.hours):
+        return {name: np.zeros(n) for name in BREAKDOWN_FIELDS}
+    grid, owner = _workweek_grids(timesheet, timesheet.hours)
+    return {
+        name: np.bincount(owner, weights=values, minlength=n)
+        for name, values in zip(BREAKDOWN_FIELDS, _split_workweeks(grid, use_ca_daily_ot))
+    }
+
+
+def compute_timesheet_earnings(
+    timesheet: Timesheet,
+    hourly_rates: Any = np.nan,
+    *,
+    use_ca_daily_ot: bool = False,
+    overtime_multiplier: float = 1.5,
+    doubletime_multiplier: float = 2.0,
+) -> Dict[str, np.ndarray]:
+    """
+    Hours and earnings per employee for a whole roster. ``hourly_rates`` (a scalar, an
+    array aligned with ``employee_ids`` or a mapping of employee id to rate) prices hours
+    whose record had no ``rate``. Per workweek, OT/DT are paid on the blended regular
+    rate (straight-time earnings / hours worked), matching ``compute_paycheck`` with
+    ``daily_rates``; for a single rate this is ordinary time-and-a-half.
+    """
+    n = len(timesheet.employee_ids)
+    if isinstance(hourly_rates, Mapping):
+        rates = np.array([float(hourly_rates.get(emp_id, np.nan)) for emp_id in timesheet.employee_ids])
+    else:
+        rates = np.broadcast_to(np.asarray(hourly_rates, dtype=np.float64), (n,))
+    if not len(timesheet.hours):
+        return {name: np.zeros(n) for name in EARNINGS_FIELDS}
+
+    rated_hours = timesheet.rated_hours if timesheet.rated_hours is not None else np.zeros(len(timesheet.hours))
+    rated_pay = timesheet.rated_pay if timesheet.rated_pay is not None else np.zeros(len(timesheet.hours))
+    unrated = timesheet.hours - rated_hours
+    needs_rate = (unrated > 0) & np.isnan(rates[timesheet.employee])
+    if needs_rate.any():
+        emp_id = timesheet.employee_ids[int(timesheet.employee[np.argmax(needs_rate)])]
+        raise ValueError(f"No hourly rate for employee {emp_id} (records without a rate)")
+    day_pay = rated_pay + np.where(unrated > 0, unrated * rates[timesheet.employee], 0.0)
+
+    grid, pay_grid, owner = _workweek_grids(timesheet, timesheet.hours, day_pay)
+    reg, ot, dt = _split_workweeks(grid, use_ca_daily_ot)
+    straight = pay_grid.sum(axis=1)
+    worked = grid.sum(axis=1)
+    regular_rate = np.divide(straight, worked, out=np.zeros(len(worked)), where=worked > 0)
+    week_values = (
+        reg,
+        ot,
+        dt,
+        straight - regular_rate * (ot + dt),
+        regular_rate * ot * overtime_multiplier,
+        regular_rate * dt * doubletime_multiplier,
+    )
+    out = {name: np.bincount(owner, weights=values, minlength=n) for name, values in zip(EARNINGS_FIELDS, week_values)}
+    out["gross"] = out["regular_pay"] + out["overtime_pay"] + out["doubletime_pay"]
+    return out
+
+
+def write_breakdown_csv(timesheet: Timesheet, breakdown: Mapping[str, np.ndarray], out: TextIO) -> None:
+    """Write one row per employee with the hours (and, if present, earnings) columns of ``breakdown``."""
+    names = EARNINGS_FIELDS if "gross" in breakdown else BREAKDOWN_FIELDS
+    writer = csv.writer(out)
+    writer.writerow((ID_FIELD,) + names)
+    digits = {name: 2 if name.endswith("pay") or name == "gross" else 4 for name in names}
+    writer.writerows(zip(timesheet.employee_ids, *(np.round(breakdown[name], digits[name]).tolist() for name in names)))
+
+
+def main():
+    p = argparse.ArgumentParser(description="Compute regular/OT/DT hours per employee from a day or punch timesheet.")
+    p.add_argument("input", help="Timesheet CSV or JSON-lines file ('-' for stdin)")
+    p.add_argument("--format", choices=["csv", "jsonl"], default=None, help="Input format (default: from file extension)")
+    p.add_argument("--ca-daily-ot", action="store_true", help="Apply CA daily, seventh-day and weekly overtime rules")
+    p.add_argument("--period-start", type=str, default=None, help="First day of the pay period (YYYY-MM-DD); starts the first workweek")
+    p.add_argument("--hourly-rate", type=float, default=None, help="Rate for records without a 'rate'; adds earnings columns (OT on the blended regular rate)")
+    p.add_argument("--earnings", action="store_true", help="Add earnings columns using only the records' own 'rate' values")
+    p.add_argument("--output", type=str, default=None, help="Write CSV here instead of stdout")
+    args = p.parse_args()
+
+    start = date.fromisoformat(args.period_start) if args.period_start else None
+    try:
+        timesheet = read_timesheet(args.input, args.format, period_start=start)
+    except (OSError, ValueError) as e:
+        p.error(str(e))
+    if args.hourly_rate is not None or args.earnings:
+        rate = np.nan if args.hourly_rate is None else args.hourly_rate
+        try:
+            breakdown = compute_timesheet_earnings(timesheet, rate, use_ca_daily_ot=args.ca_daily_ot)
+        except ValueError as e:
+            p.error(str(e))
+    else:
+        breakdown = compute_hours_breakdown(timesheet, use_ca_daily_ot=args.ca_daily_ot)
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            write_breakdown_csv(timesheet, breakdown, f)
+    else:
+        write_breakdown_csv(timesheet, breakdown, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""Annual withholding projection and W-4 / 401(k) what-if sweeps.
+
+``sweep`` projects one employee's pay over a year of periods under many
+``PayrollConfig`` variations at once (401(k) percent, W-4 Step 3 credits, Step 4c
+extra withholding, filing status, or any other config field) and returns a
+comparison table against the employee's current config. Scenarios are compared on
+take-home pay: the engine's ``net`` (gross less taxes and post-tax deductions)
+less the pre-tax 401(k), HSA and section 125 deductions.
+
+All scenarios and periods go through the columnar engine in one pass. Work
+shared between them is done once:
+
+- Earnings and FICA wages are computed once per scenario, so the YTD wages at
+  every period follow directly.
+- Periods whose YTD wages cannot change the outcome collapse to one computed row
+  per scenario. Such periods are the ones wholly below (or above) the Social
+  Security wage base and the Additional Medicare threshold. Only the periods
+  that cross a threshold are computed separately.
+
+    grid = scenario_grid(pretax_401k_percent=[0, 0.05, 0.1], filing_status=["single", "married"])
+    report = sweep("salary", grid, salary=4200, config=PayrollConfig(withholding_method="irs_percentage"))
+    print(format_whatif_table(report))
+
+    python tools/payroll_whatif.py --salary 4200 --sweep-401k 0,5%,10% --sweep-step3 0,2000 --sweep-extra 0,50
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import sys
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+import numpy as np
+
+from payroll_batch import BatchInputs, compute_payroll_batch, round_half_even, year_param
+from payroll_calculator import PayrollConfig, parse_rate
+
+
+# PayrollConfig fields the CLI sweeps, with their short labels
+SWEEP_LABELS = {
+    "pretax_401k_percent": "401k",
+    "w4_step3_dependents_credit": "step3",
+    "w4_step4c_extra_withholding": "extra",
+    "filing_status": "status",
+}
+# Annual totals reported per scenario (result field -> column)
+TOTAL_FIELDS = ("gross", "social_security", "medicare", "federal_income_tax", "state_income_tax",
+                "posttax_deductions", "net")
+_CONFIG_FIELDS = {f.name for f in fields(PayrollConfig)}
+
+
+@dataclass
+class WhatIfScenario:
+    """
+    One scenario's year: its config overrides, annual totals, the range of per-period
+    take-home pay and the change in annual take-home against the current config.
+    """
+
+    overrides: Dict[str, Any]
+    periods: int
+    gross: float
+    pretax_401k: float
+    pretax_deductions: float
+    social_security: float
+    medicare: float
+    federal_income_tax: float
+    state_income_tax: float
+    posttax_deductions: float
+    net: float
+    take_home: float
+    min_period_take_home: float
+    max_period_take_home: float
+    take_home_change: float = 0.0
+
+    @property
+    def label(self) -> str:
+        if not self.overrides:
+            return "current"
+        return ", ".join(f"{SWEEP_LABELS.get(name, name)} {_format_value(name, value)}"
+                         for name, value in self.overrides.items())
+
+
+@dataclass
+class WhatIfReport:
+    """A sweep's baseline (the config as given), its scenarios and how many paychecks the engine computed."""
+
+    baseline: WhatIfScenario
+    scenarios: List[WhatIfScenario]
+    paychecks_computed: int
+    paychecks_projected: int
+
+
+def _format_value(name: str, value: Any) -> str:
+    if name.endswith("_percent") or name.endswith("_rate"):
+        return f"{float(value) * 100:g}%"
+    if isinstance(value, float):
+        return f"{value:,.2f}".rstrip("0").rstrip(".")
+    return str(value)
+
+
+def scenario_grid(**axes: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Every combination of the given ``PayrollConfig`` field values, as override dicts."""
+    unknown = set(axes) - _CONFIG_FIELDS
+    if unknown:
+        raise ValueError(f"Not PayrollConfig fields: {', '.join(sorted(unknown))}")
+    names = list(axes)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(list(v) for v in axes.values()))]
+
+
+def sweep(
+    pay_type: str,
+    scenarios: Iterable[Dict[str, Any]],
+    *,
+    config: Optional[PayrollConfig] = None,
+    periods: Optional[int] = None,
+    hourly_rate: Optional[float] = None,
+    hours: Optional[float] = None,
+    overtime_hours: Optional[float] = None,
+    doubletime_hours: Optional[float] = None,
+    salary: Optional[float] = None,
+) -> WhatIfReport:
+    """
+    Project ``periods`` paychecks (default: the config's pay periods per year) with the
+    same earnings, starting from ``config.ytd_wages`` and carrying YTD wages forward,
+    for ``config`` itself and for each scenario (a dict of ``PayrollConfig`` overrides).
+    Results match running ``compute_paycheck`` period by period.
+    """
+    base = config or PayrollConfig()
+    scenarios = [dict(s) for s in scenarios]
+    unknown = set().union(*scenarios) - _CONFIG_FIELDS if scenarios else set()
+    if unknown:
+        raise ValueError(f"Not PayrollConfig fields: {', '.join(sorted(unknown))}")
+    n_periods = int(periods or base.pay_periods_per_year)
+    if n_periods < 1:
+        raise ValueError("periods must be at least 1")
+
+    # Row 0 is the baseline; overridden fields become columns, everything else comes from `base`
+    all_overrides = [{}] + scenarios
+    columns: Dict[str, Any] = {"pay_type": np.array([pay_type] * len(all_overrides))}
+    for name in dict.fromkeys(name for s in scenarios for name in s):
+        columns[name] = np.array([s.get(name, getattr(base, name)) for s in all_overrides])
+    earnings = {"hourly_rate": hourly_rate, "hours": hours, "overtime_hours": overtime_hours,
+                "doubletime_hours": doubletime_hours, "salary": salary}
+    for name, value in earnings.items():
+        if value is not None:
+            columns[name] = float(value)
+
+    # FICA wages do not depend on YTD, so one period per scenario gives every period's YTD
+    first = compute_payroll_batch(columns, config=base)
+    inputs = BatchInputs(columns, base)
+    fica = first["taxable_wages_fica"]
+    ytd = round_half_even((inputs.num_or_zero("ytd_wages")[:, None] + fica[:, None] * np.arange(n_periods)).ravel())
+
+    # YTD only matters through the SS wage base and the Additional Medicare threshold:
+    # periods with the same clipped YTD on both produce identical paychecks
+    year = inputs.num("year").astype(int)
+    scenario_of = np.repeat(np.arange(len(all_overrides)), n_periods)
+    f = fica[scenario_of]
+    wage_base = year_param(year, "ss_wage_base")[scenario_of]
+    threshold = year_param(year, "addl_medicare_threshold")[scenario_of]
+    key = np.column_stack((scenario_of, np.clip(ytd, wage_base - f, wage_base), np.clip(ytd, threshold - f, threshold)))
+    _, first_row, inverse = np.unique(key, axis=0, return_index=True, return_inverse=True)
+    rows = scenario_of[first_row]
+    unique_columns = {name: (value[rows] if np.ndim(value) else value) for name, value in columns.items()}
+    unique_columns["ytd_wages"] = ytd[first_row]
+    computed = compute_payroll_batch(unique_columns, config=base)
+
+    shape = (len(all_overrides), n_periods)
+    per_period = {name: computed[name][inverse.reshape(-1)].reshape(shape) for name in computed}
+    totals = {name: round_half_even(per_period[name].sum(axis=1)) for name in TOTAL_FIELDS}
+    pretax_401k = round_half_even((per_period["taxable_wages_fica"] - per_period["taxable_wages_fit"]).sum(axis=1))
+    pretax = round_half_even((per_period["gross"] - per_period["taxable_wages_fit"]).ravel()).reshape(shape)
+    take_home = round_half_even((per_period["net"] - pretax).ravel()).reshape(shape)
+    pretax_total = round_half_even(pretax.sum(axis=1))
+    take_home_total = round_half_even(take_home.sum(axis=1))
+    results = [
+        WhatIfScenario(
+            overrides=overrides,
+            periods=n_periods,
+            pretax_401k=float(pretax_401k[i]),
+            pretax_deductions=float(pretax_total[i]),
+            take_home=float(take_home_total[i]),
+            min_period_take_home=float(take_home[i].min()),
+            max_period_take_home=float(take_home[i].max()),
+            **{name: float(totals[name][i]) for name in TOTAL_FIELDS},
+        )
+        for i, overrides in enumerate(all_overrides)
+    ]
+    for r in results:
+        r.take_home_change = round(r.take_home - results[0].take_home, 2)
+    return WhatIfReport(results[0], results[1:], len(first_row) + len(all_overrides), shape[0] * shape[1])
+
+
+_TABLE_COLUMNS = (
+    ("401(k)", "pretax_401k"),
+    ("Federal", "federal_income_tax"),
+    ("State", "state_income_tax"),
+    ("FICA", None),
+    ("Take-home", "take_home"),
+    ("Change", "take_home_change"),
+)
+
+
+def _row_values(s: WhatIfScenario) -> List[float]:
+    return [round(s.social_security + s.medicare, 2) if attr is None else getattr(s, attr) for _, attr in _TABLE_COLUMNS]
+
+
+def format_whatif_table(report: WhatIfReport, *, sort_by: Optional[str] = None, top: Optional[int] = None) -> str:
+    """
+    Annual comparison table: the current config first, then the scenarios (in grid
+    order, or descending by ``sort_by``, e.g. ``"take_home"``), at most ``top`` of them.
+    """
+    rows = list(report.scenarios)
+    if sort_by:
+        rows.sort(key=lambda s: getattr(s, sort_by), reverse=True)
+    if top is not None:
+        rows = rows[:top]
+    rows = [report.baseline] + rows
+    width = max(len(s.label) for s in rows)
+    header = f"{'Scenario':<{width}}  " + "  ".join(f"{name:>12}" for name, _ in _TABLE_COLUMNS)
+    lines = [f"Annual projection over {report.baseline.periods} periods", header, "-" * len(header)]
+    for s in rows:
+        values = _row_values(s)
+        cells = [f"{v:>12,.2f}" for v in values[:-1]] + [f"{values[-1]:>+12,.2f}"]
+        lines.append(f"{s.label:<{width}}  " + "  ".join(cells))
+    return "\n".join(lines)
+
+
+def write_whatif_csv(report: WhatIfReport, out: TextIO) -> int:
+    """One row per scenario (the current config first) with every annual total; returns the row count."""
+    override_names = list(dict.fromkeys(name for s in report.scenarios for name in s.overrides))
+    value_names = ["periods", "gross", "pretax_401k", "pretax_deductions", "social_security", "medicare",
+                   "federal_income_tax", "state_income_tax", "posttax_deductions", "net", "take_home",
+                   "min_period_take_home", "max_period_take_home", "take_home_change"]
+    writer = csv.writer(out)
+    writer.writerow(["scenario"] + override_names + value_names)
+    rows = [report.baseline] + report.scenarios
+    for s in rows:
+        writer.writerow([s.label] + [s.overrides.get(name, "") for name in override_names]
+                        + [getattr(s, name) for name in value_names])
+    return len(rows)
+
+
+def _split(text: Optional[str], parse) -> Optional[List[Any]]:
+    if not text:
+        return None
+    return [parse(part.strip()) for part in text.split(",") if part.strip()]
+
+
+def main():
+    p = argparse.ArgumentParser(description="Compare a year of take-home pay under W-4 and 401(k) variations.")
+    p.add_argument("--pay-type", choices=["hourly", "salary"], default=None, help="Default: salary if --salary is given")
+    p.add_argument("--hourly-rate", type=float, default=None)
+    p.add_argument("--hours", type=float, default=None, help="Regular hours per period")
+    p.add_argument("--overtime-hours", type=float, default=None, help="Overtime hours per period")
+    p.add_argument("--salary", type=float, default=None, help="Salary per pay period")
+    p.add_argument("--periods", type=int, default=None, help="Periods to project (default: pay periods per year)")
+    p.add_argument("--year", type=int, default=2025)
+    p.add_argument("--ytd-wages", type=float, default=0.0, help="YTD FICA wages before the first projected period")
+    p.add_argument("--withholding-method", choices=["flat", "irs_percentage"], default="irs_percentage")
+    p.add_argument("--federal-rate", type=str, default=None, help="Flat federal rate, e.g. 0.22 or 22%%")
+    p.add_argument("--state-rate", type=str, default=None, help="Flat state rate, e.g. 0.05 or 5%%")
+    p.add_argument("--work-state", type=str, default="", help="Work state for table-based state withholding")
+    p.add_argument("--resident-state", type=str, default="", help="Resident state, if different")
+    p.add_argument("--filing-status", choices=["single", "married", "head"], default="single")
+    p.add_argument("--pay-periods", type=int, default=26)
+    p.add_argument("--pretax-401k-percent", type=str, default=None, help="Current 401(k) percent of gross, e.g. 0.05 or 5%%")
+    p.add_argument("--w4-step3", type=float, default=0.0, help="Current Step 3 dependents credit (annual)")
+    p.add_argument("--w4-step4c", type=float, default=0.0, help="Current Step 4(c) extra withholding per period")
+    p.add_argument("--sweep-401k", type=str, default=None, help="401(k) percents to try, e.g. 0,4%%,6%%,10%%")
+    p.add_argument("--sweep-step3", type=str, default=None, help="Step 3 credits to try, e.g. 0,2000,4000")
+    p.add_argument("--sweep-extra", type=str, default=None, help="Step 4(c) extra withholding to try, e.g. 0,25,50")
+    p.add_argument("--sweep-filing-status", type=str, default=None, help="Filing statuses to try, e.g. single,married")
+    p.add_argument("--sort", choices=["take_home", "federal_income_tax", "pretax_401k"], default=None, help="Sort scenarios (descending)")
+    p.add_argument("--top", type=int, default=None, help="Show only the first N scenarios")
+    p.add_argument("--output", type=str, default=None, help="Write the full comparison as CSV here")
+    args = p.parse_args()
+
+    pay_type = args.pay_type or ("salary" if args.salary is not None else "hourly")
+    config = PayrollConfig(
+        year=args.year,
+        ytd_wages=args.ytd_wages,
+        withholding_method=args.withholding_method,
+        federal_rate=parse_rate(args.federal_rate),
+        state_rate=parse_rate(args.state_rate),
+        work_state=args.work_state,
+        resident_state=args.resident_state,
+        filing_status=args.filing_status,
+        pay_periods_per_year=args.pay_periods,
+        pretax_401k_percent=parse_rate(args.pretax_401k_percent) or 0.0,
+        w4_step3_dependents_credit=args.w4_step3,
+        w4_step4c_extra_withholding=args.w4_step4c,
+    )
+    axes = {
+        "pretax_401k_percent": _split(args.sweep_401k, parse_rate),
+        "w4_step3_dependents_credit": _split(args.sweep_step3, float),
+        "w4_step4c_extra_withholding": _split(args.sweep_extra, float),
+        "filing_status": _split(args.sweep_filing_status, str),
+    }
+    try:
+        grid = scenario_grid(**{name: values for name, values in axes.items() if values})
+        report = sweep(pay_type, grid if any(axes.values()) else [], config=config, periods=args.periods,
+                       hourly_rate=args.hourly_rate, hours=args.hours, overtime_hours=args.overtime_hours,
+                       salary=args.salary)
+        if args.output:
+            with open(args.output, "w", newline="") as f:
+                write_whatif_csv(report, f)
+    except (OSError, ValueError) as e:
+        p.error(str(e))
+    print(format_whatif_table(report, sort_by=args.sort, top=args.top))
+    print(f"{len(report.scenarios)} scenario(s); {report.paychecks_computed} of {report.paychecks_projected} "
+          "paychecks computed", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
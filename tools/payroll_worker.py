@@ -0,0 +1,180 @@
+"""Background job runner for the Tk front ends.
+
+Tk widgets may only be touched from the main thread, so slow work (paycheck
+calculations, explanation rendering, exports, settings writes) runs on one worker
+thread, and finished results come back through a queue that the UI drains with
+``after()`` polling:
+
+    worker = BackgroundWorker()
+    worker.submit("calculate", run, request, on_done=show, on_error=report, delay=0.1)
+    root.after(50, poll)  # poll() calls worker.poll() and re-schedules itself
+
+Jobs are keyed by channel. A new submission on a channel replaces the job still
+waiting there, so rapid re-clicks only compute the latest inputs once ``delay``
+seconds pass without another one. A job already running on the channel is
+cancelled: its ``CancelToken`` is set and its result is dropped. Job functions are
+called as ``fn(token, *args)`` and can call ``token.check()`` between steps to
+stop early. This module does not import tkinter.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class Cancelled(Exception):
+    """Raised by ``CancelToken.check`` once the job has been cancelled or superseded."""
+
+
+class CancelToken:
+    """Cancellation flag shared between the UI thread and one job."""
+
+    __slots__ = ("_event",)
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise Cancelled()
+
+
+@dataclass
+class _Job:
+    channel: str
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...]
+    on_done: Optional[Callable[[Any], None]]
+    on_error: Optional[Callable[[Exception], None]]
+    due: float
+    generation: int
+    token: CancelToken = field(default_factory=CancelToken)
+
+
+class BackgroundWorker:
+    """One worker thread running the latest job per channel; results are delivered by ``poll``."""
+
+    def __init__(self, name: str = "payroll-worker"):
+        self._cond = threading.Condition()
+        self._pending: Dict[str, _Job] = {}
+        self._running: Optional[_Job] = None
+        self._generation: Dict[str, int] = {}
+        self._results: "queue.SimpleQueue[Tuple[_Job, bool, Any]]" = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        channel: str,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_done: Optional[Callable[[Any], None]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+        delay: float = 0.0,
+    ) -> CancelToken:
+        """
+        Run ``fn(token, *args)`` on the worker after ``delay`` seconds, superseding
+        earlier work on ``channel``. ``on_done(result)`` or ``on_error(exception)``
+        is called from ``poll``, on the polling thread.
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BackgroundWorker has been shut down")
+            generation = self._supersede(channel)
+            job = _Job(channel, fn, args, on_done, on_error, time.monotonic() + delay, generation)
+            self._pending[channel] = job
+            self._cond.notify()
+        return job.token
+
+    def cancel(self, channel: str) -> bool:
+        """Drop the job waiting on ``channel`` and cancel the running one; True if there was either."""
+        with self._cond:
+            had_work = channel in self._pending or (self._running is not None and self._running.channel == channel)
+            self._supersede(channel)
+            return had_work
+
+    def busy(self, channel: Optional[str] = None) -> bool:
+        """Whether a job (on ``channel``, or on any channel) is waiting or running."""
+        with self._cond:
+            if channel is None:
+                return bool(self._pending) or self._running is not None
+            return channel in self._pending or (self._running is not None and self._running.channel == channel)
+
+    def poll(self) -> int:
+        """Call the callbacks of finished, still-current jobs; returns how many were delivered."""
+        delivered = 0
+        while True:
+            try:
+                job, ok, value = self._results.get_nowait()
+            except queue.Empty:
+                return delivered
+            with self._cond:
+                current = not job.token.cancelled and self._generation.get(job.channel) == job.generation
+            if not current:
+                continue
+            callback = job.on_done if ok else job.on_error
+            if callback is not None:
+                callback(value)
+            delivered += 1
+
+    def shutdown(self, timeout: Optional[float] = 1.0) -> None:
+        """Cancel everything and stop the worker thread (waiting up to ``timeout`` seconds)."""
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            if self._running is not None:
+                self._running.token.cancel()
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def _supersede(self, channel: str) -> int:
+        # Caller holds the lock
+        generation = self._generation.get(channel, 0) + 1
+        self._generation[channel] = generation
+        self._pending.pop(channel, None)
+        if self._running is not None and self._running.channel == channel:
+            self._running.token.cancel()
+        return generation
+
+    def _next_job(self) -> Optional[_Job]:
+        with self._cond:
+            while not self._closed:
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+                job = min(self._pending.values(), key=lambda j: j.due)
+                wait = job.due - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+                del self._pending[job.channel]
+                self._running = job
+                return job
+            return None
+
+    def _run(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            try:
+                self._results.put((job, True, job.fn(job.token, *job.args)))
+            except Cancelled:
+                pass
+            except Exception as e:  # delivered to on_error on the UI thread
+                self._results.put((job, False, e))
+            finally:
+                with self._cond:
+                    self._running = None
@@ -0,0 +1,164 @@
+"""State income tax withholding from per-state tables.
+
+Each year's state tables live in ``tax_tables/states/<year>.json`` and are loaded
+and compiled once per year through a ``TaxParameterRegistry``, as the federal
+tables are. Every state has one of three table types:
+
+- ``none``: no wage withholding (TX, FL, WA, ...)
+- ``flat``: one rate
+- ``brackets``: a progressive schedule per filing status
+
+Flat and bracket states may also define a standard deduction per filing status,
+a deduction per allowance and a credit per allowance. Withholding annualizes the
+period's wages, subtracts the deductions, taxes the rest on the schedule,
+subtracts allowance credits and divides back to the period, like the federal
+percentage method.
+
+Work and resident state allocation: tax is withheld for the work state. If the
+employee lives in another state, that state gets its own tax less the credit for
+tax withheld to the work state. The exception is when the work state has a
+reciprocity agreement with the resident state: then only the resident state's
+tax is withheld.
+"""
+
+from __future__ import annotations
+
+import os
+from bisect import bisect_left
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import FrozenSet, Mapping, Tuple
+
+from tax_params import TAX_TABLES_DIR, BracketTable, TaxParameterRegistry, compile_brackets
+
+STATE_TABLES_DIR = os.path.join(TAX_TABLES_DIR, "states")
+TABLE_TYPES = ("none", "flat", "brackets")
+STATE_CACHE_SIZE = 8192
+
+
+@dataclass(frozen=True)
+class StateTable:
+    """Compiled withholding table for one state. Unknown filing statuses fall back to ``single``."""
+
+    code: str
+    name: str
+    kind: str
+    standard_deductions: Mapping[str, float]
+    bracket_tables: Mapping[str, BracketTable]
+    allowance_deduction: float
+    allowance_credit: float
+    reciprocity: FrozenSet[str]
+
+    def standard_deduction(self, filing_status: str) -> float:
+        value = self.standard_deductions.get(filing_status)
+        return value if value is not None else self.standard_deductions.get("single", 0.0)
+
+    def bracket_table(self, filing_status: str) -> BracketTable:
+        table = self.bracket_tables.get(filing_status)
+        return table if table is not None else self.bracket_tables["single"]
+
+    def annual_tax(self, annual_wages: float, filing_status: str, allowances: int = 0) -> float:
+        """Annual withholding on ``annual_wages`` before dividing back to the pay period."""
+        if self.kind == "none":
+            return 0.0
+        taxable = max(annual_wages - self.standard_deduction(filing_status) - allowances * self.allowance_deduction, 0.0)
+        table = self.bracket_table(filing_status)
+        i = max(bisect_left(table.thresholds, taxable) - 1, 0)
+        tax = table.cumulative_tax[i] + max(taxable - table.thresholds[i], 0) * table.rates[i]
+        return max(tax - allowances * self.allowance_credit, 0.0)
+
+
+@dataclass(frozen=True)
+class StateYearTables:
+    year: int
+    version: str
+    states: Mapping[str, StateTable]
+
+    def state(self, code: str) -> StateTable:
+        table = self.states.get(code.upper())
+        if table is None:
+            raise ValueError(f"No state withholding table for {code!r} in {self.year} (have: {', '.join(sorted(self.states))})")
+        return table
+
+
+def parse_state_table(code: str, data: Mapping) -> StateTable:
+    kind = data.get("type")
+    if kind not in TABLE_TYPES:
+        raise ValueError(f"{code}: type must be one of {', '.join(TABLE_TYPES)}")
+    if kind == "flat":
+        schedules = {"single": [(0.0, float(data["rate"]))]}
+    elif kind == "brackets":
+        schedules = data["brackets"]
+        if "single" not in schedules:
+            raise ValueError(f"{code}: brackets must define the 'single' filing status")
+    else:
+        schedules = {"single": [(0.0, 0.0)]}
+    return StateTable(
+        code=code,
+        name=str(data.get("name", code)),
+        kind=kind,
+        standard_deductions=MappingProxyType({s: float(v) for s, v in data.get("standard_deduction", {}).items()}),
+        bracket_tables=MappingProxyType({s: compile_brackets(b) for s, b in schedules.items()}),
+        allowance_deduction=float(data.get("allowance_deduction", 0.0)),
+        allowance_credit=float(data.get("allowance_credit", 0.0)),
+        reciprocity=frozenset(str(c).upper() for c in data.get("reciprocity", ())),
+    )
+
+
+def parse_state_year(data: Mapping) -> StateYearTables:
+    """Build ``StateYearTables`` from the decoded contents of a state data file."""
+    try:
+        states = {code.upper(): parse_state_table(code.upper(), table) for code, table in data["states"].items()}
+        return StateYearTables(int(data["year"]), str(data.get("version", data["year"])), MappingProxyType(states))
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid state tax table for year {data.get('year', '?')}: {e}") from None
+
+
+STATE_REGISTRY = TaxParameterRegistry(STATE_TABLES_DIR, parse=parse_state_year)
+
+
+def state_tables(year: int) -> StateYearTables:
+    """Compiled state tables for ``year`` (years without a file use the most recent one)."""
+    return STATE_REGISTRY.get(year)
+
+
+@lru_cache(maxsize=STATE_CACHE_SIZE)
+def _period_tax(code: str, wages: float, filing_status: str, pay_periods_per_year: int, allowances: int, year: int) -> float:
+    table = state_tables(year).state(code)
+    return round(table.annual_tax(wages * pay_periods_per_year, filing_status, allowances) / pay_periods_per_year, 2)
+
+
+def state_withholding(
+    wages: float,
+    *,
+    work_state: str,
+    resident_state: str = "",
+    filing_status: str = "single",
+    pay_periods_per_year: int = 26,
+    allowances: int = 0,
+    year: int = 2025,
+) -> Tuple[float, float]:
+    """
+    State withholding on one period's ``wages`` as ``(work_state_tax, resident_state_tax)``.
+    Either state may be blank (same as the other). Raises ``ValueError`` for a state
+    without a table. Results are memoized per wage and profile.
+    """
+    work_state = (work_state or "").strip().upper()
+    resident_state = (resident_state or "").strip().upper()
+    work = work_state or resident_state
+    resident = resident_state or work
+    if not work:
+        return 0.0, 0.0
+    profile = (filing_status, pay_periods_per_year, int(allowances or 0), year)
+    if resident != work and resident in state_tables(year).state(work).reciprocity:
+        return 0.0, _period_tax(resident, wages, *profile)
+    work_tax = _period_tax(work, wages, *profile)
+    if resident == work:
+        return work_tax, 0.0
+    # Resident state credits the tax withheld for the work state
+    return work_tax, round(max(_period_tax(resident, wages, *profile) - work_tax, 0.0), 2)
+
+
+def state_cache_info():
+    return _period_tax.cache_info()
@@ -0,0 +1,156 @@
+"""Versioned, per-year tax parameters for the payroll tools.
+
+Each tax year lives in its own data file (``tax_tables/<year>.json``) holding the
+FICA rates and wage base, supplemental-wage withholding rates, standard deductions
+and annual bracket schedules.
+A file is parsed and compiled into an immutable ``TaxYearParams`` the first time
+that year is requested and cached afterwards, so a batch spanning several years
+pays the load cost once per year rather than once per paycheck.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+# os.path rather than pathlib: this module is on every CLI run's import path
+TAX_TABLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tax_tables")
+
+
+class BracketTable(NamedTuple):
+    """
+    Bracket schedule compiled for lookup: ``cumulative_tax[i]`` is the tax owed on
+    income exactly at ``thresholds[i]``, and income above it is taxed at ``rates[i]``.
+    """
+
+    thresholds: Tuple[float, ...]
+    cumulative_tax: Tuple[float, ...]
+    rates: Tuple[float, ...]
+
+
+def compile_brackets(brackets: Sequence[Sequence[float]]) -> BracketTable:
+    """Compile ``[(threshold, rate), ...]`` (ascending thresholds) into a ``BracketTable``."""
+    thresholds = tuple(float(thr) for thr, _ in brackets)
+    rates = tuple(float(rate) for _, rate in brackets)
+    cumulative = [0.0]
+    for i in range(1, len(brackets)):
+        cumulative.append(cumulative[-1] + (thresholds[i] - thresholds[i - 1]) * rates[i - 1])
+    return BracketTable(thresholds, tuple(cumulative), rates)
+
+
+@dataclass(frozen=True)
+class TaxYearParams:
+    """Compiled tax parameters for one year. Unknown filing statuses fall back to ``single``."""
+
+    year: int
+    version: str
+    ss_rate: float
+    ss_wage_base: float
+    medicare_rate: float
+    addl_medicare_rate: float
+    addl_medicare_threshold: float
+    supplemental_rate: float
+    supplemental_mandatory_rate: float
+    supplemental_mandatory_threshold: float
+    standard_deductions: Mapping[str, float]
+    brackets: Mapping[str, Tuple[Tuple[float, float], ...]]
+    bracket_tables: Mapping[str, BracketTable]
+
+    def standard_deduction(self, filing_status: str) -> float:
+        value = self.standard_deductions.get(filing_status)
+        return value if value is not None else self.standard_deductions["single"]
+
+    def bracket_table(self, filing_status: str) -> BracketTable:
+        table = self.bracket_tables.get(filing_status)
+        return table if table is not None else self.bracket_tables["single"]
+
+    def bracket_schedule(self, filing_status: str) -> Tuple[Tuple[float, float], ...]:
+        schedule = self.brackets.get(filing_status)
+        return schedule if schedule is not None else self.brackets["single"]
+
+
+def parse_tax_year(data: Mapping) -> TaxYearParams:
+    """Build ``TaxYearParams`` from the decoded contents of a tax-table data file."""
+    try:
+        ss = data["social_security"]
+        medi = data["medicare"]
+        supplemental = data["supplemental"]
+        brackets = {
+            status: tuple((float(thr), float(rate)) for thr, rate in schedule)
+            for status, schedule in data["brackets"].items()
+        }
+        standard = {status: float(amount) for status, amount in data["standard_deduction"].items()}
+        if "single" not in brackets or "single" not in standard:
+            raise ValueError("tables must define the 'single' filing status")
+        return TaxYearParams(
+            year=int(data["year"]),
+            version=str(data.get("version", data["year"])),
+            ss_rate=float(ss["rate"]),
+            ss_wage_base=float(ss["wage_base"]),
+            medicare_rate=float(medi["rate"]),
+            addl_medicare_rate=float(medi["additional_rate"]),
+            addl_medicare_threshold=float(medi["additional_threshold"]),
+            supplemental_rate=float(supplemental["rate"]),
+            supplemental_mandatory_rate=float(supplemental["mandatory_rate"]),
+            supplemental_mandatory_threshold=float(supplemental["mandatory_threshold"]),
+            standard_deductions=MappingProxyType(standard),
+            brackets=MappingProxyType(brackets),
+            bracket_tables=MappingProxyType({status: compile_brackets(b) for status, b in brackets.items()}),
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid tax table for year {data.get('year', '?')}: {e}") from None
+
+
+class TaxParameterRegistry:
+    """
+    Loads ``<year>.json`` files from ``data_dir`` on demand and caches the compiled result.
+    Years without a data file fall back to the most recent year on file. ``parse``
+    compiles one decoded file (``parse_tax_year`` for the federal tables).
+    """
+
+    def __init__(self, data_dir: Union[str, "os.PathLike[str]"] = TAX_TABLES_DIR,
+                 parse: Optional[Callable[[Mapping], Any]] = None):
+        self.data_dir = os.fspath(data_dir)
+        self.parse = parse or parse_tax_year
+        self._cache: Dict[int, Any] = {}
+        self._years: Optional[Tuple[int, ...]] = None
+
+    def available_years(self) -> Tuple[int, ...]:
+        if self._years is None:
+            names = os.listdir(self.data_dir) if os.path.isdir(self.data_dir) else ()
+            stems = (name[:-5] for name in names if name.endswith(".json"))
+            self._years = tuple(sorted(int(stem) for stem in stems if stem.isdigit()))
+        return self._years
+
+    def resolve_year(self, year: int) -> int:
+        years = self.available_years()
+        if not years:
+            raise ValueError(f"No tax tables found in {self.data_dir}")
+        return year if year in years else years[-1]
+
+    def get(self, year: int) -> Any:
+        params = self._cache.get(year)
+        if params is None:
+            resolved = self.resolve_year(year)
+            params = self._cache.get(resolved)
+            if params is None:
+                with open(os.path.join(self.data_dir, f"{resolved}.json")) as f:
+                    params = self.parse(json.load(f))
+                self._cache[resolved] = params
+            self._cache[year] = params
+        return params
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._years = None
+
+
+DEFAULT_REGISTRY = TaxParameterRegistry()
+
+
+def tax_year(year: int) -> TaxYearParams:
+    """Compiled parameters for ``year`` from the default registry."""
+    return DEFAULT_REGISTRY.get(year)